@@ -0,0 +1,112 @@
+"""
+Compare peak memory of reading and writing Argon documents whole and streamed.
+
+Each measurement runs in its own process.  The peak resident set size is reset before the
+measured operation where the platform allows it, on Linux, and is reported as the increase
+over the resident set size at that point.
+
+Run from the repository root using::
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_document_memory.py --regions 500 2000
+"""
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+# Import the package from this source tree, whether or not it is installed.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cmlibs.argon.argondocument import ArgonDocument
+
+from mapclientplugins.argonviewerstep.model.documentstream import document_state, read_document, write_document_state
+from mapclientplugins.argonviewerstep.model.documentwriter import write_file_atomically
+
+from synthetic import write_argon_document
+
+MODES = ['read-whole', 'read-streamed', 'write-whole', 'write-streamed']
+
+
+def _reset_peak_rss():
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        pass
+
+
+def _rss_kb(field):
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    # Without /proc only the peak is available, and it cannot be reset.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _load(filename):
+    document = ArgonDocument()
+    document.initialiseVisualisationContents()
+    read_document(document, filename)
+    return document
+
+
+def measure(mode, filename):
+    """
+    Run one measurement and print the time taken and peak memory increase in MB.
+    """
+    if mode.startswith('read'):
+        document = ArgonDocument()
+        document.initialiseVisualisationContents()
+    else:
+        document = _load(filename)
+        output_filename = filename + '.out'
+
+    _reset_peak_rss()
+    start_rss = _rss_kb('VmRSS')
+    start = time.perf_counter()
+    if mode == 'read-whole':
+        with open(filename) as f:
+            document.deserialize(f.read())
+    elif mode == 'read-streamed':
+        read_document(document, filename)
+    elif mode == 'write-whole':
+        write_file_atomically(output_filename, document.serialize())
+    elif mode == 'write-streamed':
+        write_document_state(output_filename, document_state(document))
+    elapsed = time.perf_counter() - start
+    print(f'{elapsed} {(_rss_kb("VmHWM") - start_rss) / 1024}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--regions', type=int, nargs='+', default=[500, 2000],
+                        help='number of child regions in the synthetic documents')
+    parser.add_argument('--measure', nargs=2, metavar=('MODE', 'FILE'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(*args.measure)
+        return
+
+    print(f"{'regions':>8} {'size (MB)':>10} " + ' '.join(f'{mode + " (s, MB)":>24}' for mode in MODES))
+    with tempfile.TemporaryDirectory() as directory:
+        for regions_count in args.regions:
+            filename = os.path.join(directory, f'document-{regions_count}.json')
+            size = write_argon_document(filename, regions_count)
+            results = []
+            for mode in MODES:
+                output = subprocess.run([sys.executable, __file__, '--measure', mode, filename],
+                                        check=True, capture_output=True, text=True).stdout.split()
+                results.append(f'{float(output[0]):>12.3f} {float(output[1]):>11.1f}')
+            print(f'{regions_count:>8} {size / 1e6:>10.2f} ' + ' '.join(results))
+
+
+if __name__ == '__main__':
+    main()
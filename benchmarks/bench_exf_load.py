@@ -0,0 +1,60 @@
+"""
+Compare classify-then-load with the load-once path for EX files.
+
+Run from the repository root using::
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_exf_load.py --sizes 5 10 20 40
+"""
+import argparse
+import os
+import sys
+import tempfile
+import timeit
+
+# Import the package from this source tree, whether or not it is installed.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cmlibs.zinc.result import RESULT_OK
+
+from mapclientplugins.argonviewerstep.model.argonviewermodel import ArgonViewerModel
+from mapclientplugins.argonviewerstep.model.utilities import is_exf_file
+
+from synthetic import write_cube_ex_file
+
+
+def classify_then_load(model, filename):
+    """
+    The original load path, the file is fully parsed once to classify it and again to load it.
+    """
+    if not is_exf_file(filename):
+        return False
+    model.new()
+    region = model.getContext().getDefaultRegion()
+    return region.readFile(filename) == RESULT_OK
+
+
+def load_once(model, filename):
+    return model.load(filename)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[5, 10, 20, 30],
+                        help='elements along each axis of the synthetic cube meshes')
+    parser.add_argument('--repeat', type=int, default=3, help='number of timed repeats, the best is reported')
+    args = parser.parse_args()
+
+    model = ArgonViewerModel('')
+    print(f"{'elements':>10} {'size (MB)':>10} {'classify+load (s)':>18} {'load once (s)':>14} {'speed up':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for elements_count in args.sizes:
+            filename = os.path.join(directory, f'cube-{elements_count}.exf')
+            size = write_cube_ex_file(filename, elements_count)
+            assert classify_then_load(model, filename) and load_once(model, filename)
+            original = min(timeit.repeat(lambda: classify_then_load(model, filename), number=1, repeat=args.repeat))
+            once = min(timeit.repeat(lambda: load_once(model, filename), number=1, repeat=args.repeat))
+            print(f"{elements_count ** 3:>10} {size / 1e6:>10.2f} {original:>18.3f} {once:>14.3f} {original / once:>8.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Measure how much of the GIL Zinc holds while parsing EX files and deserializing Argon documents.
+
+A Python thread counts in a loop while the main thread runs each operation. The count rate
+during the operation, against the rate of the counter running alone, is the share of the time
+other Python threads could run: near 100% if Zinc releases the GIL, near 0% if it holds it.
+
+Run from the repository root using::
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_gil.py --size 30 --regions 1000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+# Import the package from this source tree, whether or not it is installed.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cmlibs.argon.argondocument import ArgonDocument
+from cmlibs.zinc.context import Context
+from cmlibs.zinc.result import RESULT_OK
+
+from synthetic import write_argon_document, write_cube_ex_file
+
+
+def count_rate(operation):
+    """
+    Get the rate a Python thread counts at while operation runs, and the seconds operation took.
+    """
+    stop = threading.Event()
+    counts = []
+
+    def _count():
+        count = 0
+        while not stop.is_set():
+            count += 1
+        counts.append(count)
+
+    thread = threading.Thread(target=_count)
+    thread.start()
+    start = time.perf_counter()
+    operation()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    thread.join()
+    return counts[0] / elapsed, elapsed
+
+
+def parse_ex(data):
+    context = Context('bench')
+    region = context.getDefaultRegion()
+    stream_information = region.createStreaminformationRegion()
+    stream_information.createStreamresourceMemoryBuffer(data)
+    if region.read(stream_information) != RESULT_OK:
+        raise RuntimeError('Failed to parse the EX file.')
+
+
+def deserialize_document(state):
+    document = ArgonDocument()
+    document.initialiseVisualisationContents()
+    document.deserialize(state)
+    document.freeVisualisationContents()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--size', type=int, default=30, help='elements along each axis of the synthetic cube mesh')
+    parser.add_argument('--regions', type=int, default=1000, help='number of child regions in the synthetic Argon document')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        ex_filename = os.path.join(directory, 'cube.exf')
+        write_cube_ex_file(ex_filename, args.size)
+        with open(ex_filename, 'rb') as f:
+            data = f.read()
+        argon_filename = os.path.join(directory, 'document.argon')
+        write_argon_document(argon_filename, args.regions)
+        with open(argon_filename) as f:
+            state = f.read()
+
+        alone_rate, _ = count_rate(lambda: time.sleep(0.5))
+        print(f"{'operation':>22} {'time (s)':>9} {'other threads ran':>18}")
+        for name, operation in (('parse EX', lambda: parse_ex(data)),
+                                ('deserialize document', lambda: deserialize_document(state)),
+                                ('sleep', lambda: time.sleep(0.5))):
+            rate, elapsed = count_rate(operation)
+            print(f"{name:>22} {elapsed:>9.3f} {100 * rate / alone_rate:>17.0f}%")
+
+
+if __name__ == '__main__':
+    main()
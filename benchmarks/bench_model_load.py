@@ -0,0 +1,58 @@
+"""
+Time ArgonViewerModel.load for EX files and Argon documents of increasing size.
+
+Run from the repository root using::
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_model_load.py --sizes 5 10 20 40 --regions 10 100 1000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import timeit
+
+# Import the package from this source tree, whether or not it is installed.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mapclientplugins.argonviewerstep.model.argonviewermodel import ArgonViewerModel
+
+from synthetic import write_argon_document, write_cube_ex_file
+
+
+def time_load(filename, repeat):
+    """
+    Get the best time of repeat loads of filename into a model.
+    """
+    model = ArgonViewerModel('')
+    if not model.load(filename):
+        raise RuntimeError(f"Failed to load '{filename}'.")
+
+    return min(timeit.repeat(lambda: model.load(filename), number=1, repeat=repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='*', default=[5, 10, 20, 30],
+                        help='elements along each axis of the synthetic cube meshes')
+    parser.add_argument('--regions', type=int, nargs='*', default=[10, 100, 1000],
+                        help='number of child regions in the synthetic Argon documents')
+    parser.add_argument('--repeat', type=int, default=3, help='number of timed repeats, the best is reported')
+    args = parser.parse_args()
+
+    print(f"{'input':>6} {'count':>8} {'size (MB)':>10} {'load (s)':>9} {'MB/s':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        for elements_count in args.sizes:
+            filename = os.path.join(directory, f'cube-{elements_count}.exf')
+            size = write_cube_ex_file(filename, elements_count)
+            elapsed = time_load(filename, args.repeat)
+            print(f"{'exf':>6} {elements_count ** 3:>8} {size / 1e6:>10.2f} {elapsed:>9.3f} {size / 1e6 / elapsed:>8.1f}")
+
+        for regions_count in args.regions:
+            filename = os.path.join(directory, f'document-{regions_count}.json')
+            size = write_argon_document(filename, regions_count)
+            elapsed = time_load(filename, args.repeat)
+            print(f"{'argon':>6} {regions_count:>8} {size / 1e6:>10.2f} {elapsed:>9.3f} {size / 1e6 / elapsed:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""
+Time creating the views of ArgonViewerWidget and saving the document on Done.
+
+Creating views is timed for documents with increasing numbers of views, both for
+_load_views, which only realises the current view, and for then realising every view.
+Done is timed from clicking it until the document is written, for documents with
+increasing numbers of regions.
+
+Run from the repository root using::
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_widget.py --views 1 10 50 --regions 10 100 1000
+
+OpenGL is needed for the sceneviewers, with no display use a software implementation
+such as OSMesa or llvmpipe, for example by also setting LIBGL_ALWAYS_SOFTWARE=1.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# Import the package from this source tree, whether or not it is installed.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6 import QtCore, QtWidgets
+
+from mapclientplugins.argonviewerstep.model.argonviewermodel import ArgonViewerModel
+from mapclientplugins.argonviewerstep.view.argonviewerwidget import ArgonViewerWidget
+
+from synthetic import write_argon_document
+
+
+def _create_widget(directory, filename):
+    model = ArgonViewerModel('')
+    model.setPreviousDocumentsDirectory(directory)
+    if not model.load(filename):
+        raise RuntimeError(f"Failed to load '{filename}'.")
+
+    widget = ArgonViewerWidget(model)
+    widget.set_location(directory)
+    widget.show()
+    QtWidgets.QApplication.processEvents()
+    return widget
+
+
+def _dispose(widget):
+    widget.close()
+    widget.deleteLater()
+    QtWidgets.QApplication.processEvents()
+
+
+def time_load_views(directory, views_count, repeat):
+    """
+    Get the best times of repeat view loads, for _load_views and for then realising every view.
+    """
+    filename = os.path.join(directory, f'views-{views_count}.json')
+    write_argon_document(filename, 1, views_count=views_count)
+    widget = _create_widget(directory, filename)
+    tab_widget = widget._ui.viewTabWidget
+    load_times = []
+    realise_times = []
+    for _ in range(repeat):
+        widget._clear_views()
+        QtWidgets.QApplication.processEvents()
+        start = time.perf_counter()
+        widget._load_views()
+        QtWidgets.QApplication.processEvents()
+        load_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for index in range(tab_widget.count()):
+            tab_widget.setCurrentIndex(index)
+            QtWidgets.QApplication.processEvents()
+        realise_times.append(time.perf_counter() - start)
+
+    _dispose(widget)
+    return min(load_times), min(realise_times)
+
+
+def time_done(directory, regions_count, repeat):
+    """
+    Get the best time of repeat Done clicks, from the click until the document is written.
+    """
+    filename = os.path.join(directory, f'document-{regions_count}.json')
+    size = write_argon_document(filename, regions_count, views_count=1)
+    widget = _create_widget(directory, filename)
+    widget._onDocumentChanged()
+    loop = QtCore.QEventLoop()
+    widget.registerDoneExecution(loop.quit)
+    widget.registerUpdateVisualisationDoc(lambda _: None)
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        widget._done_button_clicked()
+        loop.exec()
+        times.append(time.perf_counter() - start)
+
+    _dispose(widget)
+    return size, min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--views', type=int, nargs='*', default=[1, 5, 10, 25, 50],
+                        help='number of views in the synthetic documents')
+    parser.add_argument('--regions', type=int, nargs='*', default=[10, 100, 1000],
+                        help='number of child regions in the synthetic documents saved on Done')
+    parser.add_argument('--repeat', type=int, default=3, help='number of timed repeats, the best is reported')
+    args = parser.parse_args()
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    with tempfile.TemporaryDirectory() as directory:
+        if args.views:
+            print(f"{'views':>6} {'load views (s)':>15} {'realise all (s)':>16}")
+            for views_count in args.views:
+                load_time, realise_time = time_load_views(directory, views_count, args.repeat)
+                print(f"{views_count:>6} {load_time:>15.3f} {realise_time:>16.3f}")
+
+        if args.regions:
+            print(f"{'regions':>8} {'size (MB)':>10} {'done (s)':>9}")
+            for regions_count in args.regions:
+                size, done_time = time_done(directory, regions_count, args.repeat)
+                print(f"{regions_count:>8} {size / 1e6:>10.2f} {done_time:>9.3f}")
+
+    del app
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""
+Generators for synthetic EX files and Argon documents used by the benchmarks.
+"""
+import os
+
+from cmlibs.argon.argondocument import ArgonDocument
+from cmlibs.utils.zinc.field import create_field_coordinates
+from cmlibs.zinc.context import Context
+from cmlibs.zinc.element import Element, Elementbasis
+from cmlibs.zinc.field import Field
+from cmlibs.zinc.node import Node
+from cmlibs.zinc.result import RESULT_OK
+
+
+def define_cube_mesh(region, elements_count, time=None):
+    """
+    Define a trilinear cube mesh with elements_count elements along each axis in region.
+
+    :param region: Zinc region to create the mesh in.
+    :param elements_count: Number of elements along each axis.
+    :param time: Optional time to define the coordinates at, the cube is scaled with time.
+    """
+    fieldmodule = region.getFieldmodule()
+    fieldmodule.beginChange()
+    coordinates = create_field_coordinates(fieldmodule)
+    nodes = fieldmodule.findNodesetByFieldDomainType(Field.DOMAIN_TYPE_NODES)
+    node_template = nodes.createNodetemplate()
+    node_template.defineField(coordinates)
+    if time is not None:
+        time_sequence = fieldmodule.getMatchingTimesequence([time])
+        node_template.setTimesequence(coordinates, time_sequence)
+
+    scale = 1.0 + (time if time else 0.0)
+    fieldcache = fieldmodule.createFieldcache()
+    if time is not None:
+        fieldcache.setTime(time)
+    nodes_count = elements_count + 1
+    node_identifier = 1
+    for k in range(nodes_count):
+        for j in range(nodes_count):
+            for i in range(nodes_count):
+                node = nodes.createNode(node_identifier, node_template)
+                fieldcache.setNode(node)
+                coordinates.setNodeParameters(fieldcache, -1, Node.VALUE_LABEL_VALUE, 1,
+                                              [scale * i / elements_count, scale * j / elements_count, scale * k / elements_count])
+                node_identifier += 1
+
+    mesh = fieldmodule.findMeshByDimension(3)
+    basis = fieldmodule.createElementbasis(3, Elementbasis.FUNCTION_TYPE_LINEAR_LAGRANGE)
+    eft = mesh.createElementfieldtemplate(basis)
+    element_template = mesh.createElementtemplate()
+    element_template.setElementShapeType(Element.SHAPE_TYPE_CUBE)
+    element_template.defineField(coordinates, -1, eft)
+    element_identifier = 1
+    for k in range(elements_count):
+        for j in range(elements_count):
+            for i in range(elements_count):
+                base = 1 + i + j * nodes_count + k * nodes_count * nodes_count
+                node_identifiers = [base, base + 1, base + nodes_count, base + nodes_count + 1]
+                node_identifiers += [n + nodes_count * nodes_count for n in node_identifiers]
+                element = mesh.createElement(element_identifier, element_template)
+                element.setNodesByIdentifier(eft, node_identifiers)
+                element_identifier += 1
+
+    fieldmodule.endChange()
+
+
+def write_cube_ex_file(filename, elements_count, time=None):
+    """
+    Write a trilinear cube mesh to an EX file.
+
+    :return: Size of the written file in bytes.
+    """
+    context = Context('synthetic')
+    region = context.getDefaultRegion()
+    define_cube_mesh(region, elements_count, time)
+    if region.writeFile(filename) != RESULT_OK:
+        raise RuntimeError(f"Failed to write synthetic EX file '{filename}'.")
+
+    return os.path.getsize(filename)
+
+
+def add_views(document, views_count):
+    """
+    Add views_count single pane views of the root region to document, the first being the active view.
+    """
+    view_manager = document.getViewManager()
+    views = [{'Name': f'view{index + 1}', 'Scenes': [{'Row': 0, 'Col': 0, 'Sceneviewer': {'Scene': '/'}}]}
+             for index in range(views_count)]
+    view_manager.deserialize({'ActiveView': 'view1' if views else None, 'Children': views})
+
+
+def create_argon_document(regions_count, graphics_count=8, views_count=0):
+    """
+    Create an Argon document with regions_count child regions, each with a scene of graphics_count graphics,
+    and views_count views.  The regions have no model sources, so the document is all scene descriptions.
+
+    :return: ArgonDocument.
+    """
+    document = ArgonDocument()
+    document.initialiseVisualisationContents()
+    root_region = document.getRootRegion()
+    for index in range(regions_count):
+        region = root_region.createChild()
+        region.setName(f'region{index + 1}')
+        scene = region.getZincRegion().getScene()
+        scene.beginChange()
+        for graphics_index in range(graphics_count):
+            graphics = scene.createGraphicsLines() if graphics_index % 2 else scene.createGraphicsSurfaces()
+            graphics.setName(f'graphics{graphics_index + 1}')
+        scene.endChange()
+
+    add_views(document, views_count)
+    return document
+
+
+def write_argon_document(filename, regions_count, graphics_count=8, views_count=0):
+    """
+    Write an Argon document from create_argon_document.
+
+    :return: Size of the written file in bytes.
+    """
+    document = create_argon_document(regions_count, graphics_count, views_count)
+    with open(filename, 'w') as f:
+        f.write(document.serialize())
+
+    return os.path.getsize(filename)
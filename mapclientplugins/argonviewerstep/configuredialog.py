@@ -3,8 +3,9 @@ import webbrowser
 
 from PySide6 import QtCore, QtWidgets
 
-from cmlibs.argon.utilities import is_argon_file
-
+from mapclientplugins.argonviewerstep.model.documentcatalogue import DocumentCatalogue
+from mapclientplugins.argonviewerstep.model.exfingestion import EXF_INGESTION_BUDGETED_MODES, EXF_INGESTION_MODES, EXF_INGESTION_TIME_SERIES
+from mapclientplugins.argonviewerstep.model.memorybudget import MEMORY_BUDGET_POLICIES
 from mapclientplugins.argonviewerstep.ui_configuredialog import Ui_ConfigureDialog
 
 INVALID_STYLE_SHEET = 'background-color: rgba(239, 0, 0, 50)'
@@ -30,7 +31,10 @@ class ConfigureDialog(QtWidgets.QDialog):
         # We will use this method to decide whether the identifier is unique.
         self.identifierOccursCount = None
         self._documents_dir = None
+        self._document_catalogue = None
         self._original_documents = []
+        # Configuration values without a widget in the dialog are passed through unchanged.
+        self._config = {}
 
         self.setWhatsThis(
             '<html>Please read the documentation available \n<a href="https://abi-mapping-tools.readthedocs.io/en/latest/mapclientplugins.argonviewerstep/docs/index.html">here'
@@ -47,6 +51,19 @@ class ConfigureDialog(QtWidgets.QDialog):
         self._ui.lineEditIdentifier.textChanged.connect(self.validate)
         line_edit = self._ui.comboBoxVisualisationDocuments.lineEdit()
         line_edit.editingFinished.connect(self._document_name_changed)
+        self._ui.comboBoxExfIngestion.currentIndexChanged.connect(self._exf_ingestion_changed)
+
+    def _exf_ingestion_changed(self):
+        """
+        Only enable the settings that apply to the selected EX file ingestion mode.
+        """
+        mode = EXF_INGESTION_MODES[self._ui.comboBoxExfIngestion.currentIndex()]
+        budgeted = mode in EXF_INGESTION_BUDGETED_MODES
+        for widget in (self._ui.labelMemoryBudget, self._ui.spinBoxMemoryBudget, self._ui.labelMemoryPolicy, self._ui.comboBoxMemoryPolicy):
+            widget.setEnabled(budgeted)
+        time_series = mode == EXF_INGESTION_TIME_SERIES
+        self._ui.labelTimeSeriesPrefetch.setEnabled(time_series)
+        self._ui.spinBoxTimeSeriesPrefetch.setEnabled(time_series)
 
     def _document_name_changed(self):
         new_text = self._ui.comboBoxVisualisationDocuments.currentText()
@@ -57,6 +74,7 @@ class ConfigureDialog(QtWidgets.QDialog):
     def _do_document_name_change(self, old_name, new_name):
         if not os.path.isfile(os.path.join(self._documents_dir, new_name)):
             os.replace(os.path.join(self._documents_dir, old_name), os.path.join(self._documents_dir, new_name))
+            self._document_catalogue.rename(old_name, new_name)
 
     def accept(self):
         """
@@ -102,12 +120,35 @@ class ConfigureDialog(QtWidgets.QDialog):
         identifier over the whole of the workflow.
         """
         self._previousIdentifier = self._ui.lineEditIdentifier.text()
-        return {
+        config = self._config.copy()
+        config.update({
             'identifier': self._ui.lineEditIdentifier.text(),
             'auto-done': self._ui.checkBoxAutoDone.isChecked(),
             'auto-load-visualisation-doc': self._ui.checkBoxAutoLoadVisualisationDocument.isChecked(),
+            'background-load': self._ui.checkBoxBackgroundLoad.isChecked(),
+            'exf-ingestion': EXF_INGESTION_MODES[self._ui.comboBoxExfIngestion.currentIndex()],
+            'release-hidden-views-timeout': self._ui.spinBoxReleaseHiddenViews.value(),
+            'retention-max-count': self._ui.spinBoxRetentionMaxCount.value(),
+            'retention-max-size': self._ui.spinBoxRetentionMaxSize.value(),
+            'retention-max-age': self._ui.spinBoxRetentionMaxAge.value(),
+            'retention-keep-referenced': self._ui.checkBoxRetentionKeepReferenced.isChecked(),
+            'retention-deduplicate': self._ui.checkBoxRetentionDeduplicate.isChecked(),
+            'region-cache-size': self._ui.spinBoxRegionCacheSize.value(),
+            'document-cache-size': self._ui.spinBoxDocumentCacheSize.value(),
+            'compare-documents': self._ui.checkBoxCompareDocuments.isChecked(),
+            'performance-report': self._ui.checkBoxPerformanceReport.isChecked(),
+            'performance-profile': self._ui.checkBoxPerformanceProfile.isChecked(),
+            'memory-budget': self._ui.spinBoxMemoryBudget.value(),
+            'memory-policy': MEMORY_BUDGET_POLICIES[self._ui.comboBoxMemoryPolicy.currentIndex()],
+            'time-series-prefetch': self._ui.spinBoxTimeSeriesPrefetch.value(),
+            'export-views': self._ui.checkBoxExportViews.isChecked(),
+            'export-width': self._ui.spinBoxExportWidth.value(),
+            'export-height': self._ui.spinBoxExportHeight.value(),
+            'export-time-count': self._ui.spinBoxExportTimeCount.value(),
+            'frame-time-target': self._ui.spinBoxFrameTimeTarget.value(),
             'visualisation-doc': self._ui.comboBoxVisualisationDocuments.currentText()
-        }
+        })
+        return config
 
     def setConfig(self, config):
         """
@@ -115,10 +156,35 @@ class ConfigureDialog(QtWidgets.QDialog):
         set the _previousIdentifier value so that we can check uniqueness of the
         identifier over the whole of the workflow.
         """
+        self._config = config.copy()
         self._previousIdentifier = config['identifier']
         self._ui.lineEditIdentifier.setText(config['identifier'])
         self._ui.checkBoxAutoLoadVisualisationDocument.setChecked(True if config['auto-load-visualisation-doc'] else False)
         self._ui.checkBoxAutoDone.setChecked(True if config['auto-done'] else False)
+        self._ui.checkBoxBackgroundLoad.setChecked(True if config['background-load'] else False)
+        if config['exf-ingestion'] in EXF_INGESTION_MODES:
+            self._ui.comboBoxExfIngestion.setCurrentIndex(EXF_INGESTION_MODES.index(config['exf-ingestion']))
+        self._ui.spinBoxReleaseHiddenViews.setValue(config['release-hidden-views-timeout'])
+        self._ui.spinBoxRetentionMaxCount.setValue(config['retention-max-count'])
+        self._ui.spinBoxRetentionMaxSize.setValue(config['retention-max-size'])
+        self._ui.spinBoxRetentionMaxAge.setValue(config['retention-max-age'])
+        self._ui.checkBoxRetentionKeepReferenced.setChecked(True if config['retention-keep-referenced'] else False)
+        self._ui.checkBoxRetentionDeduplicate.setChecked(True if config['retention-deduplicate'] else False)
+        self._ui.spinBoxRegionCacheSize.setValue(config['region-cache-size'])
+        self._ui.spinBoxDocumentCacheSize.setValue(config['document-cache-size'])
+        self._ui.checkBoxCompareDocuments.setChecked(True if config['compare-documents'] else False)
+        self._ui.checkBoxPerformanceReport.setChecked(True if config['performance-report'] else False)
+        self._ui.checkBoxPerformanceProfile.setChecked(True if config['performance-profile'] else False)
+        self._ui.spinBoxMemoryBudget.setValue(config['memory-budget'])
+        if config['memory-policy'] in MEMORY_BUDGET_POLICIES:
+            self._ui.comboBoxMemoryPolicy.setCurrentIndex(MEMORY_BUDGET_POLICIES.index(config['memory-policy']))
+        self._ui.spinBoxTimeSeriesPrefetch.setValue(config['time-series-prefetch'])
+        self._exf_ingestion_changed()
+        self._ui.checkBoxExportViews.setChecked(True if config['export-views'] else False)
+        self._ui.spinBoxExportWidth.setValue(config['export-width'])
+        self._ui.spinBoxExportHeight.setValue(config['export-height'])
+        self._ui.spinBoxExportTimeCount.setValue(config['export-time-count'])
+        self._ui.spinBoxFrameTimeTarget.setValue(config['frame-time-target'])
         index = self._ui.comboBoxVisualisationDocuments.findText(config['visualisation-doc'])
         if index >= 0:
             self._ui.comboBoxVisualisationDocuments.blockSignals(True)
@@ -127,7 +193,8 @@ class ConfigureDialog(QtWidgets.QDialog):
 
     def setVisualisationDocumentsDir(self, documents_dir):
         self._documents_dir = documents_dir
-        documents = [doc for doc in os.listdir(documents_dir) if is_argon_file(os.path.join(documents_dir, doc))]
+        self._document_catalogue = DocumentCatalogue(documents_dir)
+        documents = self._document_catalogue.documents()
         self._ui.comboBoxVisualisationDocuments.blockSignals(True)
         self._original_documents = documents[:]
         self._ui.comboBoxVisualisationDocuments.addItems(['', *documents])
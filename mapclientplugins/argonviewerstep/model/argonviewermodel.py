@@ -2,10 +2,21 @@ import os
 import json
 
 from cmlibs.argon.argondocument import ArgonDocument
+from cmlibs.argon.argonerror import ArgonError
 from cmlibs.argon.argonlogger import ArgonLogger
-from cmlibs.argon.utilities import is_argon_file
 from cmlibs.zinc.result import RESULT_OK
-from cmlibs.utils.zinc.general import is_exf_file
+
+from mapclientplugins.argonviewerstep.model.documentcatalogue import DocumentCatalogue, summarise_document
+from mapclientplugins.argonviewerstep.model.documentcomparison import load_comparison_documents
+from mapclientplugins.argonviewerstep.model.documentstream import document_state, deserialize_document_state, read_document_state, write_document_state
+from mapclientplugins.argonviewerstep.model.exfingestion import clear_exf_regions, defer_exf_files, exf_region_names, ingest_exf_files, \
+    EXF_INGESTION_BUDGETED_MODES, EXF_INGESTION_CHILD_REGIONS, EXF_INGESTION_NONE, EXF_INGESTION_TIME_SERIES
+from mapclientplugins.argonviewerstep.model.filetype import detect_file_type, sniff_file_type, FILE_TYPE_AMBIGUOUS, FILE_TYPE_ARGON, FILE_TYPE_EXF
+from mapclientplugins.argonviewerstep.model.instrumentation import Instrumentation
+from mapclientplugins.argonviewerstep.model.memorybudget import describe_plan, estimate_exf_files, plan_loading, \
+    MEMORY_POLICY_NONE, SOURCE_DEFERRED, SOURCE_LOAD, SOURCE_REFUSED
+from mapclientplugins.argonviewerstep.model.regioncache import source_key
+from mapclientplugins.argonviewerstep.model.timeseries import region_name_for_series, TimeSeries, DEFAULT_PREFETCH_COUNT
 
 
 def _define_current_document_name():
@@ -18,8 +29,21 @@ class ArgonViewerModel(object):
         self._settings = None
         self._document = None
         self._previous_documents_directory = None
+        self._document_catalogue = None
         self._current_document_name = visualisation_doc if visualisation_doc else _define_current_document_name()
         self._file_sources = []
+        self._source_fingerprints = {}
+        self._argon_sources = []
+        self._compare_documents = False
+        self._exf_ingestion_mode = EXF_INGESTION_NONE
+        self._region_cache = None
+        self._instrumentation = Instrumentation()
+        self._memory_budget = 0
+        self._memory_policy = MEMORY_POLICY_NONE
+        self._memory_plan = []
+        self._time_series = None
+        self._time_notifier = None
+        self._time_series_prefetch = DEFAULT_PREFETCH_COUNT
 
     def setSources(self, sources):
         self._file_sources = sources
@@ -32,51 +56,379 @@ class ArgonViewerModel(object):
 
     def setPreviousDocumentsDirectory(self, directory):
         self._previous_documents_directory = directory
+        self._document_catalogue = DocumentCatalogue(directory)
+
+    def getDocumentCatalogue(self):
+        return self._document_catalogue
 
     def getPreviousDocumentsDirectory(self):
         return self._previous_documents_directory
 
+    def setExfIngestionMode(self, mode):
+        """
+        Set how EX/EXF files in the sources are loaded, one of the EXF_INGESTION_* modes.
+        """
+        self._exf_ingestion_mode = mode
+
+    def getExfIngestionMode(self):
+        return self._exf_ingestion_mode
+
+    def setCompareDocuments(self, state):
+        """
+        Set whether Argon documents in the sources after the first are loaded for comparison,
+        each into its own child region with its own views.
+        """
+        self._compare_documents = state
+
+    def getCompareDocuments(self):
+        return self._compare_documents
+
+    def setRegionCache(self, region_cache):
+        """
+        Set the RegionCache EX/EXF files are read through, None to read them directly.
+        """
+        self._region_cache = region_cache
+
+    def getRegionCache(self):
+        return self._region_cache
+
+    def setMemoryBudget(self, budget, policy):
+        """
+        Set the memory budget for loading EX/EXF files and what to do with the files that do not fit it.
+        The budget only applies in the EXF_INGESTION_BUDGETED_MODES ingestion modes.
+
+        :param budget: Memory budget in bytes, zero for no limit.
+        :param policy: One of the MEMORY_POLICY_* policies from memorybudget.
+        """
+        self._memory_budget = budget
+        self._memory_policy = policy
+
+    def _memory_budget_enabled(self):
+        return self._memory_policy != MEMORY_POLICY_NONE and self._memory_budget > 0 and \
+            self._exf_ingestion_mode in EXF_INGESTION_BUDGETED_MODES
+
+    def getMemoryPlan(self):
+        """
+        Get the plan the EX/EXF files were last loaded with, from memorybudget.plan_loading,
+        an empty list if there was no memory budget.
+        """
+        return self._memory_plan
+
+    def describeMemoryPlan(self):
+        """
+        Get a description of the files not loaded to keep within the memory budget, an empty string if all were loaded.
+        """
+        return describe_plan(self._memory_plan, self._memory_budget)
+
+    def getRefusedSources(self):
+        return [entry['filename'] for entry in self._memory_plan if entry['action'] == SOURCE_REFUSED]
+
+    def setTimeSeriesPrefetch(self, count):
+        """
+        Set the number of frames of a time series read ahead of the current frame, in each direction.
+        """
+        self._time_series_prefetch = count
+        if self._time_series is not None:
+            self._time_series.setPrefetchCount(count)
+
+    def getTimeSeries(self):
+        """
+        Get the TimeSeries streamed into the document in EXF_INGESTION_TIME_SERIES mode, None if there is none.
+        """
+        return self._time_series
+
+    def setTime(self, time):
+        """
+        Set the time of the document, a time series shows its frame for that time before this returns.
+        """
+        self._document.getZincContext().getTimekeepermodule().getDefaultTimekeeper().setTime(time)
+
+    def setInstrumentation(self, instrumentation):
+        """
+        Set the Instrumentation the phases of loading and saving are timed with.
+        """
+        self._instrumentation = instrumentation
+
+    def getInstrumentation(self):
+        return self._instrumentation
+
+    def loadSources(self, file_locations, auto_load_previous, progress_callback=None, cancel_event=None):
+        """
+        Loads the first Argon document in file_locations, falling back to the previous visualisation
+        document and then to a new document, and sets file_locations as the model sources.
+        When comparing documents every other Argon document in file_locations is then loaded into
+        its own child region of the document, see documentcomparison.
+        Unless the EX/EXF ingestion mode is EXF_INGESTION_NONE every EX/EXF file in file_locations
+        is then read into the document, or in EXF_INGESTION_TIME_SERIES mode streamed into it as a time series.
+        Safe to call from a worker thread provided nothing else uses the model until it returns.
+
+        :param file_locations: List of file locations delivered to the step.
+        :param auto_load_previous: Load the previous visualisation document if no Argon document is given.
+        :param progress_callback: Optional callable taking (step, step_count, message).
+        :param cancel_event: Optional threading.Event, when set loading stops before the next step
+          and the model is left with a new document.
+        :return: True if loading completed, False if it was cancelled.
+        """
+        ingest_exf = self._exf_ingestion_mode != EXF_INGESTION_NONE
+        self._memory_plan = []
+        step_count = len(file_locations) + 2
+        if ingest_exf:
+            step_count += len(file_locations)
+
+        def _report(step, message):
+            if progress_callback is not None:
+                progress_callback(step, step_count, message)
+
+        def _cancelled():
+            if cancel_event is not None and cancel_event.is_set():
+                self.new()
+                return True
+            return False
+
+        argon_files = []
+        for index, file_location in enumerate(file_locations):
+            if _cancelled():
+                return False
+            _report(index, f'Checking {os.path.basename(file_location)}')
+            if file_location in argon_files:
+                continue
+            with self._instrumentation.span('classify-source'):
+                file_type = detect_file_type(file_location)
+            if file_type == FILE_TYPE_ARGON:
+                argon_files.append(file_location)
+                if not self._compare_documents:
+                    break
+
+        argon_file = argon_files[0] if argon_files else None
+
+        load_success = False
+        if argon_file is not None:
+            _report(len(file_locations), f'Loading {os.path.basename(argon_file)}')
+            load_success = self.load(argon_file)
+
+        current_document_location = self.getCurrentDocumentLocation()
+        if not load_success and auto_load_previous and os.path.isfile(current_document_location):
+            if _cancelled():
+                return False
+            _report(len(file_locations) + 1, 'Loading previous visualisation document')
+            load_success = self.load(current_document_location)
+
+        if _cancelled():
+            return False
+
+        if not load_success:
+            self.new()
+
+        if len(argon_files) > 1:
+            def _comparison_progress(_, __, message):
+                _report(len(file_locations) + 1, message)
+
+            with self._instrumentation.span('compare-documents'):
+                compared = load_comparison_documents(self._document, argon_files[1:], progress_callback=_comparison_progress,
+                                                     cancel_event=cancel_event)
+            if compared is None:
+                self.new()
+                return False
+
+        if self._exf_ingestion_mode == EXF_INGESTION_TIME_SERIES:
+            _report(len(file_locations) + 2, 'Loading time series')
+            with self._instrumentation.span('load-time-series'):
+                self._load_time_series([f for f in file_locations if f not in argon_files])
+        elif ingest_exf:
+            def _ingest_progress(step, _, message):
+                _report(len(file_locations) + 2 + step, message)
+
+            exf_files = [f for f in file_locations if f not in argon_files]
+            region_names = exf_region_names(exf_files)
+            deferred_files = []
+            if self._memory_budget_enabled():
+                with self._instrumentation.span('estimate-memory'):
+                    self._memory_plan = plan_loading(estimate_exf_files(exf_files), self._memory_budget, self._memory_policy)
+                exf_files = [entry['filename'] for entry in self._memory_plan if entry['action'] == SOURCE_LOAD]
+                deferred_files = [entry['filename'] for entry in self._memory_plan if entry['action'] == SOURCE_DEFERRED]
+            with self._instrumentation.span('ingest-exf'):
+                ingested = ingest_exf_files(self._document.getRootRegion(), exf_files, self._exf_ingestion_mode,
+                                            _ingest_progress, cancel_event, self._region_cache, region_names)
+            if ingested is None:
+                self.new()
+                return False
+
+            defer_exf_files(self._document.getRootRegion(), deferred_files, self._exf_ingestion_mode, region_names)
+
+        self.setSources(file_locations)
+        self._source_fingerprints = {file_location: source_key(file_location) for file_location in file_locations}
+        self._argon_sources = argon_files
+        _report(step_count, 'Done')
+        return True
+
+    def changedSources(self, file_locations):
+        """
+        Get the sources that changed since they were loaded by loadSources.
+
+        :param file_locations: List of file locations delivered to the step.
+        :return: List of the changed file locations, or None if file_locations are not the loaded sources.
+        """
+        if list(file_locations) != list(self._file_sources):
+            return None
+
+        return [f for f in file_locations if source_key(f) != self._source_fingerprints.get(f)]
+
+    def reloadSources(self, file_locations, progress_callback=None):
+        """
+        Re-read the EX/EXF sources that changed since they were loaded into their existing regions,
+        keeping the scenes, graphics, spectrums and views of the document.
+        Changed files are only re-read in EXF_INGESTION_CHILD_REGIONS mode, where each file has a region
+        of its own that is cleared before it is read again.  In the other modes the files share the root
+        region or are applied model sources, so they cannot be re-read on their own.
+
+        :param file_locations: List of file locations delivered to the step.
+        :param progress_callback: Optional callable taking (step, step_count, message).
+        :return: True if the document is up to date, False if loadSources is needed instead
+          because the list of sources or an Argon document changed, or any source changed while
+          not in EXF_INGESTION_CHILD_REGIONS mode or while loading within a memory budget.
+        """
+        changed = self.changedSources(file_locations)
+        if changed is None or any(f in changed for f in self._argon_sources):
+            return False
+
+        if any(not os.path.isfile(f) for f in changed):
+            return False
+
+        # Changed files may change which files fit the memory budget, or the frames of a time series.
+        if changed and (self._memory_budget_enabled() or self._time_series is not None):
+            return False
+
+        if changed and self._exf_ingestion_mode != EXF_INGESTION_CHILD_REGIONS:
+            return False
+
+        if changed:
+            region_names = exf_region_names([f for f in file_locations if f not in self._argon_sources])
+            with self._instrumentation.span('reload-exf'):
+                clear_exf_regions(self._document.getRootRegion(), changed, region_names)
+                ingest_exf_files(self._document.getRootRegion(), changed, self._exf_ingestion_mode,
+                                 progress_callback, region_cache=self._region_cache, region_names=region_names)
+
+        for file_location in changed:
+            self._source_fingerprints[file_location] = source_key(file_location)
+        return True
+
     def load(self, filename):
         """
         Loads the named Neon file and on success sets filename as the current location.
         Emits documentChange separately if new document loaded, including if existing document cleared due to load failure.
         :return  True on success, otherwise False.
         """
-        argon_file = None
-        exf_file = None
-        if is_argon_file(filename):
-            argon_file = filename
-        elif is_exf_file(filename):
-            exf_file = filename
-        else:
-            return False
-
-        if exf_file is not None:
-            return self._load_exf(exf_file)
+        # Classification and loading share one read, a file that might be EXF is read
+        # straight into the new document and a failed read means it is not EXF.
+        file_type = detect_file_type(filename, validate_exf=False)
+        if file_type in (FILE_TYPE_EXF, FILE_TYPE_AMBIGUOUS):
+            return self._load_exf(filename)
+        elif file_type == FILE_TYPE_ARGON:
+            return self._load_argon(filename)
 
-        return self._load_argon(argon_file)
+        return False
 
     def _load_exf(self, filename):
         self.new()
         context = self._document.getZincContext()
         region = context.getDefaultRegion()
-        return region.readFile(filename) == RESULT_OK
+        with self._instrumentation.span('read-exf'):
+            if self._region_cache is not None:
+                result = self._region_cache.read(region, filename, None, self._region_cache.lookup(filename))
+                self._region_cache.flush()
+            else:
+                result = region.readFile(filename)
+        if result == RESULT_OK:
+            return True
 
-    def _load_argon(self, filename):
+        # Don't leave a partially read region in the document.
         self.new()
-        with open(filename) as f:
-            state = f.read()
+        return False
 
-        current_dir = os.getcwd()
-        file_dir = os.path.dirname(filename)
-        os.chdir(file_dir)
-        self._document.deserialize(state)
-        os.chdir(current_dir)
+    def _load_argon(self, filename):
+        self.new()
+        try:
+            # Model sources are resolved against the document directory, not the working directory.
+            with self._instrumentation.span('read-document'):
+                sections = read_document_state(filename)
+            with self._instrumentation.span('deserialize-document'):
+                deserialize_document_state(self._document, sections)
+        except (ArgonError, OSError, ValueError) as e:
+            ArgonLogger.writeErrorMessage(f'Failed to load Argon document {filename}: {e}')
+            # Don't leave a partially read document.
+            self.new()
+            return False
 
         ArgonLogger.getLogger()
         return True
 
+    def serializeCurrentDocument(self):
+        """
+        Serialize the document with model source paths relative to the current document location.
+        """
+        return self._document.serialize(base_path=os.path.dirname(self.getCurrentDocumentLocation()))
+
+    def getCurrentDocumentState(self):
+        """
+        Get the state of the document as Python objects, with model source paths relative to the current document location.
+        """
+        with self._instrumentation.span('document-state'):
+            return document_state(self._document, base_path=os.path.dirname(self.getCurrentDocumentLocation()))
+
+    def saveCurrentDocument(self, state=None):
+        """
+        Write the document to the current document location, replacing any previous document atomically,
+        and record it in the document catalogue.  The document is encoded as it is written.
+
+        :param state: Optional state of the document from getCurrentDocumentState, if given
+          the Zinc objects are not accessed and this can be called from a worker thread.
+        """
+        if state is None:
+            state = self.getCurrentDocumentState()
+        with self._instrumentation.span('write-document'):
+            content_hash = write_document_state(self.getCurrentDocumentLocation(), state)
+        self._document_catalogue.update(self._current_document_name, content_hash, summarise_document(self._document))
+
+    def _load_time_series(self, filenames):
+        """
+        Stream the EX/EXF files in filenames into a child region as a time series, one file per time step,
+        showing the first frame and setting the timekeeper to the times of the series.
+        The frame for the time is shown whenever the time of the timekeeper is set, by the Time Editor for example.
+        """
+        frames = [f for f in filenames if sniff_file_type(f) in (FILE_TYPE_EXF, FILE_TYPE_AMBIGUOUS)]
+        if not frames:
+            return
+
+        root_region = self._document.getRootRegion()
+        name = region_name_for_series(frames)
+        region = None
+        for index in range(root_region.getChildCount()):
+            if root_region.getChild(index).getName() == name:
+                # Keep the scene restored from a previous document.
+                region = root_region.getChild(index)
+                break
+        if region is None:
+            region = root_region.createChild()
+            region.setName(name)
+
+        self._time_series = TimeSeries(region, frames, self._time_series_prefetch)
+        minimum_time, maximum_time = self._time_series.getTimeRange()
+        self._time_series.showTime(minimum_time)
+        timekeeper = self._document.getZincContext().getTimekeepermodule().getDefaultTimekeeper()
+        timekeeper.setMinimumTime(minimum_time)
+        timekeeper.setMaximumTime(maximum_time)
+        timekeeper.setTime(minimum_time)
+        # A regular notifier is called every time the time is set, not only at multiples of its frequency.
+        self._time_notifier = timekeeper.createTimenotifierRegular(1.0, 0.0)
+        self._time_notifier.setCallback(lambda event: self._time_series.showTime(event.getTime()))
+
     def new(self):
+        if self._time_notifier is not None:
+            self._time_notifier.clearCallback()
+            self._time_notifier = None
+        if self._time_series is not None:
+            self._time_series.close()
+            self._time_series = None
         self._document = ArgonDocument()
         self._document.initialiseVisualisationContents()
 
@@ -0,0 +1,112 @@
+"""
+In process cache of loaded models, so re-executing a step with unchanged inputs reuses the loaded document.
+"""
+import os
+
+from collections import OrderedDict
+
+from mapclientplugins.argonviewerstep.model.regioncache import source_key
+
+
+def sources_fingerprint(file_locations):
+    """
+    Get a fingerprint of the given files, a tuple of (path, key) with the key from their sizes and modification times.
+    """
+    return tuple((os.path.abspath(file_location), source_key(file_location)) for file_location in file_locations or [])
+
+
+def _same_files(fingerprint, other_fingerprint):
+    return [path for path, _ in fingerprint] == [path for path, _ in other_fingerprint]
+
+
+def estimate_document_size(file_locations):
+    """
+    Estimate the memory used by a document loaded from file_locations, from the size of the files.
+    """
+    size = 0
+    for file_location in file_locations or []:
+        try:
+            size += os.path.getsize(file_location)
+        except OSError:
+            pass
+
+    return size
+
+
+def make_key(file_locations, visualisation_doc_location, settings):
+    """
+    Make the key a model is cached with.
+
+    :param file_locations: Source files the model was loaded from.
+    :param visualisation_doc_location: Location of the visualisation document of the model.
+    :param settings: Tuple of the step settings that change how the sources are loaded.
+    """
+    return sources_fingerprint(file_locations), source_key(visualisation_doc_location), settings
+
+
+class DocumentCache(object):
+    """
+    Least recently used cache of loaded ArgonViewerModels, bounded by an estimate of their memory use.
+    A model is taken out of the cache while it is in use and put back once it is finished with.
+    """
+
+    def __init__(self, max_size):
+        """
+        :param max_size: Maximum total estimated size of the cached documents in bytes.
+        """
+        self._max_size = max_size
+        self._entries = OrderedDict()
+
+    def take(self, key):
+        """
+        Remove and return the model cached with key.
+
+        :return: ArgonViewerModel, or None if nothing is cached with key.
+        """
+        entry = self._entries.pop(key, None)
+        return None if entry is None else entry['model']
+
+    def takeReloadable(self, key):
+        """
+        Remove and return a model loaded from the same files as key, in the same way, where some of the files changed.
+        Used with ArgonViewerModel.reloadSources to read only the changed files.
+
+        :return: ArgonViewerModel, or None if no model was loaded from the same files.
+        """
+        for cached_key in reversed(self._entries):
+            if cached_key[1:] == key[1:] and _same_files(cached_key[0], key[0]):
+                return self._entries.pop(cached_key)['model']
+
+        return None
+
+    def put(self, key, model, size):
+        """
+        Cache model with key, evicting the least recently used models if the cache is over its size.
+
+        :param key: Key from make_key.
+        :param model: Loaded ArgonViewerModel.
+        :param size: Estimated memory used by the model in bytes.
+        """
+        self._entries.pop(key, None)
+        if size > self._max_size:
+            return
+
+        self._entries[key] = {'model': model, 'size': size}
+        total_size = sum(entry['size'] for entry in self._entries.values())
+        while total_size > self._max_size:
+            _, entry = self._entries.popitem(last=False)
+            total_size -= entry['size']
+
+    def retainSources(self, fingerprint):
+        """
+        Remove the models loaded from files other than those in fingerprint.
+        Models loaded from earlier versions of the same files are kept, they can be reloaded.
+        """
+        for key in [key for key in self._entries if not _same_files(key[0], fingerprint)]:
+            del self._entries[key]
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,209 @@
+"""
+Persistent catalogue of the visualisation documents in a previous documents directory.
+
+The catalogue is stored in the directory itself and records the size, modification time,
+content hash and a summary of each document.  It is updated as documents are written so
+listing the documents does not need to open any of them.  If the directory has been changed
+by something else, detected from its modification time, only the new or changed documents
+are examined again.
+"""
+import hashlib
+import json
+import os
+
+from mapclientplugins.argonviewerstep.model.filetype import is_argon_file
+
+CATALOGUE_FILE_NAME = '.catalogue.json'
+CATALOGUE_VERSION = 1
+
+
+def content_hash(content):
+    """
+    Get the hash used to identify the contents of a document.
+
+    :param content: Document contents as a string or bytes.
+    """
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    return hashlib.sha256(content).hexdigest()
+
+
+def summarise_state(state):
+    """
+    Get the views and regions summary from a serialized Argon document.
+    """
+    try:
+        d = json.loads(state)
+    except json.JSONDecodeError:
+        return {'views': [], 'regions': []}
+
+    return {
+        'views': [v.get('Name') for v in d.get('Views', {}).get('Children', [])],
+        'regions': [r.get('Name') for r in d.get('RootRegion', {}).get('ChildRegions', [])],
+    }
+
+
+def summarise_document(document):
+    """
+    Get the views and regions summary from an Argon document.
+    """
+    root_region = document.getRootRegion()
+    return {
+        'views': [v.getName() for v in document.getViewManager().getViews()],
+        'regions': [root_region.getChild(index).getName() for index in range(root_region.getChildCount())],
+    }
+
+
+def _is_catalogued_name(name):
+    return not name.startswith('.')
+
+
+class DocumentCatalogue(object):
+
+    def __init__(self, directory):
+        self._directory = directory
+        self._entries = None
+        self._directory_mtime = None
+
+    def getDirectory(self):
+        return self._directory
+
+    def _catalogue_location(self):
+        return os.path.join(self._directory, CATALOGUE_FILE_NAME)
+
+    def _directory_mtime_ns(self):
+        return os.stat(self._directory).st_mtime_ns
+
+    def _load(self):
+        try:
+            with open(self._catalogue_location()) as f:
+                d = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            d = {}
+
+        if d.get('version') == CATALOGUE_VERSION:
+            self._entries = d.get('documents', {})
+            self._directory_mtime = d.get('directory_mtime')
+        else:
+            self._entries = {}
+            self._directory_mtime = None
+
+    def _save(self):
+        # Written in place, rewriting an existing file does not change the directory modification time.
+        self._directory_mtime = self._directory_mtime_ns()
+        d = {
+            'version': CATALOGUE_VERSION,
+            'directory_mtime': self._directory_mtime,
+            'documents': self._entries,
+        }
+        try:
+            with open(self._catalogue_location(), 'w') as f:
+                json.dump(d, f, indent=1)
+        except OSError:
+            # The catalogue is only a cache, it will be rebuilt next time.
+            pass
+
+    @staticmethod
+    def _make_entry(stat_result, hash_value, summary):
+        return {
+            'size': stat_result.st_size,
+            'mtime': stat_result.st_mtime_ns,
+            'hash': hash_value,
+            'views': summary['views'],
+            'regions': summary['regions'],
+        }
+
+    def _examine(self, name, stat_result):
+        location = os.path.join(self._directory, name)
+        if not is_argon_file(location):
+            return None
+
+        with open(location, 'rb') as f:
+            content = f.read()
+
+        return self._make_entry(stat_result, content_hash(content), summarise_state(content))
+
+    def _reconcile(self):
+        """
+        Bring the catalogue up to date with the directory, only examining documents whose size or
+        modification time changed.
+        """
+        entries = {}
+        with os.scandir(self._directory) as it:
+            for dir_entry in it:
+                if not _is_catalogued_name(dir_entry.name) or not dir_entry.is_file():
+                    continue
+                stat_result = dir_entry.stat()
+                entry = self._entries.get(dir_entry.name)
+                if entry is None or entry['size'] != stat_result.st_size or entry['mtime'] != stat_result.st_mtime_ns:
+                    entry = self._examine(dir_entry.name, stat_result)
+                if entry is not None:
+                    entries[dir_entry.name] = entry
+
+        self._entries = entries
+        self._save()
+
+    def _ensure_loaded(self):
+        if self._entries is None:
+            self._load()
+            if self._directory_mtime is None:
+                # No usable catalogue on disk, build one from the directory.
+                self._reconcile()
+
+    def _ensure_current(self):
+        self._ensure_loaded()
+        if self._directory_mtime != self._directory_mtime_ns():
+            self._reconcile()
+
+    def documents(self):
+        """
+        Get the names of the documents in the directory, sorted by name.
+        """
+        self._ensure_current()
+        return sorted(self._entries.keys())
+
+    def entry(self, name):
+        """
+        Get the catalogue entry for the named document, None if it is not catalogued.
+        The entry is a dict with keys size, mtime, hash, views and regions.
+        """
+        self._ensure_current()
+        return self._entries.get(name)
+
+    def entries(self):
+        self._ensure_current()
+        return dict(self._entries)
+
+    def update(self, name, hash_value, summary):
+        """
+        Record that the named document has just been written.
+        Like rename and remove this also picks up any other changes to the directory.
+
+        :param name: Name of the document in the directory.
+        :param hash_value: Hash of the contents written to the document, from content_hash.
+        :param summary: Views and regions summary, from summarise_state or summarise_document.
+        """
+        self._ensure_loaded()
+        stat_result = os.stat(os.path.join(self._directory, name))
+        self._entries[name] = self._make_entry(stat_result, hash_value, summary)
+        # Any other change to the directory since it was last reconciled is hidden by this change
+        # to its modification time, so the directory is reconciled before the time is recorded.
+        self._reconcile()
+
+    def rename(self, old_name, new_name):
+        """
+        Record that a document has been renamed.
+        """
+        self._ensure_loaded()
+        entry = self._entries.pop(old_name, None)
+        if entry is not None:
+            self._entries[new_name] = entry
+        self._reconcile()
+
+    def remove(self, name):
+        """
+        Record that the named document has been deleted.
+        """
+        self._ensure_loaded()
+        self._entries.pop(name, None)
+        self._reconcile()
@@ -0,0 +1,145 @@
+"""
+Loading of further Argon documents into a document, so they can be compared with it.
+
+Each comparison document is read into its own child region of the document and its views
+are added to the document, named after the comparison document and showing its region.
+All the documents then share one Zinc context, so one timekeeper keeps them in step.
+The documents are read and decoded concurrently in a thread pool, ahead of being deserialized
+one at a time into the document on the calling thread, which owns its Zinc objects.
+"""
+import os
+
+from concurrent.futures import ThreadPoolExecutor
+
+from cmlibs.argon.argonerror import ArgonError
+from cmlibs.argon.argonlogger import ArgonLogger
+
+from mapclientplugins.argonviewerstep.model.documentstream import read_document_state
+from mapclientplugins.argonviewerstep.model.exfingestion import update_timekeeper
+
+
+def comparison_region_name(root_region, filename):
+    """
+    Get a name for the region of the document in filename, from the file name, unique among the children of root_region.
+
+    :param root_region: ArgonRegion the comparison region is created in.
+    :param filename: Name of the Argon document file.
+    """
+    base_name = os.path.splitext(os.path.basename(filename))[0] or 'comparison'
+    zinc_root_region = root_region.getZincRegion()
+    name = base_name
+    count = 1
+    while zinc_root_region.findChildByName(name).isValid():
+        count += 1
+        name = f'{base_name}{count}'
+
+    return name
+
+
+def _comparison_views(views_state, region_name):
+    """
+    Get the views of a comparison document, renamed after region_name and showing its region.
+    A document without views gets a single view of its region.
+    """
+    views = views_state.get('Children', []) if views_state else []
+    if not views:
+        return [{'Name': region_name, 'Scenes': [{'Row': 0, 'Col': 0, 'Sceneviewer': {'Scene': region_name}}]}]
+
+    for view in views:
+        view['Name'] = f"{region_name}: {view.get('Name') or 'View'}"
+        for scene in view.get('Scenes', []):
+            # Scenes name a child of the root region, which is now the comparison region.
+            scene.setdefault('Sceneviewer', {})['Scene'] = region_name
+
+    return views
+
+
+def merge_document_state(document, sections, region_name):
+    """
+    Deserialize the sections of a comparison document from read_document_state into a new child region of document.
+    Tessellations, spectrums and materials are merged with those of document by name.
+
+    :param document: ArgonDocument to merge into.
+    :param sections: Sections of the comparison document, removed as they are merged.
+    :param region_name: Name of the child region to create, from comparison_region_name.
+    """
+    for key, module in (('Tessellations', document.getTessellations()),
+                        ('Spectrums', document.getSpectrums()),
+                        ('Materials', document.getMaterials())):
+        if key in sections:
+            module.deserialize(sections.pop(key))
+
+    root_region = document.getRootRegion()
+    region = root_region.createChild()
+    if region is None:
+        raise ArgonError(f"Failed to create region '{region_name}'")
+
+    try:
+        if not region.setName(region_name):
+            raise ArgonError(f"Failed to name region '{region_name}'")
+        region.deserialize(sections.pop('RootRegion'))
+    except ArgonError:
+        root_region.removeChild(region)
+        raise
+
+    view_manager = document.getViewManager()
+    # ArgonViewManager.deserialize replaces the active view, keep the active view of document.
+    views_state = {'Children': _comparison_views(sections.pop('Views', None), region_name)}
+    active_view = view_manager.getActiveView()
+    if active_view is not None:
+        views_state['ActiveView'] = active_view
+    view_manager.deserialize(views_state)
+
+
+def _read_state(filename):
+    try:
+        return read_document_state(filename), None
+    except (ArgonError, OSError, ValueError) as e:
+        return None, e
+
+
+def load_comparison_documents(document, filenames, max_workers=None, progress_callback=None, cancel_event=None):
+    """
+    Load the Argon documents in filenames into document for comparison, each into its own child region.
+    Documents that fail to load are reported to the Argon logger and skipped.
+
+    :param document: ArgonDocument to load into.
+    :param filenames: List of Argon document file names.
+    :param max_workers: Number of reader threads, defaults to min(4, number of files).
+    :param progress_callback: Optional callable taking (step, step_count, message).
+    :param cancel_event: Optional threading.Event, when set no further documents are loaded.
+    :return: List of the names of the regions created, or None if cancelled.
+    """
+    region_names = []
+    if not filenames:
+        return region_names
+
+    if max_workers is None:
+        max_workers = min(4, len(filenames))
+
+    root_region = document.getRootRegion()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_read_state, filename) for filename in filenames]
+        try:
+            for index, (filename, future) in enumerate(zip(filenames, futures)):
+                if cancel_event is not None and cancel_event.is_set():
+                    return None
+                if progress_callback is not None:
+                    progress_callback(index, len(filenames), f'Comparing {os.path.basename(filename)}')
+
+                sections, error = future.result()
+                if error is None:
+                    region_name = comparison_region_name(root_region, filename)
+                    try:
+                        merge_document_state(document, sections, region_name)
+                        region_names.append(region_name)
+                    except ArgonError as e:
+                        error = e
+                if error is not None:
+                    ArgonLogger.writeErrorMessage(f'Failed to load Argon document {filename} for comparison: {error}')
+        finally:
+            for future in futures:
+                future.cancel()
+
+    update_timekeeper(root_region.getZincRegion())
+    return region_names
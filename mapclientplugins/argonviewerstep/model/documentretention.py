@@ -0,0 +1,100 @@
+"""
+Retention policy for the visualisation documents in a previous documents directory.
+
+Every configured step writes a document into its previous documents directory and renamed
+or abandoned documents are left behind, so without a policy the directory grows without bound.
+The policy works from the document catalogue so applying it does not open any documents.
+"""
+import os
+import time
+
+from mapclientplugins.argonviewerstep.model.documentwriter import is_temporary_file
+
+# Temporary files older than this were left by an interrupted write and can be removed.
+STALE_TEMPORARY_FILE_AGE = 24 * 60 * 60
+
+
+def _remove_document(catalogue, name):
+    try:
+        os.remove(os.path.join(catalogue.getDirectory(), name))
+    except FileNotFoundError:
+        pass
+    catalogue.remove(name)
+
+
+def _remove_stale_temporary_files(directory, now):
+    removed = []
+    with os.scandir(directory) as it:
+        for dir_entry in it:
+            if is_temporary_file(dir_entry.name) and dir_entry.is_file() and \
+                    now - dir_entry.stat().st_mtime > STALE_TEMPORARY_FILE_AGE:
+                try:
+                    os.remove(dir_entry.path)
+                    removed.append(dir_entry.name)
+                except OSError:
+                    pass
+
+    return removed
+
+
+def _duplicate_documents(entries, referenced):
+    """
+    Get the names of the documents with the same contents as another document that is kept.
+    Referenced documents are kept in preference, otherwise the most recently written one is kept.
+    """
+    by_hash = {}
+    for name, entry in entries.items():
+        by_hash.setdefault(entry['hash'], []).append(name)
+
+    duplicates = []
+    for names in by_hash.values():
+        if len(names) > 1:
+            names.sort(key=lambda n: (n in referenced, entries[n]['mtime']), reverse=True)
+            duplicates.extend(n for n in names[1:] if n not in referenced)
+
+    return duplicates
+
+
+def apply_retention(catalogue, referenced=None, max_count=0, max_size=0, max_age=0, keep_referenced=True,
+                    deduplicate=True, now=None):
+    """
+    Remove documents from the catalogue directory according to the retention policy.
+    Documents are removed oldest first until every limit is met.  A limit of zero means no limit.
+
+    :param catalogue: DocumentCatalogue of the directory.
+    :param referenced: Names of the documents referenced by the step configuration.
+    :param max_count: Maximum number of documents kept.
+    :param max_size: Maximum total size of the documents kept, in bytes.
+    :param max_age: Maximum age of the documents kept, in seconds.
+    :param keep_referenced: If True referenced documents are never removed.
+    :param deduplicate: If True documents with the same contents as a kept document are removed.
+    :param now: Time to measure document ages from, defaults to the current time.
+    :return: List of the names of the removed documents, including stale temporary files.
+    """
+    if now is None:
+        now = time.time()
+    referenced = set(referenced) if referenced and keep_referenced else set()
+
+    removed = _remove_stale_temporary_files(catalogue.getDirectory(), now)
+    entries = catalogue.entries()
+    if deduplicate:
+        for name in _duplicate_documents(entries, referenced):
+            _remove_document(catalogue, name)
+            removed.append(name)
+            del entries[name]
+
+    count = len(entries)
+    size = sum(entry['size'] for entry in entries.values())
+    for name in sorted(entries, key=lambda n: entries[n]['mtime']):
+        if name in referenced:
+            continue
+
+        entry = entries[name]
+        expired = max_age > 0 and now - entry['mtime'] / 1e9 > max_age
+        if expired or (0 < max_count < count) or (0 < max_size < size):
+            _remove_document(catalogue, name)
+            removed.append(name)
+            count -= 1
+            size -= entry['size']
+
+    return removed
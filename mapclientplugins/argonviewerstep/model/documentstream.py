@@ -0,0 +1,232 @@
+"""
+Streamed writing, and sectioned reading, of Argon documents.
+
+ArgonDocument only serializes to, and deserializes from, a complete string, which is held
+in memory alongside the equivalent Python objects.  Here documents are written by encoding
+the document state in chunks straight to the file, so the text of the document is never held
+in memory.  Reading is not streamed: the members of the top level object are decoded one at a
+time, but RootRegion, which is almost all of a document, is decoded whole and deserialized in
+one call, as ArgonRegion only deserializes a complete region tree.  Reading therefore only saves
+holding the text of the other members, while writing saves holding the text of the whole document.
+The documents read and written are the same as those of ArgonDocument.
+Relative model source paths are resolved against the document location rather than the
+current working directory, so documents can be read from any thread.
+"""
+import hashlib
+import json
+import os
+import re
+
+from packaging import version
+
+from cmlibs.argon.argondocument import ARGON_DOCUMENT_VERSION_KEY
+from cmlibs.argon.argonerror import ArgonError
+from cmlibs.argon.settings import mainsettings
+
+from mapclientplugins.argonviewerstep.model.documentwriter import write_chunks_atomically
+
+READ_CHUNK_SIZE = 1024 * 1024
+WRITE_CHUNK_SIZE = 64 * 1024
+
+# Sections are deserialized in the same order as ArgonDocument.deserialize.
+_SECTION_ORDER = ('Tessellations', 'Spectrums', 'Materials', 'Views', 'RootRegion')
+_WHITESPACE_RE = re.compile(r'[ \t\n\r]*')
+_decoder = json.JSONDecoder()
+
+
+def document_state(document, base_path=None):
+    """
+    Get the state of document, as serialized by ArgonDocument.serialize, as Python objects.
+    This reads from Zinc so must be called from the thread that owns the document.
+
+    :param document: ArgonDocument.
+    :param base_path: Model source paths are written relative to base_path if given.
+    """
+    return {
+        ARGON_DOCUMENT_VERSION_KEY: mainsettings.VERSION_LIST,
+        'Spectrums': document.getSpectrums().serialize(),
+        'Materials': document.getMaterials().serialize(),
+        'Views': document.getViewManager().serialize(),
+        'Tessellations': document.getTessellations().serialize(),
+        'RootRegion': document.getRootRegion().serialize(base_path),
+    }
+
+
+def _encode_chunks(state):
+    encoder = json.JSONEncoder(default=lambda o: o.__dict__, sort_keys=True, indent=2)
+    pending = []
+    pending_size = 0
+    for text in encoder.iterencode(state):
+        pending.append(text)
+        pending_size += len(text)
+        if pending_size >= WRITE_CHUNK_SIZE:
+            yield ''.join(pending)
+            pending = []
+            pending_size = 0
+
+    if pending:
+        yield ''.join(pending)
+
+
+def write_document_state(filename, state):
+    """
+    Write a document state from document_state to filename atomically, encoding it in chunks.
+    The contents are the same as writing the string from ArgonDocument.serialize.
+
+    :return: The content hash of the written document, as given by documentcatalogue.content_hash.
+    """
+    content_hash = hashlib.sha256()
+
+    def _hashed_chunks():
+        for chunk in _encode_chunks(state):
+            content_hash.update(chunk.encode('utf-8'))
+            yield chunk
+
+    write_chunks_atomically(filename, _hashed_chunks())
+    return content_hash.hexdigest()
+
+
+class _ObjectMemberReader(object):
+    """
+    Decodes the members of the top level JSON object in a text file one at a time.
+    Only the text of the member being decoded is held in memory.
+    """
+
+    def __init__(self, f, chunk_size):
+        self._file = f
+        self._chunk_size = chunk_size
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+
+    def _read(self, size):
+        text = self._file.read(size)
+        if text:
+            self._buffer = self._buffer[self._pos:] + text
+            self._pos = 0
+        else:
+            self._eof = True
+
+    def _skip_whitespace(self):
+        while True:
+            self._pos = _WHITESPACE_RE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer) or self._eof:
+                return
+            self._read(self._chunk_size)
+
+    def _expect(self, characters):
+        self._skip_whitespace()
+        if self._pos >= len(self._buffer) or self._buffer[self._pos] not in characters:
+            raise json.JSONDecodeError(f'Expecting one of {characters!r}', self._buffer, self._pos)
+        self._pos += 1
+        return self._buffer[self._pos - 1]
+
+    def _decode(self):
+        self._skip_whitespace()
+        while True:
+            available = len(self._buffer) - self._pos
+            try:
+                value, end = _decoder.raw_decode(self._buffer, self._pos)
+                # A number at the end of the buffer may continue in the next chunk.
+                if end < len(self._buffer) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            # Read until the available text doubles so decoding large values stays linear.
+            while not self._eof and len(self._buffer) - self._pos < 2 * available:
+                self._read(max(self._chunk_size, available))
+
+    def __iter__(self):
+        self._expect('{')
+        self._skip_whitespace()
+        if self._buffer.startswith('}', self._pos):
+            return
+
+        while True:
+            key = self._decode()
+            if not isinstance(key, str):
+                raise json.JSONDecodeError('Expecting property name', self._buffer, self._pos)
+            self._expect(':')
+            yield key, self._decode()
+            if self._expect(',}') == '}':
+                return
+
+
+def _check_version(document_version):
+    document_version_string = '.'.join(document_version)
+    if version.parse(document_version_string) > version.parse(mainsettings.VERSION_STRING):
+        raise ArgonError(f"Document version '{document_version_string}' is greater than this version of Argon ({mainsettings.VERSION_STRING})."
+                         f" Please update your Argon application.")
+
+
+def _resolve_model_sources(region_state, base_path):
+    """
+    Resolve the relative file names of the model sources in region_state, and in its child regions, against base_path.
+    """
+    for source in region_state.get('Model', {}).get('Sources', []):
+        file_name = source.get('FileName')
+        if source.get('Type') == 'FILE' and file_name and not os.path.isabs(file_name):
+            source['FileName'] = os.path.normpath(os.path.join(base_path, file_name))
+
+    for child_state in region_state.get('ChildRegions', []):
+        _resolve_model_sources(child_state, base_path)
+
+
+def read_document_state(filename, base_path=None, chunk_size=READ_CHUNK_SIZE):
+    """
+    Read the sections of the Argon document in filename, with relative model source paths resolved.
+    This does not use Zinc so can be called from any thread.
+
+    :param filename: Name of the Argon document file.
+    :param base_path: Directory relative model source paths are resolved from, defaults to the directory of filename.
+    :param chunk_size: Number of characters read from the file at a time.
+    :return: Dict of the document sections, for deserialize_document_state.
+    """
+    if base_path is None:
+        base_path = os.path.dirname(os.path.abspath(filename))
+
+    sections = {}
+    with open(filename, encoding='utf-8') as f:
+        for key, value in _ObjectMemberReader(f, chunk_size):
+            # The version comes first in documents written by Argon, so newer documents are rejected before any more is read.
+            if key == ARGON_DOCUMENT_VERSION_KEY:
+                _check_version(value)
+            sections[key] = value
+
+    if not ((ARGON_DOCUMENT_VERSION_KEY in sections) and ('RootRegion' in sections)):
+        raise ArgonError('Invalid Argon document')
+
+    _resolve_model_sources(sections['RootRegion'], base_path)
+    return sections
+
+
+def deserialize_document_state(document, sections):
+    """
+    Deserialize the sections from read_document_state into document, in the order of ArgonDocument.deserialize.
+    The sections are removed from sections as they are deserialized.
+    """
+    deserializers = {
+        'Tessellations': document.getTessellations().deserialize,
+        'Spectrums': document.getSpectrums().deserialize,
+        'Materials': document.getMaterials().deserialize,
+        'Views': document.getViewManager().deserialize,
+        'RootRegion': document.getRootRegion().deserialize,
+    }
+    for key in _SECTION_ORDER:
+        if key in sections:
+            deserializers[key](sections.pop(key))
+
+
+def read_document(document, filename, base_path=None, chunk_size=READ_CHUNK_SIZE):
+    """
+    Read the Argon document in filename into document, the equivalent of ArgonDocument.deserialize
+    with the contents of filename, run from the directory of filename.
+
+    :param document: ArgonDocument to read into.
+    :param filename: Name of the Argon document file.
+    :param base_path: Directory relative model source paths are resolved from, defaults to the directory of filename.
+    :param chunk_size: Number of characters read from the file at a time.
+    """
+    deserialize_document_state(document, read_document_state(filename, base_path, chunk_size))
@@ -0,0 +1,49 @@
+import os
+import tempfile
+
+TEMPORARY_FILE_PREFIX = '.'
+TEMPORARY_FILE_SUFFIX = '.tmp'
+DEFAULT_FILE_MODE = 0o644
+
+
+def is_temporary_file(filename):
+    name = os.path.basename(filename)
+    return name.startswith(TEMPORARY_FILE_PREFIX) and name.endswith(TEMPORARY_FILE_SUFFIX)
+
+
+def write_file_atomically(filename, content):
+    """
+    Write content to filename so that filename either keeps its previous contents or has all of the new contents.
+    The content is written to a temporary file in the same directory, flushed to disk and renamed over filename.
+
+    :param filename: Name of the file to write.
+    :param content: String to write.
+    """
+    write_chunks_atomically(filename, [content])
+
+
+def write_chunks_atomically(filename, chunks):
+    """
+    Write the strings from chunks to filename in the same way as write_file_atomically,
+    without joining them in memory first.
+
+    :param filename: Name of the file to write.
+    :param chunks: Iterable of strings.
+    """
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, temporary_filename = tempfile.mkstemp(prefix=TEMPORARY_FILE_PREFIX + os.path.basename(filename) + '.',
+                                              suffix=TEMPORARY_FILE_SUFFIX, dir=directory)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            for chunk in chunks:
+                f.write(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+        # Temporary files are only readable by the owner, keep the permissions of the file being replaced.
+        mode = os.stat(filename).st_mode & 0o777 if os.path.exists(filename) else DEFAULT_FILE_MODE
+        os.chmod(temporary_filename, mode)
+        os.replace(temporary_filename, filename)
+    except BaseException:
+        if os.path.exists(temporary_filename):
+            os.remove(temporary_filename)
+        raise
@@ -0,0 +1,265 @@
+"""
+Ingestion of a list of EX/EXF files into an Argon document.
+
+Files are parsed one at a time on the calling thread, while reading and
+classifying the files is done concurrently in a thread pool ahead of the
+parser, so disk and network latency overlaps with parsing.
+With a region cache, files already in the cache are read from their cached
+conversion instead.
+"""
+import os
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from cmlibs.argon.argonmodelsources import ArgonModelSourceFile
+from cmlibs.zinc.field import Field
+from cmlibs.zinc.result import RESULT_OK
+
+from mapclientplugins.argonviewerstep.model.filetype import sniff_file_type, FILE_TYPE_AMBIGUOUS, FILE_TYPE_EXF
+
+EXF_INGESTION_NONE = 'none'
+EXF_INGESTION_ROOT = 'root'
+EXF_INGESTION_CHILD_REGIONS = 'child-regions'
+
+# Streamed by timeseries.TimeSeries rather than ingested here.
+EXF_INGESTION_TIME_SERIES = 'time-series'
+
+EXF_INGESTION_MODES = [EXF_INGESTION_NONE, EXF_INGESTION_ROOT, EXF_INGESTION_CHILD_REGIONS, EXF_INGESTION_TIME_SERIES]
+# Modes the memory budget applies to, a time series only holds one frame at a time.
+EXF_INGESTION_BUDGETED_MODES = [EXF_INGESTION_ROOT, EXF_INGESTION_CHILD_REGIONS]
+
+
+def _read_candidate(filename, region_cache):
+    """
+    Read the contents of filename if it may be an EX/EXF file, unless it has a cached conversion.
+
+    :return: Tuple of (data, cached_location), data is the contents of the file as bytes, or None if it
+      is not an EX/EXF file or the location of its cached conversion is given instead.
+    """
+    if region_cache is not None:
+        cached_location = region_cache.lookup(filename)
+        if cached_location is not None:
+            return None, cached_location
+
+    if sniff_file_type(filename) not in (FILE_TYPE_EXF, FILE_TYPE_AMBIGUOUS):
+        return None, None
+
+    with open(filename, 'rb') as f:
+        return f.read(), None
+
+
+def read_exf_candidates(filenames, max_workers=None, read_ahead=None, region_cache=None):
+    """
+    Generator reading the given files concurrently, yielding (filename, data, cached_location) in the order given.
+    At most read_ahead files are held in memory ahead of the consumer.
+
+    :param filenames: List of file names to read.
+    :param max_workers: Number of reader threads, defaults to min(4, number of files).
+    :param read_ahead: Number of files read ahead of the consumer, defaults to twice max_workers.
+    :param region_cache: Optional RegionCache to look the files up in.
+    """
+    if not filenames:
+        return
+
+    if max_workers is None:
+        max_workers = min(4, len(filenames))
+    if read_ahead is None:
+        read_ahead = 2 * max_workers
+
+    pending = deque()
+    remaining = iter(filenames)
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='ArgonViewerExfReader') as executor:
+        for filename in remaining:
+            pending.append((filename, executor.submit(_read_candidate, filename, region_cache)))
+            if len(pending) >= read_ahead:
+                break
+
+        try:
+            while pending:
+                filename, future = pending.popleft()
+                next_filename = next(remaining, None)
+                if next_filename is not None:
+                    pending.append((next_filename, executor.submit(_read_candidate, next_filename, region_cache)))
+                yield (filename, *future.result())
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+
+def region_name_for_file(filename):
+    name = os.path.basename(filename)
+    for extension in ('.exf', '.exnode', '.exelem', '.ex2', '.ex'):
+        if name.lower().endswith(extension):
+            return name[:-len(extension)]
+
+    return name
+
+
+def exf_region_names(filenames):
+    """
+    Get the names of the child regions the files in filenames are read into in EXF_INGESTION_CHILD_REGIONS mode.
+    Each file is named after its base name, files with a base name already taken get a numeric suffix in the
+    order given, so every source path has a region of its own.
+
+    :param filenames: List of all the EX/EXF file names of the sources.
+    :return: Dict of normalised file name to region name.
+    """
+    region_names = {}
+    used_names = set()
+    for filename in filenames:
+        key = os.path.normpath(filename)
+        if key in region_names:
+            continue
+
+        base_name = region_name_for_file(filename)
+        name = base_name
+        count = 1
+        while name in used_names:
+            count += 1
+            name = f'{base_name}{count}'
+        used_names.add(name)
+        region_names[key] = name
+
+    return region_names
+
+
+def _target_region(root_region, filename, mode, region_names):
+    """
+    Find or create the Argon region the file is read into.
+    Reading into an existing child region keeps any scene restored from a previous document.
+
+    :param region_names: Dict of region names from exf_region_names.
+    :return: Tuple of (ArgonRegion, created) where created is True if a new child region was created.
+    """
+    if mode == EXF_INGESTION_ROOT:
+        return root_region, False
+
+    name = region_names[os.path.normpath(filename)]
+    for index in range(root_region.getChildCount()):
+        child = root_region.getChild(index)
+        if child.getName() == name:
+            return child, False
+
+    child = root_region.createChild()
+    child.setName(name)
+    return child, True
+
+
+def clear_exf_regions(root_region, filenames, region_names=None):
+    """
+    Remove the nodes, elements and child regions of the child regions the files in filenames were
+    read into in EXF_INGESTION_CHILD_REGIONS mode, so reading the files again gives only what they define.
+    The fields and scenes of the regions are kept.
+
+    :param region_names: Dict of region names from exf_region_names for all the sources,
+      defaults to the names of filenames alone.
+    """
+    if region_names is None:
+        region_names = exf_region_names(filenames)
+    names = [region_names[os.path.normpath(filename)] for filename in filenames]
+    for index in range(root_region.getChildCount()):
+        region = root_region.getChild(index)
+        if region.getName() not in names:
+            continue
+
+        while region.getChildCount():
+            region.removeChild(region.getChild(0))
+        fieldmodule = region.getZincRegion().getFieldmodule()
+        fieldmodule.beginChange()
+        for dimension in (3, 2, 1):
+            fieldmodule.findMeshByDimension(dimension).destroyAllElements()
+        for domain_type in (Field.DOMAIN_TYPE_NODES, Field.DOMAIN_TYPE_DATAPOINTS):
+            fieldmodule.findNodesetByFieldDomainType(domain_type).destroyAllNodes()
+        fieldmodule.endChange()
+
+
+def defer_exf_files(root_region, filenames, mode, region_names=None):
+    """
+    Add the files in filenames as model sources of the regions they would be read into, without reading them.
+    They are read when applied from the Model Sources editor.
+
+    :param root_region: ArgonRegion the files would be read into.
+    :param filenames: List of EX/EXF file names.
+    :param mode: One of EXF_INGESTION_ROOT or EXF_INGESTION_CHILD_REGIONS.
+    :param region_names: Dict of region names from exf_region_names for all the sources,
+      defaults to the names of filenames alone.
+    """
+    if region_names is None:
+        region_names = exf_region_names(filenames)
+    for filename in filenames:
+        region, _ = _target_region(root_region, filename, mode, region_names)
+        file_names = [os.path.normpath(model_source.getFileName()) for model_source in region.getModelSources()]
+        if os.path.normpath(filename) not in file_names:
+            model_source = ArgonModelSourceFile(filename)
+            model_source.setEdit(True)
+            region.addModelSource(model_source)
+
+
+def update_timekeeper(zinc_root_region):
+    """
+    Set the range of the default timekeeper to the time range of zinc_root_region and its child regions.
+    """
+    result, minimum_time, maximum_time = zinc_root_region.getTimeRange()
+    if result == RESULT_OK:
+        timekeeper = zinc_root_region.getScene().getTimekeepermodule().getDefaultTimekeeper()
+        timekeeper.setMinimumTime(minimum_time)
+        timekeeper.setMaximumTime(maximum_time)
+
+
+def ingest_exf_files(root_region, filenames, mode, progress_callback=None, cancel_event=None, region_cache=None,
+                     region_names=None):
+    """
+    Read every EX/EXF file in filenames into root_region, or into a child region per file.
+    Files that are not EX/EXF files are skipped.
+
+    :param root_region: ArgonRegion to read the files into.
+    :param filenames: List of file names.
+    :param mode: One of EXF_INGESTION_ROOT or EXF_INGESTION_CHILD_REGIONS.
+    :param progress_callback: Optional callable taking (step, step_count, message).
+    :param cancel_event: Optional threading.Event, when set no further files are read.
+    :param region_cache: Optional RegionCache to read the files through.
+    :param region_names: Dict of region names from exf_region_names for all the sources,
+      defaults to the names of filenames alone.
+    :return: List of the file names successfully read, or None if cancelled.
+    """
+    if region_names is None:
+        region_names = exf_region_names(filenames)
+    ingested = []
+    # Zinc crashes if a region is removed during a hierarchical change, so failed regions are removed afterwards.
+    failed_regions = []
+    step_count = len(filenames)
+    zinc_root_region = root_region.getZincRegion()
+    zinc_root_region.beginHierarchicalChange()
+    try:
+        for index, (filename, data, cached_location) in enumerate(read_exf_candidates(filenames, region_cache=region_cache)):
+            if cancel_event is not None and cancel_event.is_set():
+                return None
+
+            if data is None and cached_location is None:
+                continue
+
+            if progress_callback is not None:
+                progress_callback(index, step_count, f'Reading {os.path.basename(filename)}')
+
+            region, created = _target_region(root_region, filename, mode, region_names)
+            zinc_region = region.getZincRegion()
+            if region_cache is not None:
+                result = region_cache.read(zinc_region, filename, data, cached_location)
+            else:
+                stream_information = zinc_region.createStreaminformationRegion()
+                stream_information.createStreamresourceMemoryBuffer(data)
+                result = zinc_region.read(stream_information)
+            if result == RESULT_OK:
+                ingested.append(filename)
+            elif created:
+                failed_regions.append(region)
+    finally:
+        zinc_root_region.endHierarchicalChange()
+        for region in failed_regions:
+            root_region.removeChild(region)
+        if region_cache is not None:
+            region_cache.flush()
+
+    update_timekeeper(zinc_root_region)
+    return ingested
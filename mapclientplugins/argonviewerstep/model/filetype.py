@@ -0,0 +1,161 @@
+"""
+Cheap detection of the type of file handed to the Argon viewer.
+
+Classification only looks at a bounded prefix of the file.  A full parse is
+only done when the prefix is not enough to decide.
+"""
+import codecs
+import json
+import os
+import re
+
+from cmlibs.argon.argondocument import ARGON_DOCUMENT_VERSION_KEY
+from cmlibs.argon.utilities import is_argon_file as _validate_argon_file
+
+from mapclientplugins.argonviewerstep.model.utilities import is_exf_file as _validate_exf_file
+
+FILE_TYPE_UNKNOWN = 'unknown'
+FILE_TYPE_AMBIGUOUS = 'ambiguous'
+FILE_TYPE_ARGON = 'argon'
+FILE_TYPE_EXF = 'exf'
+
+SNIFF_PREFIX_SIZE = 64 * 1024
+
+# Line starts that only appear in Zinc EX/EXF files.
+_EX_SIGNATURES = (
+    'EX Version:',
+    '!#nodeset',
+    '!#mesh',
+)
+# Line starts of EX/EXF files written without a signature, only conclusive together with a field header.
+_EX_HEADERS = (
+    'Region:',
+    'Group name:',
+)
+_EX_FIELDS_HEADER = '#Fields='
+
+# Argon documents are serialized with sorted keys, so the version key is the first key.
+_ARGON_HEADER_RE = re.compile(r'\s*\{\s*"' + re.escape(ARGON_DOCUMENT_VERSION_KEY) + r'"\s*:')
+
+
+def _read_prefix(filename, prefix_size):
+    """
+    Read at most prefix_size bytes from the start of the file and decode them as text.
+
+    :return: Tuple of (text, complete) where complete is True if the whole file was read,
+      text is None if the prefix is not text.
+    """
+    with open(filename, 'rb') as f:
+        data = f.read(prefix_size)
+        complete = len(data) < prefix_size or not f.read(1)
+
+    if b'\0' in data:
+        return None, complete
+
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    try:
+        text = decoder.decode(data, final=complete)
+    except UnicodeDecodeError:
+        return None, complete
+
+    return text, complete
+
+
+def _sniff_json(text, complete):
+    if _ARGON_HEADER_RE.match(text):
+        return FILE_TYPE_ARGON
+
+    if complete:
+        try:
+            d = json.loads(text)
+        except json.JSONDecodeError:
+            return FILE_TYPE_UNKNOWN
+
+        return FILE_TYPE_ARGON if isinstance(d, dict) and ARGON_DOCUMENT_VERSION_KEY in d else FILE_TYPE_UNKNOWN
+
+    return FILE_TYPE_AMBIGUOUS if ARGON_DOCUMENT_VERSION_KEY in text else FILE_TYPE_UNKNOWN
+
+
+def _sniff_ex(text):
+    header = False
+    fields_header = False
+    for line in text.splitlines():
+        line = line.lstrip()
+        if line.startswith(_EX_SIGNATURES):
+            return FILE_TYPE_EXF
+
+        header = header or line.startswith(_EX_HEADERS)
+        fields_header = fields_header or line.startswith(_EX_FIELDS_HEADER)
+        if header and fields_header:
+            return FILE_TYPE_EXF
+
+    return FILE_TYPE_AMBIGUOUS
+
+
+def _sniff(filename, prefix_size):
+    """
+    :return: Tuple of (file type, JSON-like) where JSON-like is True if the file looks like JSON.
+    """
+    if not os.path.isfile(filename):
+        return FILE_TYPE_UNKNOWN, False
+
+    try:
+        text, complete = _read_prefix(filename, prefix_size)
+    except OSError:
+        return FILE_TYPE_UNKNOWN, False
+
+    if text is None:
+        return FILE_TYPE_UNKNOWN, False
+
+    stripped_text = text.lstrip()
+    if not stripped_text:
+        return FILE_TYPE_UNKNOWN, False
+
+    if stripped_text.startswith('{'):
+        return _sniff_json(stripped_text, complete), True
+
+    return _sniff_ex(text), False
+
+
+def sniff_file_type(filename, prefix_size=SNIFF_PREFIX_SIZE):
+    """
+    Classify a file from a bounded prefix of its contents.
+
+    :param filename: Name of the file to classify.
+    :param prefix_size: Maximum number of bytes to read from the start of the file.
+    :return: One of FILE_TYPE_ARGON, FILE_TYPE_EXF, FILE_TYPE_UNKNOWN, or
+      FILE_TYPE_AMBIGUOUS if the prefix is not enough to decide.
+    """
+    return _sniff(filename, prefix_size)[0]
+
+
+def detect_file_type(filename, validate_exf=True):
+    """
+    Classify a file, falling back to a full validation only when sniffing
+    the start of the file is ambiguous.
+
+    :param filename: Name of the file to classify.
+    :param validate_exf: Set False to skip the full EXF validation, for callers that
+      will read the file into a region anyway and treat a failed read as not EXF.
+    :return: One of FILE_TYPE_ARGON, FILE_TYPE_EXF or FILE_TYPE_UNKNOWN, or
+      FILE_TYPE_AMBIGUOUS if validate_exf is False and the file may be EXF.
+    """
+    file_type, json_like = _sniff(filename, SNIFF_PREFIX_SIZE)
+    if file_type != FILE_TYPE_AMBIGUOUS:
+        return file_type
+
+    if json_like:
+        return FILE_TYPE_ARGON if _validate_argon_file(filename) else FILE_TYPE_UNKNOWN
+
+    if not validate_exf:
+        return FILE_TYPE_AMBIGUOUS
+
+    return FILE_TYPE_EXF if _validate_exf_file(filename) else FILE_TYPE_UNKNOWN
+
+
+def is_argon_file(filename):
+    return detect_file_type(filename) == FILE_TYPE_ARGON
+
+
+def is_exf_file(filename):
+    return detect_file_type(filename) == FILE_TYPE_EXF
@@ -0,0 +1,178 @@
+"""
+Timing of the phases of a step execution, with optional profiling, reported as JSON.
+
+Phases are timed with named spans, which can nest and can be recorded from any thread.
+cProfile only profiles the thread it is enabled in, so functions run in worker threads
+are wrapped with wrap to be profiled separately, and all the profiles are combined
+into one report.
+"""
+import cProfile
+import importlib.metadata
+import io
+import json
+import os
+import pstats
+import threading
+import time
+
+from contextlib import contextmanager
+
+from mapclientplugins.argonviewerstep.model.documentwriter import write_file_atomically
+
+REPORT_VERSION = 1
+REPORT_FILE_PREFIX = 'run-'
+PROFILE_STATS_COUNT = 50
+REPORTED_PACKAGES = ('cmlibs.zinc', 'cmlibs.argon', 'cmlibs.widgets', 'PySide6')
+
+
+def _package_versions():
+    versions = {}
+    for package in REPORTED_PACKAGES:
+        try:
+            versions[package] = importlib.metadata.version(package)
+        except importlib.metadata.PackageNotFoundError:
+            versions[package] = None
+
+    return versions
+
+
+class Instrumentation(object):
+    """
+    Records named spans for one execution of the step, and profiles it if requested.
+    A disabled Instrumentation records nothing, so it can be used unconditionally.
+    """
+
+    def __init__(self, enabled=False, profile=False):
+        """
+        :param enabled: Record spans.
+        :param profile: Also profile the execution with cProfile, only if enabled.
+        """
+        self._enabled = enabled
+        self._profile = enabled and profile
+        self._lock = threading.Lock()
+        self._spans = []
+        self._profiles = []
+        self._main_profile = None
+        self._started = time.time()
+        self._origin = time.perf_counter()
+
+    def isEnabled(self):
+        return self._enabled
+
+    def start(self):
+        """
+        Start timing the execution, and profiling the calling thread if profiling.
+        """
+        self._started = time.time()
+        self._origin = time.perf_counter()
+        if self._profile and self._main_profile is None:
+            self._main_profile = cProfile.Profile()
+            self._add_profile(self._main_profile)
+            self._main_profile.enable()
+
+    def stop(self):
+        """
+        Stop profiling the thread start was called from.
+        """
+        if self._main_profile is not None:
+            self._main_profile.disable()
+            self._main_profile = None
+
+    def _add_profile(self, profile):
+        with self._lock:
+            self._profiles.append(profile)
+
+    @contextmanager
+    def span(self, name):
+        """
+        Context manager timing the code it encloses as the span name.
+        """
+        if not self._enabled:
+            yield
+            return
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            span = {
+                'name': name,
+                'start': start - self._origin,
+                'duration': end - start,
+                'thread': threading.current_thread().name,
+            }
+            with self._lock:
+                self._spans.append(span)
+
+    def wrap(self, name, function):
+        """
+        Get function wrapped to be timed as the span name, and profiled in the thread it is
+        called in if profiling, for running in a worker thread.
+        """
+        if not self._enabled:
+            return function
+
+        def _wrapped_function(*args, **kwargs):
+            with self.span(name):
+                if not self._profile:
+                    return function(*args, **kwargs)
+
+                profile = cProfile.Profile()
+                self._add_profile(profile)
+                return profile.runcall(function, *args, **kwargs)
+
+        return _wrapped_function
+
+    def report(self):
+        """
+        Get the report of the execution as a dict, with the spans, the total time of each
+        span name and, if profiling, the functions with the most cumulative time.
+        """
+        with self._lock:
+            spans = sorted(self._spans, key=lambda s: s['start'])
+            profiles = list(self._profiles)
+
+        totals = {}
+        for span in spans:
+            totals[span['name']] = totals.get(span['name'], 0.0) + span['duration']
+
+        report = {
+            'version': REPORT_VERSION,
+            'started': time.strftime('%Y-%m-%dT%H:%M:%S%z', time.localtime(self._started)),
+            'packages': _package_versions(),
+            'spans': spans,
+            'totals': totals,
+        }
+        if profiles:
+            stream = io.StringIO()
+            stats = pstats.Stats(*profiles, stream=stream)
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(PROFILE_STATS_COUNT)
+            report['profile'] = stream.getvalue().splitlines()
+
+        return report
+
+    def writeReport(self, directory):
+        """
+        Write the report to a new file in directory, with the profile statistics alongside it
+        in pstats format if profiling.
+
+        :return: Name of the report file written, or None if not enabled.
+        """
+        if not self._enabled:
+            return None
+
+        report = self.report()
+        os.makedirs(directory, exist_ok=True)
+        milliseconds = int(self._started * 1000) % 1000
+        base_name = REPORT_FILE_PREFIX + time.strftime('%Y%m%d-%H%M%S', time.localtime(self._started)) + f'-{milliseconds:03d}'
+        report_location = os.path.join(directory, base_name + '.json')
+        with self._lock:
+            profiles = list(self._profiles)
+        if profiles:
+            profile_location = os.path.join(directory, base_name + '.prof')
+            pstats.Stats(*profiles).dump_stats(profile_location)
+            report['profile_stats'] = os.path.basename(profile_location)
+
+        write_file_atomically(report_location, json.dumps(report, indent=2))
+        return report_location
@@ -0,0 +1,90 @@
+"""
+Coarsening of the tessellations of a document, to render graphics faster while a view is being interacted with.
+
+Every tessellation in the document is coarsened by the same factor, so graphics keep their relative
+detail.  The settings of the tessellations are kept so they can be restored exactly when refined,
+except for settings changed while coarse, which are left as they were changed to.
+"""
+DEFAULT_COARSEN_FACTOR = 4
+# Fewer divisions around a circle than this do not look like a circle, even while moving.
+MINIMUM_CIRCLE_DIVISIONS = 6
+# Tessellations only have one, two or three dimensions.
+TESSELLATION_DIMENSIONS = 3
+
+
+def _coarsen(values, factor):
+    return [max(1, value // factor) for value in values]
+
+
+def _tessellation_settings(tessellation):
+    _, minimum_divisions = tessellation.getMinimumDivisions(TESSELLATION_DIMENSIONS)
+    _, refinement_factors = tessellation.getRefinementFactors(TESSELLATION_DIMENSIONS)
+    return list(minimum_divisions), list(refinement_factors), tessellation.getCircleDivisions()
+
+
+class TessellationLevelOfDetail(object):
+    """
+    Switches the tessellations of a document between their own settings and coarser settings.
+    """
+
+    def __init__(self, tessellations, factor=DEFAULT_COARSEN_FACTOR):
+        """
+        :param tessellations: ArgonTessellations of the document.
+        :param factor: Factor divisions are divided by when coarse.
+        """
+        self._tessellation_module = tessellations.getZincContext().getTessellationmodule()
+        self._factor = factor
+        self._refined_settings = None
+
+    def isCoarse(self):
+        return self._refined_settings is not None
+
+    def coarsen(self):
+        """
+        Coarsen every tessellation, keeping their settings, and the coarse settings, to refine them with.
+        """
+        if self._refined_settings is not None:
+            return
+
+        self._refined_settings = []
+        self._tessellation_module.beginChange()
+        iterator = self._tessellation_module.createTessellationiterator()
+        tessellation = iterator.next()
+        while tessellation.isValid():
+            refined_settings = _tessellation_settings(tessellation)
+            minimum_divisions, refinement_factors, circle_divisions = refined_settings
+            tessellation.setMinimumDivisions(_coarsen(minimum_divisions, self._factor))
+            tessellation.setRefinementFactors(_coarsen(refinement_factors, self._factor))
+            tessellation.setCircleDivisions(max(min(circle_divisions, MINIMUM_CIRCLE_DIVISIONS), circle_divisions // self._factor))
+            # Read back as set, so they compare equal with the settings read when refining.
+            self._refined_settings.append((tessellation, refined_settings, _tessellation_settings(tessellation)))
+            tessellation = iterator.next()
+        self._tessellation_module.endChange()
+
+    def refine(self):
+        """
+        Restore the settings every tessellation had when coarsened.
+        Settings that no longer have their coarse values were changed while coarse, so are kept.
+
+        :return: True if the tessellations were coarse.
+        """
+        if self._refined_settings is None:
+            return False
+
+        self._tessellation_module.beginChange()
+        for tessellation, refined_settings, coarse_settings in self._refined_settings:
+            if not tessellation.isValid():
+                continue
+
+            minimum_divisions, refinement_factors, circle_divisions = refined_settings
+            current_minimum_divisions, current_refinement_factors, current_circle_divisions = _tessellation_settings(tessellation)
+            coarse_minimum_divisions, coarse_refinement_factors, coarse_circle_divisions = coarse_settings
+            if current_minimum_divisions == coarse_minimum_divisions:
+                tessellation.setMinimumDivisions(minimum_divisions)
+            if current_refinement_factors == coarse_refinement_factors:
+                tessellation.setRefinementFactors(refinement_factors)
+            if current_circle_divisions == coarse_circle_divisions:
+                tessellation.setCircleDivisions(circle_divisions)
+        self._tessellation_module.endChange()
+        self._refined_settings = None
+        return True
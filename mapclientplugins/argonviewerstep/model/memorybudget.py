@@ -0,0 +1,166 @@
+"""
+Pre-flight estimation of the memory needed to load EX/EXF files, and plans for loading them within a budget.
+
+The numbers of nodes and elements in a file are estimated from a sample at the start of the
+file, scaled up to the size of the file, without parsing it.  The memory Zinc uses for them is
+estimated from measurements of trilinear cube meshes, including the faces and lines defined
+for graphics, so it is only a guide: meshes with many fields or time steps use more.
+"""
+import os
+import re
+
+from mapclientplugins.argonviewerstep.model.filetype import sniff_file_type, FILE_TYPE_AMBIGUOUS, FILE_TYPE_EXF
+
+MEMORY_POLICY_NONE = 'none'
+MEMORY_POLICY_REFUSE = 'refuse'
+MEMORY_POLICY_DOWNSAMPLE = 'downsample'
+MEMORY_POLICY_LAZY = 'lazy'
+
+MEMORY_POLICIES = [MEMORY_POLICY_NONE, MEMORY_POLICY_REFUSE, MEMORY_POLICY_DOWNSAMPLE, MEMORY_POLICY_LAZY]
+# Policies that apply when a memory budget is set.
+MEMORY_BUDGET_POLICIES = [MEMORY_POLICY_REFUSE, MEMORY_POLICY_DOWNSAMPLE, MEMORY_POLICY_LAZY]
+
+SOURCE_LOAD = 'load'
+SOURCE_REFUSED = 'refused'
+SOURCE_SKIPPED = 'skipped'
+SOURCE_DEFERRED = 'deferred'
+
+ESTIMATE_SAMPLE_SIZE = 1024 * 1024
+ESTIMATED_NODE_SIZE = 128
+ESTIMATED_ELEMENT_SIZE = 1536
+
+_NODE_RE = re.compile(rb'^\s*Node:', re.MULTILINE)
+_ELEMENT_RE = re.compile(rb'^\s*Element:', re.MULTILINE)
+
+
+def estimate_exf_file(filename):
+    """
+    Estimate the numbers of nodes and elements in an EX/EXF file and the memory needed to load it.
+
+    :return: Dict with the filename, size of the file, and estimated nodes, elements and memory in bytes.
+    """
+    size = os.path.getsize(filename)
+    with open(filename, 'rb') as f:
+        sample = f.read(ESTIMATE_SAMPLE_SIZE)
+
+    scale = size / len(sample) if sample else 0.0
+    nodes = int(len(_NODE_RE.findall(sample)) * scale)
+    elements = int(len(_ELEMENT_RE.findall(sample)) * scale)
+    # Files that do not list nodes or elements individually still take at least their size in memory.
+    memory = max(size, nodes * ESTIMATED_NODE_SIZE + elements * ESTIMATED_ELEMENT_SIZE)
+    return {
+        'filename': filename,
+        'size': size,
+        'nodes': nodes,
+        'elements': elements,
+        'memory': memory,
+    }
+
+
+def estimate_exf_files(filenames):
+    """
+    Estimate the memory needed to load each EX/EXF file in filenames, other files are left out.
+
+    :return: List of estimates from estimate_exf_file, in the order of filenames.
+    """
+    estimates = []
+    for filename in filenames:
+        try:
+            if sniff_file_type(filename) in (FILE_TYPE_EXF, FILE_TYPE_AMBIGUOUS):
+                estimates.append(estimate_exf_file(filename))
+        except OSError:
+            pass
+
+    return estimates
+
+
+def _fit(estimates, budget):
+    """
+    Get the estimates that fit in budget when loaded in order, and those that do not.
+    """
+    fitted = []
+    remaining = []
+    total = 0
+    for estimate in estimates:
+        if not remaining and total + estimate['memory'] <= budget:
+            fitted.append(estimate)
+            total += estimate['memory']
+        else:
+            remaining.append(estimate)
+
+    return fitted, remaining
+
+
+def plan_loading(estimates, budget, policy):
+    """
+    Decide how to load the files of estimates within budget.
+
+    With MEMORY_POLICY_REFUSE files are loaded in order until the next would exceed the budget, the rest are refused.
+    With MEMORY_POLICY_DOWNSAMPLE every Nth file is loaded, treating the files as time steps or parts, with N
+    the smallest that fits the budget, and the files in between are skipped.  If even the first file alone
+    does not fit the budget it is refused as well.
+    With MEMORY_POLICY_LAZY files are loaded in order until the next would exceed the budget, the rest are deferred
+    to be loaded on request from the Model Sources editor.
+
+    :param estimates: List of estimates from estimate_exf_files.
+    :param budget: Memory budget in bytes, zero for no limit.
+    :param policy: One of the MEMORY_POLICY_* policies.
+    :return: List of dicts, the estimates with an 'action', one of the SOURCE_* actions, in the order of estimates.
+    """
+    total = sum(estimate['memory'] for estimate in estimates)
+    if policy == MEMORY_POLICY_NONE or budget <= 0 or total <= budget:
+        return [dict(estimate, action=SOURCE_LOAD) for estimate in estimates]
+
+    actions = {}
+    if policy == MEMORY_POLICY_DOWNSAMPLE:
+        # Files differ in size, so every stride is tried rather than estimating one from the total.
+        stride = 2
+        while stride < len(estimates) and sum(estimate['memory'] for estimate in estimates[::stride]) > budget:
+            stride += 1
+        sampled = estimates[::stride]
+        for estimate in estimates:
+            actions[estimate['filename']] = SOURCE_SKIPPED
+        fitted, remaining = _fit(sampled, budget)
+        for estimate in remaining:
+            actions[estimate['filename']] = SOURCE_REFUSED
+    else:
+        fitted, remaining = _fit(estimates, budget)
+        for estimate in remaining:
+            actions[estimate['filename']] = SOURCE_DEFERRED if policy == MEMORY_POLICY_LAZY else SOURCE_REFUSED
+
+    for estimate in fitted:
+        actions[estimate['filename']] = SOURCE_LOAD
+
+    return [dict(estimate, action=actions[estimate['filename']]) for estimate in estimates]
+
+
+def _format_size(size):
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024 or unit == 'GB':
+            return f'{size:.0f} {unit}' if unit == 'B' else f'{size:.1f} {unit}'
+        size /= 1024
+
+
+def describe_plan(plan, budget):
+    """
+    Get a description of a plan from plan_loading for the user, or an empty string if every file is loaded.
+    """
+    not_loaded = [entry for entry in plan if entry['action'] != SOURCE_LOAD]
+    if not not_loaded:
+        return ''
+
+    total = sum(entry['memory'] for entry in plan)
+    loaded = total - sum(entry['memory'] for entry in not_loaded)
+    lines = [f'EX files need an estimated {_format_size(total)}, more than the memory budget of {_format_size(budget)}.'
+             f' Loaded {len(plan) - len(not_loaded)} of {len(plan)} files, an estimated {_format_size(loaded)}.']
+    descriptions = {
+        SOURCE_REFUSED: 'Refused',
+        SOURCE_SKIPPED: 'Skipped by downsampling',
+        SOURCE_DEFERRED: 'Not loaded until applied',
+    }
+    for action in (SOURCE_DEFERRED, SOURCE_SKIPPED, SOURCE_REFUSED):
+        names = [os.path.basename(entry['filename']) for entry in not_loaded if entry['action'] == action]
+        if names:
+            lines.append(f"{descriptions[action]}: {', '.join(names)}")
+
+    return '\n'.join(lines)
@@ -0,0 +1,322 @@
+"""
+On disk cache of parsed EX/EXF files.
+
+Zinc has no binary region format, but it reads FieldML about twice as fast as EX, so a
+source read through the cache is converted to FieldML once and the FieldML is read on
+later executions while the source keeps the same path, size and modification time.
+Zinc only reads and writes FieldML with files, so the conversions are kept as files.
+Not everything in an EX file can be written as FieldML, time varying fields for example,
+so a conversion is only kept if reading it back gives the same fields, nodes, elements and
+field values, compared through the EX output of each, otherwise the source is recorded as not cacheable and read directly.  Only the
+region read into is written as FieldML, so sources defining child regions are not cacheable either.
+
+Converting costs more than reading the source directly: the first read of a source through the
+cache writes the FieldML and reads it back to check it, about three times as long as a direct read
+of the source.  Sources read into an empty region are only parsed once, into that region, and
+converted from it; others are parsed into a separate region to convert them.
+"""
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+
+from cmlibs.zinc.context import Context
+from cmlibs.zinc.field import Field
+from cmlibs.zinc.result import RESULT_OK
+from cmlibs.zinc.streamregion import StreaminformationRegion
+
+from mapclientplugins.argonviewerstep.model.documentwriter import write_file_atomically, TEMPORARY_FILE_PREFIX, TEMPORARY_FILE_SUFFIX
+
+INDEX_FILE_NAME = 'index.json'
+INDEX_VERSION = 1
+CACHE_FILE_SUFFIX = '.fieldml'
+# Sources that are not cacheable take no space, this limits how many of them are remembered.
+MAX_ENTRIES = 1000
+_COMPONENT_NAME = re.compile(rb'^ [^ \r\n][^\r\n]*?\. ', re.MULTILINE)
+
+
+def source_key(filename):
+    """
+    Get the cache key for filename, from its absolute path, size and modification time.
+
+    :return: Key string, or None if filename cannot be accessed.
+    """
+    try:
+        stat_result = os.stat(filename)
+    except OSError:
+        return None
+
+    key = f'{os.path.abspath(filename)}\0{stat_result.st_size}\0{stat_result.st_mtime_ns}'
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+def _read_buffer(zinc_region, data):
+    stream_information = zinc_region.createStreaminformationRegion()
+    stream_information.createStreamresourceMemoryBuffer(data)
+    return zinc_region.read(stream_information)
+
+
+def _read_fieldml(zinc_region, location):
+    stream_information = zinc_region.createStreaminformationRegion()
+    stream_information.createStreamresourceFile(location)
+    stream_information.setFileFormat(StreaminformationRegion.FILE_FORMAT_FIELDML)
+    return zinc_region.read(stream_information)
+
+
+def _write_fieldml(zinc_region, location):
+    stream_information = zinc_region.createStreaminformationRegion()
+    stream_information.createStreamresourceFile(location)
+    stream_information.setFileFormat(StreaminformationRegion.FILE_FORMAT_FIELDML)
+    return zinc_region.write(stream_information)
+
+
+def _region_summary(zinc_region):
+    """
+    Get a summary of the fields, nodes, elements and time range of zinc_region and of its
+    child regions, recursively, for comparing region trees.
+    """
+    fieldmodule = zinc_region.getFieldmodule()
+    fields = []
+    field_iterator = fieldmodule.createFielditerator()
+    field = field_iterator.next()
+    while field.isValid():
+        fields.append((field.getName(), field.getNumberOfComponents()))
+        field = field_iterator.next()
+
+    counts = [fieldmodule.findNodesetByFieldDomainType(domain_type).getSize()
+              for domain_type in (Field.DOMAIN_TYPE_NODES, Field.DOMAIN_TYPE_DATAPOINTS)]
+    counts.extend(fieldmodule.findMeshByDimension(dimension).getSize() for dimension in (1, 2, 3))
+    children = []
+    child = zinc_region.getFirstChild()
+    while child.isValid():
+        children.append((child.getName(), _region_summary(child)))
+        child = child.getNextSibling()
+    return sorted(fields), counts, zinc_region.getTimeRange(), sorted(children)
+
+
+def _is_empty(zinc_region):
+    """
+    Check zinc_region has nothing in it but the fields every region has.
+    """
+    empty_context = Context('ArgonViewerRegionCacheEmpty')
+    return _region_summary(zinc_region) == _region_summary(empty_context.getDefaultRegion())
+
+
+def _ex_contents(zinc_region):
+    """
+    Get zinc_region written in EX format, for comparing regions.
+    The names of field components are not kept by FieldML so are left out.
+    """
+    stream_information = zinc_region.createStreaminformationRegion()
+    memory_resource = stream_information.createStreamresourceMemory()
+    zinc_region.write(stream_information)
+    _, buffer = memory_resource.getBuffer()
+    # Component lines are the only lines with a single space indent, starting with the component name.
+    return _COMPONENT_NAME.sub(b' . ', buffer)
+
+
+def convert_to_fieldml(data, location):
+    """
+    Convert the contents of an EX/EXF file to a FieldML file.
+
+    :param data: EX/EXF file contents as bytes.
+    :param location: Name of the FieldML file to write.
+    :return: True on success, False if data cannot be represented as FieldML, in which case location is not written.
+    """
+    # Read into a separate context so nothing else sees the intermediate region.
+    context = Context('ArgonViewerRegionCache')
+    zinc_region = context.getDefaultRegion()
+    if _read_buffer(zinc_region, data) != RESULT_OK:
+        return False
+
+    return write_checked_fieldml(zinc_region, location)
+
+
+def write_checked_fieldml(zinc_region, location):
+    """
+    Write zinc_region to a FieldML file, if reading it back gives the same region.
+
+    :param zinc_region: Zinc region to write.
+    :param location: Name of the FieldML file to write.
+    :return: True on success, False if zinc_region cannot be represented as FieldML, in which case location is not written.
+    """
+    # Child regions are not written to FieldML, so would be lost from the conversion.
+    if zinc_region.getFirstChild().isValid():
+        return False
+
+    directory = os.path.dirname(os.path.abspath(location))
+    fd, temporary_location = tempfile.mkstemp(prefix=TEMPORARY_FILE_PREFIX, suffix=TEMPORARY_FILE_SUFFIX, dir=directory)
+    os.close(fd)
+    try:
+        if _write_fieldml(zinc_region, temporary_location) != RESULT_OK:
+            return False
+
+        check_context = Context('ArgonViewerRegionCacheCheck')
+        check_region = check_context.getDefaultRegion()
+        if _read_fieldml(check_region, temporary_location) != RESULT_OK:
+            return False
+
+        # The EX contents include every field value, as well as how fields are defined on nodes and elements.
+        if _region_summary(check_region) != _region_summary(zinc_region) or \
+                _ex_contents(check_region) != _ex_contents(zinc_region):
+            return False
+
+        os.replace(temporary_location, location)
+        return True
+    finally:
+        if os.path.exists(temporary_location):
+            os.remove(temporary_location)
+
+
+class RegionCache(object):
+    """
+    Cache of FieldML conversions of EX/EXF files in a directory, least recently used
+    conversions are removed once the cache is larger than its maximum size.
+    lookup can be called from any thread, everything else must be called from one thread.
+    """
+
+    def __init__(self, directory, max_size):
+        """
+        :param directory: Directory holding the cache, created when the first conversion is stored.
+        :param max_size: Maximum total size of the cached conversions in bytes.
+        """
+        self._directory = directory
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        self._entries = None
+        self._modified = False
+
+    def getDirectory(self):
+        return self._directory
+
+    def _index_location(self):
+        return os.path.join(self._directory, INDEX_FILE_NAME)
+
+    def _cache_location(self, key):
+        return os.path.join(self._directory, key + CACHE_FILE_SUFFIX)
+
+    def _ensure_loaded(self):
+        if self._entries is not None:
+            return
+
+        try:
+            with open(self._index_location()) as f:
+                d = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            d = {}
+
+        self._entries = d.get('entries', {}) if d.get('version') == INDEX_VERSION else {}
+
+    def lookup(self, filename):
+        """
+        Get the location of the cached FieldML conversion of filename.
+
+        :return: Name of the FieldML file, or None if filename is not in the cache.
+        """
+        key = source_key(filename)
+        with self._lock:
+            self._ensure_loaded()
+            entry = self._entries.get(key)
+        if entry is None or not entry['cacheable']:
+            return None
+
+        location = self._cache_location(key)
+        return location if os.path.isfile(location) else None
+
+    def read(self, zinc_region, filename, data, cached_location=None):
+        """
+        Read the EX/EXF file filename into zinc_region, through the cache.
+
+        :param zinc_region: Zinc region to read into.
+        :param filename: Name of the source file, used for the cache key.
+        :param data: Contents of filename as bytes, read from filename if None.
+        :param cached_location: Location of the conversion of filename returned by lookup, if any.
+        :return: Zinc result of the read.
+        """
+        key = source_key(filename)
+        with self._lock:
+            self._ensure_loaded()
+            entry = self._entries.get(key)
+
+        if cached_location is not None and _read_fieldml(zinc_region, cached_location) == RESULT_OK:
+            self._touch(key)
+            return RESULT_OK
+
+        if data is None:
+            with open(filename, 'rb') as f:
+                data = f.read()
+
+        if key is not None and (entry is None or entry['cacheable']):
+            location = self._cache_location(key)
+            if _is_empty(zinc_region):
+                # Converted from zinc_region once read, so the source is only parsed once.
+                result = _read_buffer(zinc_region, data)
+                cacheable = result == RESULT_OK and self._convert(write_checked_fieldml, zinc_region, location)
+                self._store(key, filename, location if cacheable else None)
+                return result
+
+            cacheable = self._convert(convert_to_fieldml, data, location)
+            self._store(key, filename, location if cacheable else None)
+            if cacheable and _read_fieldml(zinc_region, location) == RESULT_OK:
+                return RESULT_OK
+
+        return _read_buffer(zinc_region, data)
+
+    def _convert(self, convert, source, location):
+        try:
+            os.makedirs(self._directory, exist_ok=True)
+            return convert(source, location)
+        except OSError:
+            return False
+
+    def _touch(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry['last_used'] = time.time()
+                self._modified = True
+
+    def _store(self, key, filename, location):
+        entry = {
+            'source': os.path.abspath(filename),
+            'cacheable': location is not None,
+            'size': 0 if location is None else os.path.getsize(location),
+            'last_used': time.time(),
+        }
+        with self._lock:
+            self._entries[key] = entry
+            self._modified = True
+        self._evict()
+
+    def _evict(self):
+        with self._lock:
+            size = sum(entry['size'] for entry in self._entries.values())
+            for key in sorted(self._entries, key=lambda k: self._entries[k]['last_used']):
+                if size <= self._max_size and len(self._entries) <= MAX_ENTRIES:
+                    break
+                entry = self._entries.pop(key)
+                size -= entry['size']
+                try:
+                    os.remove(self._cache_location(key))
+                except FileNotFoundError:
+                    pass
+
+    def flush(self):
+        """
+        Write the cache index if it has changed.
+        """
+        with self._lock:
+            if not self._modified:
+                return
+            content = json.dumps({'version': INDEX_VERSION, 'entries': self._entries}, indent=1)
+            self._modified = False
+
+        try:
+            os.makedirs(self._directory, exist_ok=True)
+            write_file_atomically(self._index_location(), content)
+        except OSError:
+            # The cache index is rebuilt from nothing if it cannot be written.
+            pass
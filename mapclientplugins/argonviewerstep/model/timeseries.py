@@ -0,0 +1,197 @@
+"""
+Streaming of a time series of EX/EXF files, one file per time step, into a region.
+
+Only the frame for the current time is held in Zinc: showing another time reads its file over
+the region, replacing the field values of the previous frame.  The contents of the frames
+either side of the current one are read ahead in worker threads into a bounded cache, so
+playing through the series only waits on Zinc parsing the frame, not on the disk.
+The worker threads only read files, frames are parsed on the thread showing them.
+"""
+import os
+import threading
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from cmlibs.zinc.result import RESULT_OK
+
+DEFAULT_PREFETCH_COUNT = 4
+PREFETCH_WORKERS = 2
+
+
+def _read_frame(filename):
+    with open(filename, 'rb') as f:
+        return f.read()
+
+
+class FrameCache(object):
+    """
+    Least recently used cache of the contents of frame files, bounded by a number of frames.
+    Can be used from any thread.
+    """
+
+    def __init__(self, max_frames):
+        self._max_frames = max_frames
+        self._frames = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, filename):
+        """
+        Get the contents of filename as bytes, None if it is not in the cache.
+        """
+        with self._lock:
+            data = self._frames.get(filename)
+            if data is not None:
+                self._frames.move_to_end(filename)
+            return data
+
+    def put(self, filename, data):
+        with self._lock:
+            self._frames[filename] = data
+            self._frames.move_to_end(filename)
+            self._evict()
+
+    def setMaxFrames(self, max_frames):
+        with self._lock:
+            self._max_frames = max_frames
+            self._evict()
+
+    def _evict(self):
+        while len(self._frames) > self._max_frames:
+            self._frames.popitem(last=False)
+
+    def __contains__(self, filename):
+        with self._lock:
+            return filename in self._frames
+
+    def __len__(self):
+        with self._lock:
+            return len(self._frames)
+
+
+class TimeSeries(object):
+    """
+    A time series of EX/EXF files streamed into an Argon region, frame index i is shown at time i.
+    The timekeeper is not watched here, showTime is called with its time as it changes.
+    """
+
+    def __init__(self, region, filenames, prefetch_count=DEFAULT_PREFETCH_COUNT):
+        """
+        :param region: ArgonRegion the frames are read into.
+        :param filenames: List of the EX/EXF file of each time step, in time order.
+        :param prefetch_count: Number of frames read ahead of the current frame, in each direction.
+        """
+        self._region = region
+        self._filenames = list(filenames)
+        self._prefetch_count = prefetch_count
+        # Room for the frames either side of the current frame, and the current frame.
+        self._cache = FrameCache(2 * prefetch_count + 1)
+        self._pending = set()
+        self._pending_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix='ArgonViewerFramePrefetch')
+        self._current_index = None
+
+    def setPrefetchCount(self, prefetch_count):
+        """
+        Set the number of frames read ahead of the current frame, in each direction.
+        """
+        self._prefetch_count = prefetch_count
+        self._cache.setMaxFrames(2 * prefetch_count + 1)
+
+    def getFilenames(self):
+        return self._filenames
+
+    def getFrameCount(self):
+        return len(self._filenames)
+
+    def getCurrentIndex(self):
+        return self._current_index
+
+    def getTimeRange(self):
+        """
+        Get the (minimum, maximum) times of the series.
+        """
+        return 0.0, float(max(0, len(self._filenames) - 1))
+
+    def frameIndex(self, time):
+        """
+        Get the index of the frame shown at time.
+        """
+        return min(max(0, int(round(time))), len(self._filenames) - 1)
+
+    def showTime(self, time):
+        """
+        Show the frame for time in the region, if it is not already shown, and prefetch the frames around it.
+
+        :return: True if the frame is shown, False if it could not be read.
+        """
+        if not self._filenames:
+            return False
+
+        index = self.frameIndex(time)
+        if index == self._current_index:
+            return True
+
+        filename = self._filenames[index]
+        data = self._cache.get(filename)
+        try:
+            if data is None:
+                data = _read_frame(filename)
+                self._cache.put(filename, data)
+        except OSError:
+            return False
+
+        zinc_region = self._region.getZincRegion()
+        zinc_region.beginHierarchicalChange()
+        stream_information = zinc_region.createStreaminformationRegion()
+        stream_information.createStreamresourceMemoryBuffer(data)
+        result = zinc_region.read(stream_information)
+        zinc_region.endHierarchicalChange()
+        if result != RESULT_OK:
+            return False
+
+        self._current_index = index
+        self._prefetch(index)
+        return True
+
+    def _prefetch(self, index):
+        # Nearest frames first, so the frames played next are read first.
+        indexes = []
+        for offset in range(1, self._prefetch_count + 1):
+            indexes.extend(i for i in (index + offset, index - offset) if 0 <= i < len(self._filenames))
+
+        for prefetch_index in indexes:
+            filename = self._filenames[prefetch_index]
+            with self._pending_lock:
+                if filename in self._pending or filename in self._cache:
+                    continue
+                self._pending.add(filename)
+            try:
+                self._executor.submit(self._prefetch_frame, filename)
+            except RuntimeError:
+                # Closed.
+                return
+
+    def _prefetch_frame(self, filename):
+        try:
+            self._cache.put(filename, _read_frame(filename))
+        except OSError:
+            pass
+        finally:
+            with self._pending_lock:
+                self._pending.discard(filename)
+
+    def close(self):
+        """
+        Stop prefetching, frames already being read are discarded.
+        """
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def region_name_for_series(filenames):
+    """
+    Get a name for the region of a time series, the common start of the file names.
+    """
+    names = [os.path.splitext(os.path.basename(filename))[0] for filename in filenames]
+    name = os.path.commonprefix(names).rstrip('0123456789_-. ') if names else ''
+    return name or 'time_series'
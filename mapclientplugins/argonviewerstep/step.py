@@ -7,12 +7,23 @@ import pathlib
 
 from PySide6 import QtGui, QtWidgets, QtCore
 
+from cmlibs.argon.argonlogger import ArgonLogger
+
 from mapclient.mountpoints.workflowstep import WorkflowStepMountPoint
 from mapclient.settings.general import get_configuration_file
 
 from mapclientplugins.argonviewerstep.configuredialog import ConfigureDialog
 from mapclientplugins.argonviewerstep.view.argonviewerwidget import ArgonViewerWidget
+from mapclientplugins.argonviewerstep.view.viewexporter import export_document_views
 from mapclientplugins.argonviewerstep.model.argonviewermodel import ArgonViewerModel
+from mapclientplugins.argonviewerstep.model.documentcache import DocumentCache, estimate_document_size, make_key, sources_fingerprint
+from mapclientplugins.argonviewerstep.model.documentcatalogue import DocumentCatalogue
+from mapclientplugins.argonviewerstep.model.documentretention import apply_retention
+from mapclientplugins.argonviewerstep.model.exfingestion import EXF_INGESTION_NONE
+from mapclientplugins.argonviewerstep.model.regioncache import RegionCache
+from mapclientplugins.argonviewerstep.model.timeseries import DEFAULT_PREFETCH_COUNT
+from mapclientplugins.argonviewerstep.model.instrumentation import Instrumentation
+from mapclientplugins.argonviewerstep.model.memorybudget import MEMORY_POLICY_REFUSE
 
 
 class ArgonViewerStep(WorkflowStepMountPoint):
@@ -41,38 +52,211 @@ class ArgonViewerStep(WorkflowStepMountPoint):
             'auto-load-visualisation-doc': True,
             'visualisation-doc': '',
             'auto-done': False,
+            'background-load': False,
+            'exf-ingestion': EXF_INGESTION_NONE,
+            'release-hidden-views-timeout': 0,
+            'retention-max-count': 0,
+            'retention-max-size': 0,
+            'retention-max-age': 0,
+            'retention-keep-referenced': True,
+            'retention-deduplicate': True,
+            'region-cache-size': 0,
+            'document-cache-size': 0,
+            'compare-documents': False,
+            'performance-report': False,
+            'performance-profile': False,
+            'memory-budget': 0,
+            'memory-policy': MEMORY_POLICY_REFUSE,
+            'time-series-prefetch': DEFAULT_PREFETCH_COUNT,
+            'export-views': False,
+            'export-width': 1024,
+            'export-height': 768,
+            'export-time-count': 0,
+            'frame-time-target': 0,
         }
 
         # Port data:
         self._file_locations = None  # file_location
         self._model = None
         self._view = None
+        self._document_cache = None
+        self._instrumentation = Instrumentation()
 
     def _setup_model(self):
         self._model = ArgonViewerModel(self._config['visualisation-doc'])
         self._model.setPreviousDocumentsDirectory(self._previous_documents_directory())
+        self._model.setExfIngestionMode(self._config['exf-ingestion'])
+        self._model.setCompareDocuments(self._config['compare-documents'])
+        self._model.setMemoryBudget(self._config['memory-budget'] * 1024 * 1024, self._config['memory-policy'])
+        self._apply_model_settings(self._model)
+
+    def _apply_model_settings(self, model):
+        """
+        Apply the settings that do not change what the model loads, these are not part of the
+        document cache key so are applied again to a model taken from the cache.
+        """
+        model.setInstrumentation(self._instrumentation)
+        model.setTimeSeriesPrefetch(self._config['time-series-prefetch'])
+        region_cache = None
+        if self._config['region-cache-size'] > 0:
+            region_cache_directory = os.path.join(self._location, self._config["identifier"] + "-region-cache")
+            region_cache = RegionCache(region_cache_directory, self._config['region-cache-size'] * 1024 * 1024)
+        model.setRegionCache(region_cache)
 
     def _update_visualisation_doc(self, visualisation_doc):
         self._config['visualisation-doc'] = visualisation_doc
         with open(get_configuration_file(self._location, self._config['identifier']), 'w') as f:
             f.write(self.serialize())
 
+    def _document_cache_key(self):
+        settings = (self._config['auto-load-visualisation-doc'], self._config['exf-ingestion'], self._config['compare-documents'],
+                    self._config['memory-budget'], self._config['memory-policy'])
+        return make_key(self._file_locations, self._model.getCurrentDocumentLocation(), settings)
+
+    def _take_cached_model(self):
+        """
+        Take the model loaded by a previous execution with the same inputs out of the document cache.
+        Failing that, a model loaded from earlier versions of the same files is taken and only the
+        changed files are read again.
+
+        :return: True if the cached model is now the current model.
+        """
+        max_size = self._config['document-cache-size'] * 1024 * 1024
+        if max_size == 0:
+            self._document_cache = None
+            return False
+
+        if self._document_cache is None:
+            self._document_cache = DocumentCache(max_size)
+
+        key = self._document_cache_key()
+        model = self._document_cache.take(key)
+        reload_sources = model is None
+        if reload_sources:
+            model = self._document_cache.takeReloadable(key)
+            if model is None:
+                return False
+
+        self._apply_model_settings(model)
+        if reload_sources:
+            with self._instrumentation.span('reload-sources'):
+                if not model.reloadSources(self._file_locations):
+                    return False
+
+        self._model = model
+        return True
+
+    def _cache_model(self):
+        # Only cache a model that finished loading its sources, not one that was cancelled.
+        if self._document_cache is not None and self._model.getSources() == self._file_locations:
+            size = estimate_document_size(self._file_locations + [self._model.getCurrentDocumentLocation()])
+            self._document_cache.put(self._document_cache_key(), self._model, size)
+
     def execute(self):
+        # An execution that never finished may have left its profiler running.
+        self._instrumentation.stop()
+        self._instrumentation = Instrumentation(self._config['performance-report'], self._config['performance-profile'])
+        self._instrumentation.start()
         QtWidgets.QApplication.setOverrideCursor(QtCore.Qt.CursorShape.WaitCursor)
         try:
-            self._setup_model()
-            self._view = ArgonViewerWidget(self._model)
+            with self._instrumentation.span('setup-model'):
+                self._setup_model()
+            with self._instrumentation.span('take-cached-model'):
+                loaded = self._take_cached_model()
+            if self._config['auto-done']:
+                self._execute_headless(loaded)
+                return
+
+            with self._instrumentation.span('create-widget'):
+                self._view = ArgonViewerWidget(self._model)
             self._view.set_location(self._location)
-            self._view.load(self._file_locations, self._config['auto-load-visualisation-doc'])
+            self._view.setReleaseHiddenViewsTimeout(self._config['release-hidden-views-timeout'])
+            self._view.setFrameTimeTarget(self._config['frame-time-target'] / 1000)
             self._view.registerUpdateVisualisationDoc(self._update_visualisation_doc)
-            self._view.registerDoneExecution(self._doneExecution)
-            if self._config['auto-done']:
-                self._view.auto_done_requested()
+            self._view.registerDoneExecution(self._finish_execution)
+            if loaded:
+                self._view.showLoadedDocument()
+            elif self._config['background-load']:
+                # Show the view straight away so loading progress can be followed, and cancelled.
+                self._view.load_in_background(self._file_locations, self._config['auto-load-visualisation-doc'])
             else:
-                self._setCurrentWidget(self._view)
+                self._view.load(self._file_locations, self._config['auto-load-visualisation-doc'])
+            self._setCurrentWidget(self._view)
         finally:
             QtWidgets.QApplication.restoreOverrideCursor()
 
+    def _execute_headless(self, loaded=False):
+        """
+        Load the sources and write the visualisation document without creating any widgets.
+
+        :param loaded: True if the model has already loaded the sources.
+        """
+        self._view = None
+        try:
+            if not loaded:
+                with self._instrumentation.span('load-sources'):
+                    self._model.loadSources(self._file_locations, self._config['auto-load-visualisation-doc'])
+            with self._instrumentation.span('save-document'):
+                self._model.saveCurrentDocument()
+            # Only a document that was written is named in the step configuration.
+            self._update_visualisation_doc(os.path.basename(self._model.getCurrentDocumentLocation()))
+        finally:
+            ArgonLogger.closeLogger()
+
+        self._finish_execution()
+
+    def _finish_execution(self):
+        with self._instrumentation.span('apply-retention'):
+            self._apply_document_retention(self._model.getDocumentCatalogue())
+        if self._config['export-views']:
+            with self._instrumentation.span('export-views'):
+                self._export_views()
+        with self._instrumentation.span('cache-model'):
+            self._cache_model()
+        self._write_performance_report()
+        self._doneExecution()
+
+    def _export_views(self):
+        """
+        Write images of the views of the document to the exported views directory.
+        """
+        directory = os.path.join(self._location, self._config["identifier"] + "-views")
+        try:
+            if self._view is None:
+                export_document_views(self._model, directory, self._config['export-width'], self._config['export-height'],
+                                      self._config['export-time-count'])
+            else:
+                # Exported through the widget so changes made in the views that were shown are included.
+                self._view.exportViews(directory, self._config['export-width'], self._config['export-height'],
+                                       self._config['export-time-count'])
+        except OSError as e:
+            ArgonLogger.writeErrorMessage(f'Failed to export the views: {e}')
+
+    def _write_performance_report(self):
+        """
+        Write the timings, and profile, of this execution to the performance reports directory, if enabled.
+        """
+        self._instrumentation.stop()
+        try:
+            self._instrumentation.writeReport(os.path.join(self._location, self._config["identifier"] + "-performance"))
+        except OSError as e:
+            ArgonLogger.writeErrorMessage(f'Failed to write the performance report: {e}')
+
+    def _apply_document_retention(self, catalogue):
+        """
+        Remove previous visualisation documents according to the retention settings.
+        The configured visualisation document counts as referenced.
+        """
+        try:
+            apply_retention(catalogue, referenced=[self._config['visualisation-doc']],
+                            max_count=self._config['retention-max-count'],
+                            max_size=self._config['retention-max-size'] * 1024 * 1024,
+                            max_age=self._config['retention-max-age'] * 24 * 60 * 60,
+                            keep_referenced=self._config['retention-keep-referenced'],
+                            deduplicate=self._config['retention-deduplicate'])
+        except OSError as e:
+            ArgonLogger.writeErrorMessage(f'Failed to apply the previous documents retention policy: {e}')
+
     def _previous_documents_directory(self):
         previous_documents_directory = os.path.join(self._location, self._config["identifier"] + "-previous-docs")
         if not os.path.isdir(previous_documents_directory):
@@ -93,6 +277,8 @@ class ArgonViewerStep(WorkflowStepMountPoint):
             dataIn = [dataIn]
 
         self._file_locations = [pathlib.PureWindowsPath(p).as_posix() for p in dataIn]  # file_location
+        if self._document_cache is not None:
+            self._document_cache.retainSources(sources_fingerprint(self._file_locations))
 
     def getPortData(self, index):
         """
@@ -121,6 +307,7 @@ class ArgonViewerStep(WorkflowStepMountPoint):
 
         if dlg.exec_():
             self._config = dlg.getConfig()
+            self._apply_document_retention(DocumentCatalogue(self._previous_documents_directory()))
 
         self._configured = dlg.validate()
         self._configuredObserver()
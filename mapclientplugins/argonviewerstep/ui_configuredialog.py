@@ -18,7 +18,7 @@ from PySide6.QtGui import (QBrush, QColor, QConicalGradient, QCursor,
 from PySide6.QtWidgets import (QAbstractButton, QApplication, QCheckBox, QComboBox,
     QDialog, QDialogButtonBox, QFormLayout, QGridLayout,
     QGroupBox, QLabel, QLineEdit, QSizePolicy,
-    QWidget)
+    QSpinBox, QWidget)
 
 class Ui_ConfigureDialog(object):
     def setupUi(self, ConfigureDialog):
@@ -81,6 +81,244 @@ class Ui_ConfigureDialog(object):
 
         self.formLayout.setWidget(1, QFormLayout.LabelRole, self.labelAutoDone)
 
+        self.labelBackgroundLoad = QLabel(self.configGroupBox)
+        self.labelBackgroundLoad.setObjectName(u"labelBackgroundLoad")
+
+        self.formLayout.setWidget(4, QFormLayout.LabelRole, self.labelBackgroundLoad)
+
+        self.checkBoxBackgroundLoad = QCheckBox(self.configGroupBox)
+        self.checkBoxBackgroundLoad.setObjectName(u"checkBoxBackgroundLoad")
+
+        self.formLayout.setWidget(4, QFormLayout.FieldRole, self.checkBoxBackgroundLoad)
+
+        self.labelExfIngestion = QLabel(self.configGroupBox)
+        self.labelExfIngestion.setObjectName(u"labelExfIngestion")
+
+        self.formLayout.setWidget(5, QFormLayout.LabelRole, self.labelExfIngestion)
+
+        self.comboBoxExfIngestion = QComboBox(self.configGroupBox)
+        self.comboBoxExfIngestion.addItem("")
+        self.comboBoxExfIngestion.addItem("")
+        self.comboBoxExfIngestion.addItem("")
+        self.comboBoxExfIngestion.addItem("")
+        self.comboBoxExfIngestion.setObjectName(u"comboBoxExfIngestion")
+
+        self.formLayout.setWidget(5, QFormLayout.FieldRole, self.comboBoxExfIngestion)
+
+        self.labelReleaseHiddenViews = QLabel(self.configGroupBox)
+        self.labelReleaseHiddenViews.setObjectName(u"labelReleaseHiddenViews")
+
+        self.formLayout.setWidget(6, QFormLayout.LabelRole, self.labelReleaseHiddenViews)
+
+        self.spinBoxReleaseHiddenViews = QSpinBox(self.configGroupBox)
+        self.spinBoxReleaseHiddenViews.setObjectName(u"spinBoxReleaseHiddenViews")
+        self.spinBoxReleaseHiddenViews.setMaximum(86400)
+
+        self.formLayout.setWidget(6, QFormLayout.FieldRole, self.spinBoxReleaseHiddenViews)
+
+        self.labelRetentionMaxCount = QLabel(self.configGroupBox)
+        self.labelRetentionMaxCount.setObjectName(u"labelRetentionMaxCount")
+
+        self.formLayout.setWidget(7, QFormLayout.LabelRole, self.labelRetentionMaxCount)
+
+        self.spinBoxRetentionMaxCount = QSpinBox(self.configGroupBox)
+        self.spinBoxRetentionMaxCount.setObjectName(u"spinBoxRetentionMaxCount")
+        self.spinBoxRetentionMaxCount.setMaximum(100000)
+
+        self.formLayout.setWidget(7, QFormLayout.FieldRole, self.spinBoxRetentionMaxCount)
+
+        self.labelRetentionMaxSize = QLabel(self.configGroupBox)
+        self.labelRetentionMaxSize.setObjectName(u"labelRetentionMaxSize")
+
+        self.formLayout.setWidget(8, QFormLayout.LabelRole, self.labelRetentionMaxSize)
+
+        self.spinBoxRetentionMaxSize = QSpinBox(self.configGroupBox)
+        self.spinBoxRetentionMaxSize.setObjectName(u"spinBoxRetentionMaxSize")
+        self.spinBoxRetentionMaxSize.setMaximum(1000000)
+
+        self.formLayout.setWidget(8, QFormLayout.FieldRole, self.spinBoxRetentionMaxSize)
+
+        self.labelRetentionMaxAge = QLabel(self.configGroupBox)
+        self.labelRetentionMaxAge.setObjectName(u"labelRetentionMaxAge")
+
+        self.formLayout.setWidget(9, QFormLayout.LabelRole, self.labelRetentionMaxAge)
+
+        self.spinBoxRetentionMaxAge = QSpinBox(self.configGroupBox)
+        self.spinBoxRetentionMaxAge.setObjectName(u"spinBoxRetentionMaxAge")
+        self.spinBoxRetentionMaxAge.setMaximum(3650)
+
+        self.formLayout.setWidget(9, QFormLayout.FieldRole, self.spinBoxRetentionMaxAge)
+
+        self.labelRetentionKeepReferenced = QLabel(self.configGroupBox)
+        self.labelRetentionKeepReferenced.setObjectName(u"labelRetentionKeepReferenced")
+
+        self.formLayout.setWidget(10, QFormLayout.LabelRole, self.labelRetentionKeepReferenced)
+
+        self.checkBoxRetentionKeepReferenced = QCheckBox(self.configGroupBox)
+        self.checkBoxRetentionKeepReferenced.setObjectName(u"checkBoxRetentionKeepReferenced")
+        self.checkBoxRetentionKeepReferenced.setChecked(True)
+
+        self.formLayout.setWidget(10, QFormLayout.FieldRole, self.checkBoxRetentionKeepReferenced)
+
+        self.labelRetentionDeduplicate = QLabel(self.configGroupBox)
+        self.labelRetentionDeduplicate.setObjectName(u"labelRetentionDeduplicate")
+
+        self.formLayout.setWidget(11, QFormLayout.LabelRole, self.labelRetentionDeduplicate)
+
+        self.checkBoxRetentionDeduplicate = QCheckBox(self.configGroupBox)
+        self.checkBoxRetentionDeduplicate.setObjectName(u"checkBoxRetentionDeduplicate")
+        self.checkBoxRetentionDeduplicate.setChecked(True)
+
+        self.formLayout.setWidget(11, QFormLayout.FieldRole, self.checkBoxRetentionDeduplicate)
+
+        self.labelRegionCacheSize = QLabel(self.configGroupBox)
+        self.labelRegionCacheSize.setObjectName(u"labelRegionCacheSize")
+
+        self.formLayout.setWidget(12, QFormLayout.LabelRole, self.labelRegionCacheSize)
+
+        self.spinBoxRegionCacheSize = QSpinBox(self.configGroupBox)
+        self.spinBoxRegionCacheSize.setObjectName(u"spinBoxRegionCacheSize")
+        self.spinBoxRegionCacheSize.setMaximum(1000000)
+
+        self.formLayout.setWidget(12, QFormLayout.FieldRole, self.spinBoxRegionCacheSize)
+
+        self.labelDocumentCacheSize = QLabel(self.configGroupBox)
+        self.labelDocumentCacheSize.setObjectName(u"labelDocumentCacheSize")
+
+        self.formLayout.setWidget(13, QFormLayout.LabelRole, self.labelDocumentCacheSize)
+
+        self.spinBoxDocumentCacheSize = QSpinBox(self.configGroupBox)
+        self.spinBoxDocumentCacheSize.setObjectName(u"spinBoxDocumentCacheSize")
+        self.spinBoxDocumentCacheSize.setMaximum(1000000)
+
+        self.formLayout.setWidget(13, QFormLayout.FieldRole, self.spinBoxDocumentCacheSize)
+
+        self.labelCompareDocuments = QLabel(self.configGroupBox)
+        self.labelCompareDocuments.setObjectName(u"labelCompareDocuments")
+
+        self.formLayout.setWidget(14, QFormLayout.LabelRole, self.labelCompareDocuments)
+
+        self.checkBoxCompareDocuments = QCheckBox(self.configGroupBox)
+        self.checkBoxCompareDocuments.setObjectName(u"checkBoxCompareDocuments")
+
+        self.formLayout.setWidget(14, QFormLayout.FieldRole, self.checkBoxCompareDocuments)
+
+        self.labelPerformanceReport = QLabel(self.configGroupBox)
+        self.labelPerformanceReport.setObjectName(u"labelPerformanceReport")
+
+        self.formLayout.setWidget(15, QFormLayout.LabelRole, self.labelPerformanceReport)
+
+        self.checkBoxPerformanceReport = QCheckBox(self.configGroupBox)
+        self.checkBoxPerformanceReport.setObjectName(u"checkBoxPerformanceReport")
+
+        self.formLayout.setWidget(15, QFormLayout.FieldRole, self.checkBoxPerformanceReport)
+
+        self.labelPerformanceProfile = QLabel(self.configGroupBox)
+        self.labelPerformanceProfile.setObjectName(u"labelPerformanceProfile")
+
+        self.formLayout.setWidget(16, QFormLayout.LabelRole, self.labelPerformanceProfile)
+
+        self.checkBoxPerformanceProfile = QCheckBox(self.configGroupBox)
+        self.checkBoxPerformanceProfile.setObjectName(u"checkBoxPerformanceProfile")
+
+        self.formLayout.setWidget(16, QFormLayout.FieldRole, self.checkBoxPerformanceProfile)
+
+        self.labelMemoryBudget = QLabel(self.configGroupBox)
+        self.labelMemoryBudget.setObjectName(u"labelMemoryBudget")
+
+        self.formLayout.setWidget(17, QFormLayout.LabelRole, self.labelMemoryBudget)
+
+        self.spinBoxMemoryBudget = QSpinBox(self.configGroupBox)
+        self.spinBoxMemoryBudget.setObjectName(u"spinBoxMemoryBudget")
+        self.spinBoxMemoryBudget.setMaximum(10000000)
+
+        self.formLayout.setWidget(17, QFormLayout.FieldRole, self.spinBoxMemoryBudget)
+
+        self.labelMemoryPolicy = QLabel(self.configGroupBox)
+        self.labelMemoryPolicy.setObjectName(u"labelMemoryPolicy")
+
+        self.formLayout.setWidget(18, QFormLayout.LabelRole, self.labelMemoryPolicy)
+
+        self.comboBoxMemoryPolicy = QComboBox(self.configGroupBox)
+        self.comboBoxMemoryPolicy.addItem("")
+        self.comboBoxMemoryPolicy.addItem("")
+        self.comboBoxMemoryPolicy.addItem("")
+        self.comboBoxMemoryPolicy.setObjectName(u"comboBoxMemoryPolicy")
+
+        self.formLayout.setWidget(18, QFormLayout.FieldRole, self.comboBoxMemoryPolicy)
+
+        self.labelTimeSeriesPrefetch = QLabel(self.configGroupBox)
+        self.labelTimeSeriesPrefetch.setObjectName(u"labelTimeSeriesPrefetch")
+
+        self.formLayout.setWidget(19, QFormLayout.LabelRole, self.labelTimeSeriesPrefetch)
+
+        self.spinBoxTimeSeriesPrefetch = QSpinBox(self.configGroupBox)
+        self.spinBoxTimeSeriesPrefetch.setObjectName(u"spinBoxTimeSeriesPrefetch")
+        self.spinBoxTimeSeriesPrefetch.setMaximum(100)
+        self.spinBoxTimeSeriesPrefetch.setValue(4)
+
+        self.formLayout.setWidget(19, QFormLayout.FieldRole, self.spinBoxTimeSeriesPrefetch)
+
+        self.labelExportViews = QLabel(self.configGroupBox)
+        self.labelExportViews.setObjectName(u"labelExportViews")
+
+        self.formLayout.setWidget(20, QFormLayout.LabelRole, self.labelExportViews)
+
+        self.checkBoxExportViews = QCheckBox(self.configGroupBox)
+        self.checkBoxExportViews.setObjectName(u"checkBoxExportViews")
+
+        self.formLayout.setWidget(20, QFormLayout.FieldRole, self.checkBoxExportViews)
+
+        self.labelExportWidth = QLabel(self.configGroupBox)
+        self.labelExportWidth.setObjectName(u"labelExportWidth")
+
+        self.formLayout.setWidget(21, QFormLayout.LabelRole, self.labelExportWidth)
+
+        self.spinBoxExportWidth = QSpinBox(self.configGroupBox)
+        self.spinBoxExportWidth.setObjectName(u"spinBoxExportWidth")
+        self.spinBoxExportWidth.setMinimum(16)
+        self.spinBoxExportWidth.setMaximum(16384)
+        self.spinBoxExportWidth.setValue(1024)
+
+        self.formLayout.setWidget(21, QFormLayout.FieldRole, self.spinBoxExportWidth)
+
+        self.labelExportHeight = QLabel(self.configGroupBox)
+        self.labelExportHeight.setObjectName(u"labelExportHeight")
+
+        self.formLayout.setWidget(22, QFormLayout.LabelRole, self.labelExportHeight)
+
+        self.spinBoxExportHeight = QSpinBox(self.configGroupBox)
+        self.spinBoxExportHeight.setObjectName(u"spinBoxExportHeight")
+        self.spinBoxExportHeight.setMinimum(16)
+        self.spinBoxExportHeight.setMaximum(16384)
+        self.spinBoxExportHeight.setValue(768)
+
+        self.formLayout.setWidget(22, QFormLayout.FieldRole, self.spinBoxExportHeight)
+
+        self.labelExportTimeCount = QLabel(self.configGroupBox)
+        self.labelExportTimeCount.setObjectName(u"labelExportTimeCount")
+
+        self.formLayout.setWidget(23, QFormLayout.LabelRole, self.labelExportTimeCount)
+
+        self.spinBoxExportTimeCount = QSpinBox(self.configGroupBox)
+        self.spinBoxExportTimeCount.setObjectName(u"spinBoxExportTimeCount")
+        self.spinBoxExportTimeCount.setMinimum(0)
+        self.spinBoxExportTimeCount.setMaximum(10000)
+        self.spinBoxExportTimeCount.setValue(0)
+
+        self.formLayout.setWidget(23, QFormLayout.FieldRole, self.spinBoxExportTimeCount)
+
+        self.labelFrameTimeTarget = QLabel(self.configGroupBox)
+        self.labelFrameTimeTarget.setObjectName(u"labelFrameTimeTarget")
+
+        self.formLayout.setWidget(24, QFormLayout.LabelRole, self.labelFrameTimeTarget)
+
+        self.spinBoxFrameTimeTarget = QSpinBox(self.configGroupBox)
+        self.spinBoxFrameTimeTarget.setObjectName(u"spinBoxFrameTimeTarget")
+        self.spinBoxFrameTimeTarget.setMaximum(10000)
+
+        self.formLayout.setWidget(24, QFormLayout.FieldRole, self.spinBoxFrameTimeTarget)
+
 
         self.gridLayout.addWidget(self.configGroupBox, 0, 0, 1, 1)
 
@@ -102,5 +340,62 @@ class Ui_ConfigureDialog(object):
         self.labelVisualisationDocument.setText(QCoreApplication.translate("ConfigureDialog", u"Visualisation document:", None))
         self.checkBoxAutoDone.setText("")
         self.labelAutoDone.setText(QCoreApplication.translate("ConfigureDialog", u"Auto done:", None))
+        self.labelBackgroundLoad.setText(QCoreApplication.translate("ConfigureDialog", u"Load in background:", None))
+        self.checkBoxBackgroundLoad.setText("")
+        self.labelExfIngestion.setText(QCoreApplication.translate("ConfigureDialog", u"EX files:", None))
+        self.comboBoxExfIngestion.setItemText(0, QCoreApplication.translate("ConfigureDialog", u"Ignore", None))
+        self.comboBoxExfIngestion.setItemText(1, QCoreApplication.translate("ConfigureDialog", u"Load all into root region", None))
+        self.comboBoxExfIngestion.setItemText(2, QCoreApplication.translate("ConfigureDialog", u"Load each into a child region", None))
+        self.comboBoxExfIngestion.setItemText(3, QCoreApplication.translate("ConfigureDialog", u"Stream as a time series, one file per time", None))
+        self.labelReleaseHiddenViews.setText(QCoreApplication.translate("ConfigureDialog", u"Release hidden views after:", None))
+        self.spinBoxReleaseHiddenViews.setSpecialValueText(QCoreApplication.translate("ConfigureDialog", u"Never", None))
+        self.spinBoxReleaseHiddenViews.setSuffix(QCoreApplication.translate("ConfigureDialog", u" s", None))
+        self.labelRetentionMaxCount.setText(QCoreApplication.translate("ConfigureDialog", u"Keep at most:", None))
+        self.spinBoxRetentionMaxCount.setSpecialValueText(QCoreApplication.translate("ConfigureDialog", u"Unlimited", None))
+        self.spinBoxRetentionMaxCount.setSuffix(QCoreApplication.translate("ConfigureDialog", u" documents", None))
+        self.labelRetentionMaxSize.setText(QCoreApplication.translate("ConfigureDialog", u"Keep documents up to:", None))
+        self.spinBoxRetentionMaxSize.setSpecialValueText(QCoreApplication.translate("ConfigureDialog", u"Unlimited", None))
+        self.spinBoxRetentionMaxSize.setSuffix(QCoreApplication.translate("ConfigureDialog", u" MB", None))
+        self.labelRetentionMaxAge.setText(QCoreApplication.translate("ConfigureDialog", u"Remove documents older than:", None))
+        self.spinBoxRetentionMaxAge.setSpecialValueText(QCoreApplication.translate("ConfigureDialog", u"Never", None))
+        self.spinBoxRetentionMaxAge.setSuffix(QCoreApplication.translate("ConfigureDialog", u" days", None))
+        self.labelRetentionKeepReferenced.setText(QCoreApplication.translate("ConfigureDialog", u"Keep the visualisation document:", None))
+        self.checkBoxRetentionKeepReferenced.setText("")
+        self.labelRetentionDeduplicate.setText(QCoreApplication.translate("ConfigureDialog", u"Remove duplicate documents:", None))
+        self.checkBoxRetentionDeduplicate.setText("")
+        self.labelRegionCacheSize.setText(QCoreApplication.translate("ConfigureDialog", u"Cache parsed EX files up to:", None))
+        self.spinBoxRegionCacheSize.setSpecialValueText(QCoreApplication.translate("ConfigureDialog", u"Off", None))
+        self.spinBoxRegionCacheSize.setSuffix(QCoreApplication.translate("ConfigureDialog", u" MB", None))
+        self.labelDocumentCacheSize.setText(QCoreApplication.translate("ConfigureDialog", u"Keep loaded documents up to:", None))
+        self.spinBoxDocumentCacheSize.setSpecialValueText(QCoreApplication.translate("ConfigureDialog", u"Off", None))
+        self.spinBoxDocumentCacheSize.setSuffix(QCoreApplication.translate("ConfigureDialog", u" MB", None))
+        self.labelCompareDocuments.setText(QCoreApplication.translate("ConfigureDialog", u"Compare Argon documents:", None))
+        self.checkBoxCompareDocuments.setText("")
+        self.labelPerformanceReport.setText(QCoreApplication.translate("ConfigureDialog", u"Write performance reports:", None))
+        self.checkBoxPerformanceReport.setText("")
+        self.labelPerformanceProfile.setText(QCoreApplication.translate("ConfigureDialog", u"Profile with cProfile:", None))
+        self.checkBoxPerformanceProfile.setText("")
+        self.labelMemoryBudget.setText(QCoreApplication.translate("ConfigureDialog", u"Memory budget for EX files:", None))
+        self.spinBoxMemoryBudget.setSpecialValueText(QCoreApplication.translate("ConfigureDialog", u"No limit", None))
+        self.spinBoxMemoryBudget.setSuffix(QCoreApplication.translate("ConfigureDialog", u" MB", None))
+        self.labelMemoryPolicy.setText(QCoreApplication.translate("ConfigureDialog", u"EX files over the budget:", None))
+        self.comboBoxMemoryPolicy.setItemText(0, QCoreApplication.translate("ConfigureDialog", u"Refuse", None))
+        self.comboBoxMemoryPolicy.setItemText(1, QCoreApplication.translate("ConfigureDialog", u"Downsample, load every Nth file", None))
+        self.comboBoxMemoryPolicy.setItemText(2, QCoreApplication.translate("ConfigureDialog", u"Load on request from Model Sources", None))
+        self.labelTimeSeriesPrefetch.setText(QCoreApplication.translate("ConfigureDialog", u"Read time series ahead by:", None))
+        self.spinBoxTimeSeriesPrefetch.setSpecialValueText(QCoreApplication.translate("ConfigureDialog", u"Off", None))
+        self.spinBoxTimeSeriesPrefetch.setSuffix(QCoreApplication.translate("ConfigureDialog", u" frames", None))
+        self.labelExportViews.setText(QCoreApplication.translate("ConfigureDialog", u"Export views as images:", None))
+        self.checkBoxExportViews.setText("")
+        self.labelExportWidth.setText(QCoreApplication.translate("ConfigureDialog", u"Exported image width:", None))
+        self.spinBoxExportWidth.setSuffix(QCoreApplication.translate("ConfigureDialog", u" px", None))
+        self.labelExportHeight.setText(QCoreApplication.translate("ConfigureDialog", u"Exported image height:", None))
+        self.spinBoxExportHeight.setSuffix(QCoreApplication.translate("ConfigureDialog", u" px", None))
+        self.labelExportTimeCount.setText(QCoreApplication.translate("ConfigureDialog", u"Exported times:", None))
+        self.spinBoxExportTimeCount.setSpecialValueText(QCoreApplication.translate("ConfigureDialog", u"Current time", None))
+        self.spinBoxExportTimeCount.setSuffix(QCoreApplication.translate("ConfigureDialog", u" times", None))
+        self.labelFrameTimeTarget.setText(QCoreApplication.translate("ConfigureDialog", u"Coarsen graphics while moving over:", None))
+        self.spinBoxFrameTimeTarget.setSpecialValueText(QCoreApplication.translate("ConfigureDialog", u"Off", None))
+        self.spinBoxFrameTimeTarget.setSuffix(QCoreApplication.translate("ConfigureDialog", u" ms per frame", None))
     # retranslateUi
 
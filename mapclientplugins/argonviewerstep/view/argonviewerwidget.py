@@ -5,7 +5,6 @@ import webbrowser
 from PySide6 import QtCore, QtGui, QtWidgets
 
 from cmlibs.argon.argonlogger import ArgonLogger
-from cmlibs.argon.utilities import is_argon_file
 
 from cmlibs.widgets.materialeditorwidget import MaterialEditorWidget
 from cmlibs.widgets.regioneditorwidget import RegionEditorWidget
@@ -18,12 +17,21 @@ from cmlibs.widgets.fieldlisteditorwidget import FieldListEditorWidget
 from cmlibs.widgets.modelsourceseditorwidget import ModelSourcesEditorWidget, ModelSourcesModel
 from cmlibs.widgets.addviewwidget import AddView
 from cmlibs.widgets.editabletabbar import EditableTabBar
-from cmlibs.widgets.viewwidget import ViewWidget
 from cmlibs.widgets.logviewerwidget import LogViewerWidget
 from cmlibs.widgets.consoleeditorwidget import ConsoleEditorWidget
 from cmlibs.widgets.scenelayoutchooserdialog import SceneLayoutChooserDialog
 
+from mapclientplugins.argonviewerstep.model.levelofdetail import TessellationLevelOfDetail
 from mapclientplugins.argonviewerstep.ui.ui_argonviewerwidget import Ui_ArgonViewerWidget
+from mapclientplugins.argonviewerstep.view.backgroundloader import BackgroundLoader
+from mapclientplugins.argonviewerstep.view.backgroundwriter import BackgroundWriter
+from mapclientplugins.argonviewerstep.view.lazyeditorregistry import LazyEditorRegistry
+from mapclientplugins.argonviewerstep.view.renderscheduler import RenderScheduler
+from mapclientplugins.argonviewerstep.view.viewexporter import export_document_views
+from mapclientplugins.argonviewerstep.view.viewtab import ViewTab
+
+# Milliseconds without interaction before coarsened tessellations are refined again.
+LEVEL_OF_DETAIL_IDLE_TIMEOUT = 300
 
 
 class ArgonViewerWidget(QtWidgets.QMainWindow):
@@ -42,6 +50,27 @@ class ArgonViewerWidget(QtWidgets.QMainWindow):
 
         self._toolbar = self._ui.toolBar
 
+        self._background_loader = BackgroundLoader(self)
+        self._background_load_callback = None
+        self._background_load_file_locations = []
+        self._document_writer = BackgroundWriter(self)
+
+        self._editors = LazyEditorRegistry()
+        self._current_view_tab = None
+        # Sceneviewers are only repainted while they can be seen, at most once per frame.
+        self._render_scheduler = RenderScheduler(self)
+        self._release_hidden_views_timeout = 0
+        self._release_hidden_views_timer = QtCore.QTimer(self)
+        self._release_hidden_views_timer.timeout.connect(self._release_hidden_views)
+        self._level_of_detail = None
+        self._frame_time_target = 0.0
+        self._view_frame_time_targets = {}
+        self._level_of_detail_timer = QtCore.QTimer(self)
+        self._level_of_detail_timer.setSingleShot(True)
+        self._level_of_detail_timer.setInterval(LEVEL_OF_DETAIL_IDLE_TIMEOUT)
+        self._level_of_detail_timer.timeout.connect(self._refine_tessellations)
+
+        self._setupStatusBar()
         self._makeConnections()
         self._setupEditors()
         self._registerEditors()
@@ -52,29 +81,50 @@ class ArgonViewerWidget(QtWidgets.QMainWindow):
         self._visualisation_doc_callback = None
 
     def _onDocumentChanged(self):
-        document = self._model.getDocument()
-        rootRegion = document.getRootRegion()
-        zincRootRegion = rootRegion.getZincRegion()
+        instrumentation = self._model.getInstrumentation()
+        self._level_of_detail_timer.stop()
+        self._refine_tessellations()
+        self._level_of_detail = TessellationLevelOfDetail(self._model.getDocument().getTessellations())
+        # Views are loaded first so the sceneviewer editor can be bound to the active sceneviewer.
+        with instrumentation.span('load-views'):
+            self._load_views()
+        with instrumentation.span('bind-editors'):
+            self._editors.bindAll()
+
+    def setFrameTimeTarget(self, target, view_name=None):
+        """
+        Set the seconds a frame should take to draw while a view is moved.  Frames taking longer
+        coarsen the tessellations until the view has not been moved for a moment.
 
-        # Need to pass new Zinc context to dialogs and widgets using global modules.
-        zincContext = document.getZincContext()
-        self.dockWidgetContentsSpectrumEditor.setSpectrums(document.getSpectrums())
-        self.dockWidgetContentsTessellationEditor.setTessellations(document.getTessellations())
-        self.dockWidgetContentsMaterialEditor.setMaterials(document.getMaterials())
-        self.dockWidgetContentsTimeEditor.setZincContext(zincContext)
-        self.dockWidgetContentsConsoleEditor.setDocument(document)
+        :param target: Seconds per frame, zero for no target.
+        :param view_name: Name of the view the target is for, None for the target of views without their own.
+        """
+        if view_name is None:
+            self._frame_time_target = target
+        else:
+            self._view_frame_time_targets[view_name] = target
+
+        for index in range(self._ui.viewTabWidget.count()):
+            tab = self._ui.viewTabWidget.widget(index)
+            if isinstance(tab, ViewTab):
+                tab.setFrameTimeTarget(self._view_frame_time_target(self._ui.viewTabWidget.tabText(index)))
 
-        model_sources_model = ModelSourcesModel(document, self._model.getSources())
-        self.dockWidgetContentsModelSources.setModelSourcesModel(zincRootRegion, model_sources_model)
+    def _view_frame_time_target(self, view_name):
+        return self._view_frame_time_targets.get(view_name, self._frame_time_target)
 
-        # Need to pass new root region to the following.
-        self.dockWidgetContentsRegionEditor.setRootRegion(rootRegion)
-        self.dockWidgetContentsSceneEditor.setZincRootRegion(zincRootRegion)
-        self.dockWidgetContentsSceneviewerEditor.setZincRootRegion(zincRootRegion)
-        self.dockWidgetContentsFieldEditor.setRootArgonRegion(rootRegion)
-        self.dockWidgetContentsFieldEditor.setTimekeeper(zincContext.getTimekeepermodule().getDefaultTimekeeper())
+    def _view_interacted(self):
+        if self._level_of_detail is not None and self._level_of_detail.isCoarse():
+            self._level_of_detail_timer.start()
 
-        self._load_views()
+    def _view_frame_rendered(self, frame_time):
+        target = self.sender().getFrameTimeTarget()
+        if self._level_of_detail is not None and 0 < target < frame_time:
+            self._level_of_detail.coarsen()
+            self._level_of_detail_timer.start()
+
+    def _refine_tessellations(self):
+        if self._level_of_detail is not None:
+            self._level_of_detail.refine()
 
     def setZincContext(self, zincContext):
         raise NotImplementedError()
@@ -97,26 +147,58 @@ class ArgonViewerWidget(QtWidgets.QMainWindow):
         self._location = location
 
     def load(self, file_locations, auto_load_previous):
-        current_document_location = self._model.getCurrentDocumentLocation()
-
-        index = 0
-        max_files = len(file_locations)
-        while index < max_files and not is_argon_file(file_locations[index]):
-            index += 1
-
-        load_success = False
-        if index < max_files:
-            load_success = self._model.load(file_locations[index])
+        with self._model.getInstrumentation().span('load-sources'):
+            self._model.loadSources(file_locations, auto_load_previous)
+        self._onDocumentChanged()
 
-        have_previous_document = os.path.isfile(current_document_location)
-        if not load_success and auto_load_previous and have_previous_document:
-            load_success = self._model.load(current_document_location)
+    def showLoadedDocument(self):
+        """
+        Bind the views and editors to the document the model has already loaded.
+        """
+        self._onDocumentChanged()
 
-        if not load_success:
+    def load_in_background(self, file_locations, auto_load_previous, callback=None):
+        """
+        Load the document in a worker thread, showing progress in the status bar.
+        The views and editors are only bound to the Zinc context once loading completes,
+        at which point callback is called with True on success or False if loading was cancelled or failed.
+        """
+        self._background_load_callback = callback
+        self._background_load_file_locations = file_locations
+        self._set_loading(True)
+        load_sources = self._model.getInstrumentation().wrap('load-sources', self._model.loadSources)
+        self._background_loader.start(load_sources, file_locations, auto_load_previous)
+
+    def _set_loading(self, state):
+        self._ui.pushButtonDone.setEnabled(not state)
+        self._ui.viewTabWidget.setEnabled(not state)
+        self._toolbar.setEnabled(not state)
+        self._load_progress_bar.setValue(0)
+        self._load_progress_bar.setVisible(state)
+        self._load_cancel_button.setVisible(state)
+        self._load_cancel_button.setEnabled(state)
+        if not state:
+            self.statusBar().clearMessage()
+
+    def _background_load_progress(self, step, step_count, message):
+        self._load_progress_bar.setMaximum(step_count)
+        self._load_progress_bar.setValue(step)
+        self.statusBar().showMessage(message)
+
+    def _background_load_cancel_clicked(self):
+        self._load_cancel_button.setEnabled(False)
+        self.statusBar().showMessage('Cancelling ...')
+        self._background_loader.cancel()
+
+    def _background_load_finished(self, success):
+        if not success and not self._background_loader.isCancelled():
+            # A failed load may have left a partially loaded document behind.
             self._model.new()
-
-        self._model.setSources(file_locations)
+            self._model.setSources(self._background_load_file_locations)
+        self._set_loading(False)
         self._onDocumentChanged()
+        if self._background_load_callback is not None:
+            self._background_load_callback(success)
 
     def getDependentEditors(self):
         return self._dock_widgets
@@ -135,6 +217,20 @@ class ArgonViewerWidget(QtWidgets.QMainWindow):
         self._ui.viewTabWidget.currentChanged.connect(self._currentViewChanged)
         tab_bar = self._ui.viewTabWidget.tabBar()
         tab_bar.tabTextEdited.connect(self._viewTabTextEdited)
+        self._background_loader.progress.connect(self._background_load_progress)
+        self._background_loader.finished.connect(self._background_load_finished)
+        self._document_writer.finished.connect(self._document_written)
+        self._load_cancel_button.clicked.connect(self._background_load_cancel_clicked)
+
+    def _setupStatusBar(self):
+        self._load_progress_bar = QtWidgets.QProgressBar()
+        self._load_progress_bar.setMaximumWidth(200)
+        self._load_progress_bar.setVisible(False)
+        self._load_cancel_button = QtWidgets.QPushButton('Cancel')
+        self._load_cancel_button.setVisible(False)
+        status_bar = self.statusBar()
+        status_bar.addPermanentWidget(self._load_progress_bar)
+        status_bar.addPermanentWidget(self._load_cancel_button)
 
     def _addDockWidgets(self):
         self.addDockWidget(QtCore.Qt.DockWidgetArea.LeftDockWidgetArea, self.dockWidgetModelSources)
@@ -149,97 +245,109 @@ class ArgonViewerWidget(QtWidgets.QMainWindow):
         self.tabifyDockWidget(self.dockWidgetFieldEditor, self.dockWidgetRegionEditor)
         self.tabifyDockWidget(self.dockWidgetRegionEditor, self.dockWidgetMaterialEditor)
 
+    def _create_dock_widget(self, title, object_name, hidden=True):
+        dock_widget = QtWidgets.QDockWidget(self)
+        dock_widget.setWindowTitle(title)
+        dock_widget.setObjectName(object_name)
+        dock_widget.setHidden(hidden)
+        return dock_widget
+
     def _setupEditors(self):
+        """
+        Create the dock widgets, their editors are only created when a dock is first shown.
+        """
+        editors = self._editors
+
+        self.dockWidgetMaterialEditor = self._create_dock_widget('Material Editor', 'dockWidgetMaterialEditor')
+        editors.register(self.dockWidgetMaterialEditor, 'dockWidgetContentsMaterialEditor',
+                         lambda dock: MaterialEditorWidget(),
+                         lambda editor: editor.setMaterials(self._model.getDocument().getMaterials()))
+
+        self.dockWidgetModelSources = self._create_dock_widget('Model Sources', 'dockWidgetModelSources', hidden=False)
+        editors.register(self.dockWidgetModelSources, 'dockWidgetContentsModelSources',
+                         self._create_model_sources_editor, self._bind_model_sources_editor)
+
+        self.dockWidgetRegionEditor = self._create_dock_widget('Region Editor', 'dockWidgetRegionEditor')
+        editors.register(self.dockWidgetRegionEditor, 'dockWidgetContentsRegionEditor',
+                         lambda dock: RegionEditorWidget(),
+                         lambda editor: editor.setRootRegion(self._model.getDocument().getRootRegion()))
+
+        self.dockWidgetSceneEditor = self._create_dock_widget('Scene Editor', 'dockWidgetSceneEditor')
+        editors.register(self.dockWidgetSceneEditor, 'dockWidgetContentsSceneEditor',
+                         lambda dock: SceneEditorWidget(),
+                         lambda editor: editor.setZincRootRegion(self._model.getDocument().getRootRegion().getZincRegion()))
+
+        self.dockWidgetSceneviewerEditor = self._create_dock_widget('Sceneviewer Editor', 'dockWidgetSceneviewerEditor')
+        editors.register(self.dockWidgetSceneviewerEditor, 'dockWidgetContentsSceneviewerEditor',
+                         self._create_sceneviewer_editor, self._bind_sceneviewer_editor)
+
+        self.dockWidgetSpectrumEditor = self._create_dock_widget('Spectrum Editor', 'dockWidgetSpectrumEditor')
+        editors.register(self.dockWidgetSpectrumEditor, 'dockWidgetContentsSpectrumEditor',
+                         lambda dock: SpectrumEditorWidget(dock),
+                         lambda editor: editor.setSpectrums(self._model.getDocument().getSpectrums()))
+
+        self.dockWidgetTessellationEditor = self._create_dock_widget('Tessellation Editor', 'dockWidgetTessellationEditor')
+        editors.register(self.dockWidgetTessellationEditor, 'dockWidgetContentsTessellationEditor',
+                         lambda dock: TessellationEditorWidget(),
+                         lambda editor: editor.setTessellations(self._model.getDocument().getTessellations()))
+
+        self.dockWidgetTimeEditor = self._create_dock_widget('Time Editor', 'dockWidgetTimeEditor')
+        editors.register(self.dockWidgetTimeEditor, 'dockWidgetContentsTimeEditor',
+                         lambda dock: TimeEditorWidget(),
+                         lambda editor: editor.setZincContext(self._model.getDocument().getZincContext()))
+
+        self.dockWidgetLoggerEditor = self._create_dock_widget('Logger Editor', 'dockWidgetLoggerEditor')
+        editors.register(self.dockWidgetLoggerEditor, 'dockWidgetContentsLoggerEditor',
+                         lambda dock: LogViewerWidget())
+
+        self.dockWidgetConsoleEditor = self._create_dock_widget('Console Editor', 'dockWidgetConsoleEditor')
+        editors.register(self.dockWidgetConsoleEditor, 'dockWidgetContentsConsoleEditor',
+                         lambda dock: ConsoleEditorWidget(),
+                         lambda editor: editor.setDocument(self._model.getDocument()))
+
+        self.dockWidgetFieldEditor = self._create_dock_widget('Field Editor', 'dockWidgetFieldEditor')
+        editors.register(self.dockWidgetFieldEditor, 'dockWidgetContentsFieldEditor',
+                         lambda dock: FieldListEditorWidget(), self._bind_field_editor)
 
-        self.dockWidgetMaterialEditor = QtWidgets.QDockWidget(self)
-        self.dockWidgetMaterialEditor.setWindowTitle('Material Editor')
-        self.dockWidgetMaterialEditor.setObjectName("dockWidgetMaterialEditor")
-        self.dockWidgetContentsMaterialEditor = MaterialEditorWidget()
-        self.dockWidgetContentsMaterialEditor.setObjectName("dockWidgetContentsMaterialEditor")
-        self.dockWidgetMaterialEditor.setWidget(self.dockWidgetContentsMaterialEditor)
-        self.dockWidgetMaterialEditor.setHidden(True)
-
-        self.dockWidgetModelSources = QtWidgets.QDockWidget(self)
-        self.dockWidgetModelSources.setWindowTitle('Model Sources')
-        self.dockWidgetModelSources.setObjectName("dockWidgetModelSources")
-        self.dockWidgetContentsModelSources = ModelSourcesEditorWidget()
-        self.dockWidgetContentsModelSources.setObjectName("dockWidgetContentsModelSources")
-        self.dockWidgetContentsModelSources.setEnableAddingModelSources(False)
-        self.dockWidgetModelSources.setWidget(self.dockWidgetContentsModelSources)
-        self.dockWidgetModelSources.setHidden(False)
-
-        self.dockWidgetRegionEditor = QtWidgets.QDockWidget(self)
-        self.dockWidgetRegionEditor.setWindowTitle('Region Editor')
-        self.dockWidgetRegionEditor.setObjectName("dockWidgetRegionEditor")
-        self.dockWidgetContentsRegionEditor = RegionEditorWidget()
-        self.dockWidgetContentsRegionEditor.setObjectName("dockWidgetContentsRegionEditor")
-        self.dockWidgetRegionEditor.setWidget(self.dockWidgetContentsRegionEditor)
-        self.dockWidgetRegionEditor.setHidden(True)
-
-        self.dockWidgetSceneEditor = QtWidgets.QDockWidget(self)
-        self.dockWidgetSceneEditor.setWindowTitle('Scene Editor')
-        self.dockWidgetSceneEditor.setObjectName("dockWidgetSceneEditor")
-        self.dockWidgetContentsSceneEditor = SceneEditorWidget()
-        self.dockWidgetContentsSceneEditor.setObjectName("dockWidgetContentsSceneEditor")
-        self.dockWidgetSceneEditor.setWidget(self.dockWidgetContentsSceneEditor)
-        self.dockWidgetSceneEditor.setHidden(True)
-
-        self.dockWidgetSceneviewerEditor = QtWidgets.QDockWidget(self)
-        self.dockWidgetSceneviewerEditor.setWindowTitle('Sceneviewer Editor')
-        self.dockWidgetSceneviewerEditor.setObjectName("dockWidgetSceneviewerEditor")
-        self.dockWidgetContentsSceneviewerEditor = SceneviewerEditorWidget(self.dockWidgetSceneviewerEditor)
-        self.dockWidgetContentsSceneviewerEditor.setObjectName("dockWidgetContentsSceneviewerEditor")
-        self.dockWidgetSceneviewerEditor.setWidget(self.dockWidgetContentsSceneviewerEditor)
-        self.dockWidgetSceneviewerEditor.setHidden(True)
-        self.dockWidgetSceneviewerEditor.visibilityChanged.connect(self.dockWidgetContentsSceneviewerEditor.setEnableUpdates)
-
-        self.dockWidgetSpectrumEditor = QtWidgets.QDockWidget(self)
-        self.dockWidgetSpectrumEditor.setWindowTitle('Spectrum Editor')
-        self.dockWidgetSpectrumEditor.setObjectName("dockWidgetSpectrumEditor")
-        self.dockWidgetContentsSpectrumEditor = SpectrumEditorWidget(self.dockWidgetSpectrumEditor)
-        self.dockWidgetContentsSpectrumEditor.setObjectName("dockWidgetContentsSpectrumEditor")
-        self.dockWidgetSpectrumEditor.setWidget(self.dockWidgetContentsSpectrumEditor)
-        self.dockWidgetSpectrumEditor.setHidden(True)
-
-        self.dockWidgetTessellationEditor = QtWidgets.QDockWidget(self)
-        self.dockWidgetTessellationEditor.setWindowTitle('Tessellation Editor')
-        self.dockWidgetTessellationEditor.setObjectName("dockWidgetTessellationEditor")
-        self.dockWidgetContentsTessellationEditor = TessellationEditorWidget()
-        self.dockWidgetContentsTessellationEditor.setObjectName("dockWidgetContentsTessellationEditor")
-        self.dockWidgetTessellationEditor.setWidget(self.dockWidgetContentsTessellationEditor)
-        self.dockWidgetTessellationEditor.setHidden(True)
-
-        self.dockWidgetTimeEditor = QtWidgets.QDockWidget(self)
-        self.dockWidgetTimeEditor.setWindowTitle('Time Editor')
-        self.dockWidgetTimeEditor.setObjectName("dockWidgetTimeEditor")
-        self.dockWidgetContentsTimeEditor = TimeEditorWidget()
-        self.dockWidgetContentsTimeEditor.setObjectName("dockWidgetContentsTimeEditor")
-        self.dockWidgetTimeEditor.setWidget(self.dockWidgetContentsTimeEditor)
-        self.dockWidgetTimeEditor.setHidden(True)
-
-        self.dockWidgetLoggerEditor = QtWidgets.QDockWidget(self)
-        self.dockWidgetLoggerEditor.setWindowTitle('Logger Editor')
-        self.dockWidgetLoggerEditor.setObjectName("dockWidgetLoggerEditor")
-        self.dockWidgetContentsLoggerEditor = LogViewerWidget()
-        self.dockWidgetContentsLoggerEditor.setObjectName("dockWidgetContentsLoggerEditor")
-        self.dockWidgetLoggerEditor.setWidget(self.dockWidgetContentsLoggerEditor)
-        self.dockWidgetLoggerEditor.setHidden(True)
-
-        self.dockWidgetConsoleEditor = QtWidgets.QDockWidget(self)
-        self.dockWidgetConsoleEditor.setWindowTitle('Console Editor')
-        self.dockWidgetConsoleEditor.setObjectName("dockWidgetConsoleEditor")
-        self.dockWidgetContentsConsoleEditor = ConsoleEditorWidget()
-        self.dockWidgetContentsConsoleEditor.setObjectName("dockWidgetContentsConsoleEditor")
-        self.dockWidgetConsoleEditor.setWidget(self.dockWidgetContentsConsoleEditor)
-        self.dockWidgetConsoleEditor.setHidden(True)
-
-        self.dockWidgetFieldEditor = QtWidgets.QDockWidget(self)
-        self.dockWidgetFieldEditor.setWindowTitle('Field Editor')
-        self.dockWidgetFieldEditor.setObjectName("dockWidgetFieldEditor")
-        self.dockWidgetContentsFieldEditor = FieldListEditorWidget()
-        self.dockWidgetContentsFieldEditor.setObjectName("dockWidgetContentsFieldEditor")
-        self.dockWidgetFieldEditor.setWidget(self.dockWidgetContentsFieldEditor)
-        self.dockWidgetFieldEditor.setHidden(True)
+    @staticmethod
+    def _create_model_sources_editor(dock_widget):
+        editor = ModelSourcesEditorWidget()
+        editor.setEnableAddingModelSources(False)
+        # Reports the files not loaded to keep within the memory budget.
+        memory_plan_label = QtWidgets.QLabel(editor)
+        memory_plan_label.setObjectName('labelMemoryPlan')
+        memory_plan_label.setWordWrap(True)
+        memory_plan_label.setVisible(False)
+        editor.layout().insertWidget(0, memory_plan_label)
+        return editor
+
+    def _bind_model_sources_editor(self, editor):
+        document = self._model.getDocument()
+        # Refused sources are left out so they cannot be applied, deferred sources are applied from here.
+        refused_sources = self._model.getRefusedSources()
+        sources = [source for source in self._model.getSources() if source not in refused_sources]
+        model_sources_model = ModelSourcesModel(document, sources)
+        editor.setModelSourcesModel(document.getRootRegion().getZincRegion(), model_sources_model)
+        memory_plan_label = editor.findChild(QtWidgets.QLabel, 'labelMemoryPlan')
+        memory_plan_description = self._model.describeMemoryPlan()
+        memory_plan_label.setText(memory_plan_description)
+        memory_plan_label.setVisible(bool(memory_plan_description))
+
+    @staticmethod
+    def _create_sceneviewer_editor(dock_widget):
+        editor = SceneviewerEditorWidget(dock_widget)
+        dock_widget.visibilityChanged.connect(editor.setEnableUpdates)
+        return editor
+
+    def _bind_sceneviewer_editor(self, editor):
+        editor.setZincRootRegion(self._model.getDocument().getRootRegion().getZincRegion())
+        editor.setSceneviewer(self._current_sceneviewer())
+        editor.setEnableUpdates(self.dockWidgetSceneviewerEditor.isVisible())
+
+    def _bind_field_editor(self, editor):
+        document = self._model.getDocument()
+        editor.setRootArgonRegion(document.getRootRegion())
+        editor.setTimekeeper(document.getZincContext().getTimekeepermodule().getDefaultTimekeeper())
 
     def _registerEditors(self):
         self._registerEditor(self.dockWidgetMaterialEditor)
@@ -261,6 +369,7 @@ class ArgonViewerWidget(QtWidgets.QMainWindow):
         # view.registerDependentEditor(editor)
 
     def _clear_views(self):
+        self._current_view_tab = None
         self._ui.viewTabWidget.clear()
 
     def _find_matching_view_widget_index(self, id_):
@@ -307,6 +416,7 @@ class ArgonViewerWidget(QtWidgets.QMainWindow):
                 self._ui.viewTabWidget.setCurrentWidget(active_widget)
             else:
                 self._ui.viewTabWidget.setCurrentIndex(0)
+            self._realise_current_view()
             self._set_views_editable(True)
         else:
             self._load_no_views()
@@ -345,6 +455,7 @@ class ArgonViewerWidget(QtWidgets.QMainWindow):
         view.setName(value)
 
     def _currentViewChanged(self, index):
+        self._realise_current_view()
         document = self._model.getDocument()
         view_manager = document.getViewManager()
         view_manager.setActiveView(self._ui.viewTabWidget.tabText(index))
@@ -361,13 +472,16 @@ class ArgonViewerWidget(QtWidgets.QMainWindow):
 
         self._ui.viewTabWidget.setCornerWidget(btn)
 
-    def _current_sceneviewer_changed(self):
+    def _current_sceneviewer(self):
         try:
-            sceneviewer = self._ui.viewTabWidget.currentWidget().getActiveSceneviewer()
+            return self._ui.viewTabWidget.currentWidget().getActiveSceneviewer()
         except AttributeError:
-            sceneviewer = None
+            return None
 
-        self.dockWidgetContentsSceneviewerEditor.setSceneviewer(sceneviewer)
+    def _current_sceneviewer_changed(self):
+        editor = self._editors.editor(self.dockWidgetSceneviewerEditor)
+        if editor is not None:
+            editor.setSceneviewer(self._current_sceneviewer())
 
     def _visualisationViewReady(self):
         self._visualisation_view_ready = True
@@ -389,13 +503,63 @@ class ArgonViewerWidget(QtWidgets.QMainWindow):
             self._load_no_views()
 
     def _create_new_view(self, view, zinc_context):
-        w = ViewWidget(view.getScenes(), view.getGridSpecification(), self._ui.viewTabWidget)
-
+        """
+        Add a tab for view, its sceneviewers are only created when the tab first becomes current.
+        """
+        w = ViewTab(view, zinc_context, self._render_scheduler, self._ui.viewTabWidget)
         w.currentChanged.connect(self._current_sceneviewer_changed)
-        w.setContext(zinc_context)
+        w.setFrameTimeTarget(self._view_frame_time_target(view.getName()))
+        w.interacted.connect(self._view_interacted)
+        w.frameRendered.connect(self._view_frame_rendered)
         self._ui.viewTabWidget.addTab(w, view.getName())
         return w
 
+    def _realise_current_view(self):
+        current_widget = self._ui.viewTabWidget.currentWidget()
+        if self._current_view_tab is not None and self._current_view_tab is not current_widget:
+            self._current_view_tab.markShown()
+
+        if isinstance(current_widget, ViewTab):
+            current_widget.realise()
+            self._current_view_tab = current_widget
+        else:
+            self._current_view_tab = None
+
+    def setReleaseHiddenViewsTimeout(self, timeout):
+        """
+        Release the sceneviewers of views that have not been current for timeout seconds.
+        A timeout of zero never releases them.
+        """
+        self._release_hidden_views_timeout = timeout
+        if timeout > 0:
+            self._release_hidden_views_timer.start(max(1000, int(timeout * 500)))
+        else:
+            self._release_hidden_views_timer.stop()
+
+    def _release_hidden_views(self):
+        for index in range(self._ui.viewTabWidget.count()):
+            tab = self._ui.viewTabWidget.widget(index)
+            if isinstance(tab, ViewTab) and tab is not self._current_view_tab and tab.isRealised():
+                if tab.hiddenFor() > self._release_hidden_views_timeout:
+                    tab.release()
+
+    def exportViews(self, directory, width, height, time_count=0):
+        """
+        Write images of every view to directory, rendered offscreen so the views need not be shown.
+        Changes made in the realised views are copied into the Argon views first.
+
+        :param time_count: Number of times to render the views at, spread over the time range, zero for the current time.
+        :return: List of the image file names written.
+        """
+        self._level_of_detail_timer.stop()
+        self._refine_tessellations()
+        for index in range(self._ui.viewTabWidget.count()):
+            tab = self._ui.viewTabWidget.widget(index)
+            if isinstance(tab, ViewTab):
+                tab.updateArgonView()
+
+        return export_document_views(self._model, directory, width, height, time_count)
+
     def _add_view_clicked(self):
         dlg = SceneLayoutChooserDialog(self)
         dlg.setModal(True)
@@ -404,7 +568,7 @@ class ArgonViewerWidget(QtWidgets.QMainWindow):
             document = self._model.getDocument()
             view_manager = document.getViewManager()
             if view_manager.viewCount() == 0:
-                self._ui.viewTabWidget.clear()
+                self._clear_views()
                 self._set_views_editable(True)
             new_view = view_manager.addViewByType(layout)
             view_manager.setActiveView(new_view.getName())
@@ -420,35 +584,48 @@ class ArgonViewerWidget(QtWidgets.QMainWindow):
 
     def _done_button_clicked(self, checked=False, auto_done=False):
         QtWidgets.QApplication.setOverrideCursor(QtCore.Qt.CursorShape.WaitCursor)
+        # The document is saved with the tessellations it was given, not coarsened ones.
+        self._level_of_detail_timer.stop()
+        self._refine_tessellations()
         try:
             document = self._model.getDocument()
             view_manager = document.getViewManager()
             if view_manager.viewCount() and not auto_done:
-                self._ui.viewTabWidget.blockSignals(True)
-                for index in range(self._ui.viewTabWidget.count()):
-                    self._ui.viewTabWidget.setCurrentIndex(index)
-                    tab = self._ui.viewTabWidget.widget(index)
-                    tab_layout = tab.layout()
-
-                    view = view_manager.getView(index)
-                    view.setName(self._ui.viewTabWidget.tabText(index))
-
-                    rows = tab_layout.rowCount()
-                    columns = tab_layout.columnCount()
-                    for r in range(rows):
-                        for c in range(columns):
-                            sceneviewer_widget = tab_layout.itemAtPosition(r, c).widget()
-                            view.updateSceneviewer(r, c, sceneviewer_widget.get_zinc_sceneviewer())
-
-                self._ui.viewTabWidget.blockSignals(False)
-
-            current_document_location = self._model.getCurrentDocumentLocation()
-            self._visualisation_doc_callback(os.path.basename(current_document_location))
-            with open(current_document_location, 'w') as f:
-                f.write(document.serialize(base_path=os.path.dirname(current_document_location)))
-
-        finally:
+                with self._model.getInstrumentation().span('update-views'):
+                    for index in range(self._ui.viewTabWidget.count()):
+                        view = view_manager.getView(index)
+                        view.setName(self._ui.viewTabWidget.tabText(index))
+
+                        # Only sceneviewers that changed are read back, the other views still hold their state.
+                        self._ui.viewTabWidget.widget(index).updateArgonView()
+
+            # Getting the state reads from Zinc so stays on this thread, encoding and writing are done in the background.
+            state = self._model.getCurrentDocumentState()
+        except Exception:
             ArgonLogger.closeLogger()
             QtWidgets.QApplication.restoreOverrideCursor()
-
+            raise
+
+        self._ui.pushButtonDone.setEnabled(False)
+        self.statusBar().showMessage('Saving visualisation document ...')
+        save_document = self._model.getInstrumentation().wrap('save-document', self._model.saveCurrentDocument)
+        self._document_writer.start(save_document, state)
+
+    def _document_written(self, success, message):
+        QtWidgets.QApplication.restoreOverrideCursor()
+        self._ui.pushButtonDone.setEnabled(True)
+        self.statusBar().clearMessage()
+        if not success:
+            QtWidgets.QMessageBox.warning(self, 'Save Failed', f'The visualisation document could not be saved: {message}')
+            return
+
+        # Only a document that was written is named in the step configuration.
+        self._visualisation_doc_callback(os.path.basename(self._model.getCurrentDocumentLocation()))
+        self._document_writer.close()
+        ArgonLogger.closeLogger()
         self._callback()
+
+    def closeEvent(self, event):
+        # A pending write is finished, not abandoned, when the widget closes.
+        self._document_writer.close()
+        super(ArgonViewerWidget, self).closeEvent(event)
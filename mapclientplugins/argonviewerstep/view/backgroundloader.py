@@ -0,0 +1,50 @@
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+
+from PySide6 import QtCore
+
+from cmlibs.argon.argonlogger import ArgonLogger
+
+
+class BackgroundLoader(QtCore.QObject):
+    """
+    Runs a loading function in a worker thread.  Progress and completion are
+    reported through signals so that connected slots run on the Qt main thread.
+    """
+
+    progress = QtCore.Signal(int, int, str)
+    finished = QtCore.Signal(bool)
+
+    def __init__(self, parent=None):
+        super(BackgroundLoader, self).__init__(parent)
+        self._executor = None
+        self._cancel_event = threading.Event()
+
+    def start(self, load_function, *args):
+        """
+        Start load_function(*args, progress_callback=..., cancel_event=...) in a worker thread.
+        The finished signal carries the return value of load_function, or False if it raised.
+        """
+        self._cancel_event.clear()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='ArgonViewerLoader')
+        future = self._executor.submit(load_function, *args, progress_callback=self.progress.emit, cancel_event=self._cancel_event)
+        future.add_done_callback(self._load_done)
+
+    def _load_done(self, future):
+        try:
+            result = future.result()
+        except Exception as e:
+            ArgonLogger.writeErrorMessage(f'Background load failed: {e}')
+            result = False
+        self._executor.shutdown(wait=False)
+        self.finished.emit(result)
+
+    def cancel(self):
+        """
+        Request the current load stops at the next opportunity.
+        """
+        self._cancel_event.set()
+
+    def isCancelled(self):
+        return self._cancel_event.is_set()
@@ -0,0 +1,40 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from PySide6 import QtCore
+
+
+class BackgroundWriter(QtCore.QObject):
+    """
+    Runs a write function in a worker thread.  Completion is reported through the
+    finished signal, with the success of the write and an error message on failure,
+    so that connected slots run on the Qt main thread.
+    """
+
+    finished = QtCore.Signal(bool, str)
+
+    def __init__(self, parent=None):
+        super(BackgroundWriter, self).__init__(parent)
+        self._executor = None
+
+    def start(self, write_function, *args):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='ArgonViewerWriter')
+        future = self._executor.submit(write_function, *args)
+        future.add_done_callback(self._write_done)
+
+    def close(self):
+        """
+        Wait for any pending write to finish and release the worker thread.
+        The writer can be started again afterwards.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _write_done(self, future):
+        try:
+            future.result()
+        except Exception as e:
+            self.finished.emit(False, str(e))
+            return
+        self.finished.emit(True, '')
@@ -0,0 +1,64 @@
+class LazyEditorRegistry(object):
+    """
+    Defers construction of the contents of dock widgets until the dock is first shown.
+    An editor is bound to the current document when it is created, and rebound on
+    document changes only once it exists.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._bound = False
+
+    def register(self, dock_widget, object_name, factory, bind=None):
+        """
+        Register the contents of dock_widget for lazy construction.
+
+        :param dock_widget: QDockWidget that will hold the editor.
+        :param object_name: Object name given to the editor when it is created.
+        :param factory: Callable taking the dock widget and returning the editor.
+        :param bind: Optional callable taking the editor, binds it to the current document.
+        """
+        self._entries[dock_widget] = {
+            'object_name': object_name,
+            'factory': factory,
+            'bind': bind,
+            'editor': None,
+        }
+        dock_widget.visibilityChanged.connect(lambda visible: self._visibility_changed(dock_widget, visible))
+        if dock_widget.isVisible():
+            self.ensureEditor(dock_widget)
+
+    def _visibility_changed(self, dock_widget, visible):
+        if visible:
+            self.ensureEditor(dock_widget)
+
+    def ensureEditor(self, dock_widget):
+        """
+        Get the editor for dock_widget, creating and binding it if necessary.
+        """
+        entry = self._entries[dock_widget]
+        if entry['editor'] is None:
+            editor = entry['factory'](dock_widget)
+            editor.setObjectName(entry['object_name'])
+            # Bind before adding to the dock, some editors need their document as soon as they are shown.
+            if self._bound and entry['bind'] is not None:
+                entry['bind'](editor)
+            dock_widget.setWidget(editor)
+            entry['editor'] = editor
+
+        return entry['editor']
+
+    def editor(self, dock_widget):
+        """
+        Get the editor for dock_widget, None if it has not been created yet.
+        """
+        return self._entries[dock_widget]['editor']
+
+    def bindAll(self):
+        """
+        Bind the created editors to the current document, the others are bound when they are created.
+        """
+        self._bound = True
+        for entry in self._entries.values():
+            if entry['editor'] is not None and entry['bind'] is not None:
+                entry['bind'](entry['editor'])
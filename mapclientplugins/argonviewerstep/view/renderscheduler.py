@@ -0,0 +1,83 @@
+"""
+Scheduling of the repaints Zinc requests for sceneviewer widgets.
+
+Zinc asks a sceneviewer to repaint for every change to its scene or to the time, and
+BaseSceneviewerWidget repaints for each request even when it cannot be seen.  Here the requests
+are collected and the widgets repainted at most once per frame interval, and only while they
+can be seen: widgets in views that are not current, in a hidden step or in a minimised window
+are left until they are shown again.
+"""
+import time
+
+from PySide6 import QtCore
+
+from cmlibs.zinc.sceneviewer import Sceneviewerevent
+
+# Milliseconds between repaints of a sceneviewer, about 60 frames per second.
+RENDER_FRAME_INTERVAL = 16
+
+
+def _is_showing(widget):
+    return widget.isVisible() and not widget.window().isMinimized()
+
+
+class RenderScheduler(QtCore.QObject):
+    """
+    Repaints the sceneviewer widgets added to it when Zinc requests, at most once per frame interval
+    and only while they are showing.
+    """
+
+    def __init__(self, parent=None):
+        super(RenderScheduler, self).__init__(parent)
+        self._pending = set()
+        self._notifiers = {}
+        self._last_flush = 0.0
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._flush)
+
+    def addSceneviewerWidget(self, sceneviewer_widget):
+        """
+        Schedule the repaints Zinc requests for a sceneviewer widget, once its graphics are initialised.
+        """
+        notifier = sceneviewer_widget.get_zinc_sceneviewer().createSceneviewernotifier()
+        notifier.setCallback(lambda event, w=sceneviewer_widget: self._sceneviewer_event(event, w))
+        self._notifiers[sceneviewer_widget] = notifier
+        # BaseSceneviewerWidget has no public way to stop it repainting itself for every request. Where its
+        # notifier can be found it is silenced, otherwise the widget also repaints itself, as it would without this.
+        widget_notifier = getattr(sceneviewer_widget, '_sceneviewer_notifier', None)
+        if widget_notifier is not None:
+            widget_notifier.clearCallback()
+        sceneviewer_widget.destroyed.connect(lambda _=None, w=sceneviewer_widget: self._widget_destroyed(w))
+        sceneviewer_widget.installEventFilter(self)
+        sceneviewer_widget.window().installEventFilter(self)
+
+    def _widget_destroyed(self, sceneviewer_widget):
+        self._pending.discard(sceneviewer_widget)
+        notifier = self._notifiers.pop(sceneviewer_widget, None)
+        if notifier is not None:
+            notifier.clearCallback()
+
+    def _sceneviewer_event(self, event, sceneviewer_widget):
+        if event.getChangeFlags() & Sceneviewerevent.CHANGE_FLAG_REPAINT_REQUIRED:
+            self._pending.add(sceneviewer_widget)
+            self._schedule()
+
+    def _schedule(self):
+        if not self._timer.isActive():
+            elapsed = (time.perf_counter() - self._last_flush) * 1000
+            self._timer.start(max(0, int(RENDER_FRAME_INTERVAL - elapsed)))
+
+    def _flush(self):
+        self._last_flush = time.perf_counter()
+        for sceneviewer_widget in list(self._pending):
+            # Widgets that are not showing keep their request until they are shown.
+            if _is_showing(sceneviewer_widget):
+                self._pending.discard(sceneviewer_widget)
+                sceneviewer_widget.update()
+
+    def eventFilter(self, watched, event):
+        # A widget that is shown again, or a window that is restored, repaints what it missed.
+        if event.type() in (QtCore.QEvent.Type.Show, QtCore.QEvent.Type.WindowStateChange) and self._pending:
+            self._schedule()
+        return False
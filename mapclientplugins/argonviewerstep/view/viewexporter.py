@@ -0,0 +1,196 @@
+"""
+Offscreen rendering of the views of an Argon document to PNG images, without showing any widgets.
+
+Every sceneviewer in every view is rendered in turn by a single Zinc sceneviewer into a single
+offscreen OpenGL framebuffer, so the cost of creating a context and buffer is only paid once
+however many views and times are exported.
+"""
+import os
+import re
+
+from PySide6 import QtGui, QtOpenGL
+
+from cmlibs.zinc.sceneviewer import Sceneviewer
+
+EXPORT_IMAGE_FORMAT = 'PNG'
+EXPORT_IMAGE_EXTENSION = '.png'
+
+
+def export_times(timekeeper, count):
+    """
+    Get count times spread evenly over the range of timekeeper, including its minimum and maximum.
+    """
+    minimum_time = timekeeper.getMinimumTime()
+    maximum_time = timekeeper.getMaximumTime()
+    if count == 1:
+        return [minimum_time]
+
+    return [minimum_time + (maximum_time - minimum_time) * i / (count - 1) for i in range(count)]
+
+
+def image_file_name(view_name, row, col, time_index=None):
+    """
+    Get the name of the image file of the sceneviewer at row, col in the view named view_name.
+    """
+    name = re.sub(r'[^\w\-.]+', '_', view_name or 'view').strip('_') or 'view'
+    name += f'-r{row}c{col}'
+    if time_index is not None:
+        name += f'-t{time_index:04d}'
+    return name + EXPORT_IMAGE_EXTENSION
+
+
+class ViewExporter(object):
+    """
+    Renders Argon sceneviewers offscreen at a fixed resolution.
+    Requires a QGuiApplication, but no windows.
+    """
+
+    def __init__(self, zinc_context, width, height):
+        """
+        :param zinc_context: Zinc context of the document the views are in.
+        :param width: Width of the images in pixels.
+        :param height: Height of the images in pixels.
+        """
+        self._zinc_context = zinc_context
+        self._width = width
+        self._height = height
+        self._surface = QtGui.QOffscreenSurface()
+        self._surface.create()
+        self._gl_context = QtGui.QOpenGLContext()
+        self._framebuffer = None
+        self._sceneviewer = None
+        self._error_message = None
+        if not self._surface.isValid():
+            self._error_message = 'Failed to create an offscreen surface to render the views on.'
+            return
+
+        if not self._gl_context.create():
+            self._surface.destroy()
+            self._error_message = 'Failed to create an OpenGL context to render the views with, OpenGL may not be available.'
+            return
+
+        if not self._gl_context.makeCurrent(self._surface):
+            self._surface.destroy()
+            self._error_message = 'Failed to make the OpenGL context current on the offscreen surface.'
+            return
+
+        framebuffer_format = QtOpenGL.QOpenGLFramebufferObjectFormat()
+        framebuffer_format.setAttachment(QtOpenGL.QOpenGLFramebufferObject.Attachment.CombinedDepthStencil)
+        framebuffer = QtOpenGL.QOpenGLFramebufferObject(width, height, framebuffer_format)
+        if not framebuffer.isValid():
+            self._gl_context.doneCurrent()
+            self._surface.destroy()
+            self._error_message = f'Failed to create a {width} x {height} OpenGL framebuffer to render the views into.'
+            return
+
+        self._framebuffer = framebuffer
+        sceneviewer_module = zinc_context.getSceneviewermodule()
+        # Only ever renders into the bound framebuffer, which has no back buffer to swap.
+        self._sceneviewer = sceneviewer_module.createSceneviewer(Sceneviewer.BUFFERING_MODE_SINGLE, Sceneviewer.STEREO_MODE_DEFAULT)
+        self._sceneviewer.setScenefilter(zinc_context.getScenefiltermodule().getDefaultScenefilter())
+        self._sceneviewer.setViewportSize(width, height)
+
+    def isValid(self):
+        """
+        Check an OpenGL context and framebuffer could be created to render into.
+        """
+        return self._framebuffer is not None
+
+    def getErrorMessage(self):
+        """
+        Get why the exporter is not valid, None if it is valid.
+        """
+        return self._error_message
+
+    def renderSceneviewer(self, argon_sceneviewer):
+        """
+        Render the scene of an Argon sceneviewer as it would appear in a view.
+
+        :param argon_sceneviewer: ArgonSceneviewer of a cell of a view.
+        :return: QImage of the rendered scene.
+        """
+        self._gl_context.makeCurrent(self._surface)
+        # Argon sceneviewers without a scene show the root region.
+        self._sceneviewer.setScene(self._zinc_context.getDefaultRegion().getScene())
+        argon_sceneviewer.applyParameters(self._sceneviewer)
+        self._framebuffer.bind()
+        self._sceneviewer.renderScene()
+        self._framebuffer.release()
+        return self._framebuffer.toImage()
+
+    def exportViews(self, views, directory, times=None, set_time=None):
+        """
+        Write an image of every sceneviewer of views to directory, at each of times if given.
+        All the views are rendered at one time before moving to the next time, so each time is only set once.
+
+        :param views: List of ArgonView.
+        :param directory: Directory to write the images to, created if it does not exist.
+        :param times: List of times to render the views at, None to render them at the current time.
+        :param set_time: Function taking a time, called to set the time of the document before rendering at it.
+        :return: List of the image file names written.
+        """
+        os.makedirs(directory, exist_ok=True)
+        file_names = []
+        for time_index, time in enumerate(times if times is not None else [None]):
+            if time is not None:
+                set_time(time)
+            for view in views:
+                for scene in view.getScenes():
+                    argon_sceneviewer = scene.get("Sceneviewer")
+                    if argon_sceneviewer is None:
+                        continue
+
+                    image = self.renderSceneviewer(argon_sceneviewer)
+                    file_name = os.path.join(directory, image_file_name(view.getName(), scene["Row"], scene["Col"],
+                                                                        None if time is None else time_index))
+                    if not image.save(file_name, EXPORT_IMAGE_FORMAT):
+                        raise OSError(f"Failed to write image '{file_name}'.")
+                    file_names.append(file_name)
+
+        return file_names
+
+    def close(self):
+        """
+        Release the sceneviewer, framebuffer and OpenGL context.
+        """
+        if self._gl_context.makeCurrent(self._surface):
+            self._sceneviewer = None
+            self._framebuffer = None
+            self._gl_context.doneCurrent()
+        self._surface.destroy()
+
+
+def export_document_views(model, directory, width, height, time_count=0):
+    """
+    Write images of every view of the model's document to directory, without showing them.
+
+    :param model: ArgonViewerModel with a loaded document.
+    :param directory: Directory to write the images to.
+    :param width: Width of the images in pixels.
+    :param height: Height of the images in pixels.
+    :param time_count: Number of times to render the views at, spread over the time range of the document,
+        zero to render them at the current time only.
+    :return: List of the image file names written.
+    """
+    document = model.getDocument()
+    zinc_context = document.getZincContext()
+    views = document.getViewManager().getViews()
+    if not views:
+        return []
+
+    exporter = ViewExporter(zinc_context, width, height)
+    try:
+        if not exporter.isValid():
+            raise OSError(exporter.getErrorMessage())
+
+        if time_count == 0:
+            return exporter.exportViews(views, directory)
+
+        timekeeper = zinc_context.getTimekeepermodule().getDefaultTimekeeper()
+        current_time = timekeeper.getTime()
+        try:
+            return exporter.exportViews(views, directory, export_times(timekeeper, time_count), model.setTime)
+        finally:
+            model.setTime(current_time)
+    finally:
+        exporter.close()
@@ -0,0 +1,153 @@
+import time
+
+from PySide6 import QtCore, QtWidgets
+
+from cmlibs.widgets.viewwidget import ViewWidget
+from cmlibs.zinc.sceneviewer import Sceneviewerevent
+
+
+class ViewTab(QtWidgets.QWidget):
+    """
+    Tab page for an Argon view.  The ViewWidget, with its grid of sceneviewers, is only
+    created when the tab is realised and can be released again to free its graphics resources.
+    The sceneviewer states are kept in the Argon view while the tab is not realised.
+
+    Changes to the realised sceneviewers are tracked as they happen so only the
+    sceneviewers that changed need to be read back into the Argon view.
+    The time from a sceneviewer being moved until the frame showing it is drawn is measured,
+    to check it against the frame time target of the view.
+    """
+
+    currentChanged = QtCore.Signal()
+    # Emitted when a sceneviewer is moved, zoomed or rotated.
+    interacted = QtCore.Signal()
+    # Emitted with the seconds taken to draw a frame after a sceneviewer moved.
+    frameRendered = QtCore.Signal(float)
+
+    def __init__(self, view, zinc_context, render_scheduler=None, parent=None):
+        """
+        :param render_scheduler: RenderScheduler repainting the sceneviewers, if given, otherwise they repaint themselves.
+        """
+        super(ViewTab, self).__init__(parent)
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self._view = view
+        self._zinc_context = zinc_context
+        self._render_scheduler = render_scheduler
+        self._view_widget = None
+        self._last_shown = None
+        self._sceneviewer_notifiers = []
+        self._dirty_cells = set()
+        self._frame_time_target = 0.0
+        self._transformed_at = None
+
+    def getArgonView(self):
+        return self._view
+
+    def getViewWidget(self):
+        """
+        Get the ViewWidget for this tab, None if the tab is not realised.
+        """
+        return self._view_widget
+
+    def setFrameTimeTarget(self, target):
+        """
+        Set the seconds a frame should take to draw while the view is interacted with, zero for no target.
+        """
+        self._frame_time_target = target
+
+    def getFrameTimeTarget(self):
+        return self._frame_time_target
+
+    def isRealised(self):
+        return self._view_widget is not None
+
+    def realise(self):
+        """
+        Create the ViewWidget and its sceneviewers if they do not exist.
+        """
+        if self._view_widget is None:
+            self._view_widget = ViewWidget(self._view.getScenes(), self._view.getGridSpecification(), self)
+            self._view_widget.currentChanged.connect(self.currentChanged)
+            self._view_widget.setContext(self._zinc_context)
+            layout = self._view_widget.layout()
+            for scene in self._view.getScenes():
+                row = scene["Row"]
+                col = scene["Col"]
+                sceneviewer_widget = layout.itemAtPosition(row, col).widget()
+                sceneviewer_widget.graphics_initialized.connect(
+                    lambda w=sceneviewer_widget, r=row, c=col: self._track_sceneviewer_changes(w, r, c))
+            self.layout().addWidget(self._view_widget)
+        self._last_shown = time.monotonic()
+
+    def release(self):
+        """
+        Store the sceneviewer states in the Argon view and destroy the ViewWidget.
+        """
+        if self._view_widget is not None:
+            self.updateArgonView()
+            for notifier in self._sceneviewer_notifiers:
+                notifier.clearCallback()
+            self._sceneviewer_notifiers = []
+            self._transformed_at = None
+            self.layout().removeWidget(self._view_widget)
+            self._view_widget.deleteLater()
+            self._view_widget = None
+
+    def hiddenFor(self):
+        """
+        Get the number of seconds since this tab was last current, None if it has never been realised.
+        """
+        if self._last_shown is None:
+            return None
+        return time.monotonic() - self._last_shown
+
+    def markShown(self):
+        self._last_shown = time.monotonic()
+
+    def _track_sceneviewer_changes(self, sceneviewer_widget, row, col):
+        """
+        Start tracking changes once the sceneviewer exists, this is after ViewWidget has
+        applied the initial state so that is not recorded as a change.
+        """
+        if self._render_scheduler is not None:
+            self._render_scheduler.addSceneviewerWidget(sceneviewer_widget)
+        notifier = sceneviewer_widget.get_zinc_sceneviewer().createSceneviewernotifier()
+        notifier.setCallback(lambda event: self._sceneviewer_changed(event, row, col))
+        self._sceneviewer_notifiers.append(notifier)
+        sceneviewer_widget.frameSwapped.connect(self._frame_swapped)
+
+    def _sceneviewer_changed(self, event, row, col):
+        self._dirty_cells.add((row, col))
+        if event.getChangeFlags() & Sceneviewerevent.CHANGE_FLAG_TRANSFORM:
+            # Only the first change before a frame is drawn is timed from.
+            if self._transformed_at is None:
+                self._transformed_at = time.perf_counter()
+            self.interacted.emit()
+
+    def _frame_swapped(self):
+        if self._transformed_at is not None:
+            frame_time = time.perf_counter() - self._transformed_at
+            self._transformed_at = None
+            self.frameRendered.emit(frame_time)
+
+    def isDirty(self):
+        return len(self._dirty_cells) > 0
+
+    def updateArgonView(self):
+        """
+        Copy the state of the sceneviewers that changed since the last update into the Argon view.
+        """
+        if self._view_widget is None:
+            return
+
+        for row, col in self._dirty_cells:
+            sceneviewer = self._view_widget.getSceneviewer(row, col)
+            if sceneviewer is not None:
+                self._view.updateSceneviewer(row, col, sceneviewer)
+        self._dirty_cells.clear()
+
+    def getActiveSceneviewer(self):
+        if self._view_widget is None:
+            return None
+        return self._view_widget.getActiveSceneviewer()
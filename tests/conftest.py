@@ -0,0 +1,87 @@
+import json
+import os
+
+import pytest
+
+from cmlibs.utils.zinc.field import create_field_coordinates
+from cmlibs.zinc.context import Context
+from cmlibs.zinc.element import Element, Elementbasis
+from cmlibs.zinc.field import Field
+from cmlibs.zinc.node import Node
+from cmlibs.zinc.result import RESULT_OK
+
+
+def define_cube_mesh(region, elements_count, offset=0.0):
+    """
+    Define a trilinear cube mesh with elements_count elements along each axis in region.
+    """
+    fieldmodule = region.getFieldmodule()
+    fieldmodule.beginChange()
+    coordinates = create_field_coordinates(fieldmodule)
+    nodes = fieldmodule.findNodesetByFieldDomainType(Field.DOMAIN_TYPE_NODES)
+    node_template = nodes.createNodetemplate()
+    node_template.defineField(coordinates)
+    fieldcache = fieldmodule.createFieldcache()
+    nodes_count = elements_count + 1
+    node_identifier = 1
+    for k in range(nodes_count):
+        for j in range(nodes_count):
+            for i in range(nodes_count):
+                node = nodes.createNode(node_identifier, node_template)
+                fieldcache.setNode(node)
+                coordinates.setNodeParameters(fieldcache, -1, Node.VALUE_LABEL_VALUE, 1,
+                                              [offset + i / elements_count, j / elements_count, k / elements_count])
+                node_identifier += 1
+
+    mesh = fieldmodule.findMeshByDimension(3)
+    basis = fieldmodule.createElementbasis(3, Elementbasis.FUNCTION_TYPE_LINEAR_LAGRANGE)
+    eft = mesh.createElementfieldtemplate(basis)
+    element_template = mesh.createElementtemplate()
+    element_template.setElementShapeType(Element.SHAPE_TYPE_CUBE)
+    element_template.defineField(coordinates, -1, eft)
+    element_identifier = 1
+    for k in range(elements_count):
+        for j in range(elements_count):
+            for i in range(elements_count):
+                base = 1 + i + j * nodes_count + k * nodes_count * nodes_count
+                node_identifiers = [base, base + 1, base + nodes_count, base + nodes_count + 1]
+                node_identifiers += [n + nodes_count * nodes_count for n in node_identifiers]
+                element = mesh.createElement(element_identifier, element_template)
+                element.setNodesByIdentifier(eft, node_identifiers)
+                element_identifier += 1
+
+    fieldmodule.endChange()
+
+
+def write_argon_file(directory, name, views=(), mtime=None):
+    """
+    Write a minimal Argon document with the named views, optionally with a modification time in seconds.
+
+    :return: Contents written to the document.
+    """
+    content = json.dumps({'CMLibs Argon Version': [0, 4, 0], 'RootRegion': {},
+                          'Views': {'Children': [{'Name': view} for view in views]}}, sort_keys=True)
+    filename = os.path.join(directory, name)
+    with open(filename, 'w') as f:
+        f.write(content)
+    if mtime is not None:
+        os.utime(filename, (mtime, mtime))
+    return content
+
+
+@pytest.fixture
+def write_cube_ex_file(tmp_path):
+    """
+    Factory writing a cube mesh EX file under tmp_path, taking the relative file name,
+    the number of elements along each axis and an x offset, returning the full file name.
+    """
+    def _write(name, elements_count=1, offset=0.0):
+        filename = os.path.join(str(tmp_path), name)
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        context = Context('test')
+        region = context.getDefaultRegion()
+        define_cube_mesh(region, elements_count, offset)
+        assert region.writeFile(filename) == RESULT_OK
+        return filename
+
+    return _write
@@ -0,0 +1,65 @@
+import os
+
+from mapclientplugins.argonviewerstep.model.documentcache import DocumentCache, make_key, sources_fingerprint
+
+SETTINGS = (True, 'root', False, 0, 'none')
+
+
+def _write(filename, content, mtime):
+    with open(filename, 'w') as f:
+        f.write(content)
+    os.utime(filename, (mtime, mtime))
+    return filename
+
+
+def test_make_key(tmp_path):
+    source = _write(str(tmp_path / 'cube.exf'), 'nodes', 1000)
+    document = _write(str(tmp_path / 'document.argon'), '{}', 1000)
+    key = make_key([source], document, SETTINGS)
+    assert make_key([source], document, SETTINGS) == key
+    assert make_key([source], document, (False,) + SETTINGS[1:]) != key
+
+    _write(source, 'nodes', 2000)
+    assert make_key([source], document, SETTINGS) != key
+    _write(source, 'nodes', 1000)
+    assert make_key([source], document, SETTINGS) == key
+
+    _write(document, '{"changed": 1}', 1000)
+    assert make_key([source], document, SETTINGS) != key
+    assert make_key([], str(tmp_path / 'missing.argon'), SETTINGS) == ((), None, SETTINGS)
+
+
+def test_take_and_reloadable(tmp_path):
+    source = _write(str(tmp_path / 'cube.exf'), 'nodes', 1000)
+    document = str(tmp_path / 'document.argon')
+    cache = DocumentCache(100)
+    key = make_key([source], document, SETTINGS)
+    cache.put(key, 'model', 10)
+    assert len(cache) == 1
+    assert cache.take(key) == 'model'
+    assert cache.take(key) is None
+
+    cache.put(key, 'model', 10)
+    _write(source, 'more nodes', 2000)
+    changed_key = make_key([source], document, SETTINGS)
+    assert cache.take(changed_key) is None
+    assert cache.takeReloadable(make_key([source], document, (False,) + SETTINGS[1:])) is None
+    assert cache.takeReloadable(changed_key) == 'model'
+    assert len(cache) == 0
+
+
+def test_eviction_and_retain(tmp_path):
+    sources = [_write(str(tmp_path / f'cube{index}.exf'), 'nodes', 1000) for index in range(3)]
+    document = str(tmp_path / 'document.argon')
+    cache = DocumentCache(100)
+    keys = [make_key([source], document, SETTINGS) for source in sources]
+    cache.put(keys[0], 'model0', 60)
+    cache.put(keys[1], 'model1', 60)
+    assert cache.take(keys[0]) is None
+    cache.put(keys[2], 'model2', 200)
+    assert len(cache) == 1
+
+    cache.put(keys[2], 'model2', 30)
+    cache.retainSources(sources_fingerprint([sources[2]]))
+    assert cache.take(keys[1]) is None
+    assert cache.take(keys[2]) == 'model2'
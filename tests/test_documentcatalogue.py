@@ -0,0 +1,51 @@
+import os
+
+from mapclientplugins.argonviewerstep.model.documentcatalogue import content_hash, DocumentCatalogue
+
+from conftest import write_argon_file as _write_document
+
+_SUMMARY = {'views': [], 'regions': []}
+
+
+def test_reconcile_changes_made_elsewhere(tmp_path):
+    directory = str(tmp_path)
+    _write_document(directory, 'a.argon')
+    catalogue = DocumentCatalogue(directory)
+    assert catalogue.documents() == ['a.argon']
+
+    _write_document(directory, 'b.argon', ['View 1'])
+    with open(os.path.join(directory, 'notes.txt'), 'w') as f:
+        f.write('not a document')
+    assert DocumentCatalogue(directory).entry('b.argon')['views'] == ['View 1']
+    assert DocumentCatalogue(directory).entry('notes.txt') is None
+
+
+def test_update_picks_up_other_changes(tmp_path):
+    directory = str(tmp_path)
+    catalogue = DocumentCatalogue(directory)
+    content = _write_document(directory, 'a.argon')
+    catalogue.update('a.argon', content_hash(content), _SUMMARY)
+    assert catalogue.entry('a.argon')['hash'] == content_hash(content)
+
+    # Changed by something else, then by the catalogue's owner before the catalogue is next read.
+    _write_document(directory, 'b.argon')
+    content = _write_document(directory, 'c.argon')
+    catalogue.update('c.argon', content_hash(content), _SUMMARY)
+    assert catalogue.documents() == ['a.argon', 'b.argon', 'c.argon']
+    assert DocumentCatalogue(directory).documents() == ['a.argon', 'b.argon', 'c.argon']
+
+
+def test_rename_and_remove(tmp_path):
+    directory = str(tmp_path)
+    _write_document(directory, 'a.argon')
+    _write_document(directory, 'b.argon')
+    catalogue = DocumentCatalogue(directory)
+    assert catalogue.documents() == ['a.argon', 'b.argon']
+
+    os.rename(os.path.join(directory, 'a.argon'), os.path.join(directory, 'renamed.argon'))
+    catalogue.rename('a.argon', 'renamed.argon')
+    os.remove(os.path.join(directory, 'b.argon'))
+    _write_document(directory, 'd.argon')
+    catalogue.remove('b.argon')
+    assert catalogue.documents() == ['d.argon', 'renamed.argon']
+    assert DocumentCatalogue(directory).documents() == ['d.argon', 'renamed.argon']
@@ -0,0 +1,78 @@
+import os
+
+from mapclientplugins.argonviewerstep.model.documentcatalogue import DocumentCatalogue
+from mapclientplugins.argonviewerstep.model.documentretention import apply_retention, STALE_TEMPORARY_FILE_AGE
+from mapclientplugins.argonviewerstep.model.documentwriter import TEMPORARY_FILE_PREFIX, TEMPORARY_FILE_SUFFIX
+
+from conftest import write_argon_file
+
+NOW = 1000000000.0
+DAY = 24 * 60 * 60
+
+
+def _write_documents(directory, count):
+    # Distinct contents, each a day older than the next.
+    for index in range(count):
+        write_argon_file(directory, f'doc{index}.argon', [f'View {index}'], NOW - (count - index) * DAY)
+
+
+def test_no_limits_keeps_everything(tmp_path):
+    directory = str(tmp_path)
+    _write_documents(directory, 3)
+    catalogue = DocumentCatalogue(directory)
+    assert apply_retention(catalogue, now=NOW) == []
+    assert catalogue.documents() == ['doc0.argon', 'doc1.argon', 'doc2.argon']
+
+
+def test_max_count_removes_oldest(tmp_path):
+    directory = str(tmp_path)
+    _write_documents(directory, 4)
+    catalogue = DocumentCatalogue(directory)
+    assert apply_retention(catalogue, max_count=2, now=NOW) == ['doc0.argon', 'doc1.argon']
+    assert catalogue.documents() == ['doc2.argon', 'doc3.argon']
+    assert sorted(os.listdir(directory)) == ['.catalogue.json', 'doc2.argon', 'doc3.argon']
+
+
+def test_referenced_documents_are_kept(tmp_path):
+    directory = str(tmp_path)
+    _write_documents(directory, 4)
+    catalogue = DocumentCatalogue(directory)
+    assert apply_retention(catalogue, referenced=['doc0.argon'], max_count=2, now=NOW) == ['doc1.argon', 'doc2.argon']
+    assert catalogue.documents() == ['doc0.argon', 'doc3.argon']
+
+
+def test_max_age(tmp_path):
+    directory = str(tmp_path)
+    _write_documents(directory, 4)
+    catalogue = DocumentCatalogue(directory)
+    assert apply_retention(catalogue, max_age=2.5 * DAY, now=NOW) == ['doc0.argon', 'doc1.argon']
+
+
+def test_max_size(tmp_path):
+    directory = str(tmp_path)
+    _write_documents(directory, 3)
+    catalogue = DocumentCatalogue(directory)
+    size = catalogue.entry('doc2.argon')['size']
+    assert apply_retention(catalogue, max_size=2 * size, now=NOW) == ['doc0.argon']
+
+
+def test_deduplicate_keeps_newest_or_referenced(tmp_path):
+    directory = str(tmp_path)
+    for index in range(3):
+        write_argon_file(directory, f'same{index}.argon', ['View'], NOW - (3 - index) * DAY)
+    catalogue = DocumentCatalogue(directory)
+    assert sorted(apply_retention(catalogue, referenced=['same0.argon'], now=NOW)) == ['same1.argon', 'same2.argon']
+    assert catalogue.documents() == ['same0.argon']
+
+
+def test_stale_temporary_files_are_removed(tmp_path):
+    directory = str(tmp_path)
+    stale = os.path.join(directory, TEMPORARY_FILE_PREFIX + 'stale' + TEMPORARY_FILE_SUFFIX)
+    recent = os.path.join(directory, TEMPORARY_FILE_PREFIX + 'recent' + TEMPORARY_FILE_SUFFIX)
+    for filename, mtime in ((stale, NOW - 2 * STALE_TEMPORARY_FILE_AGE), (recent, NOW)):
+        with open(filename, 'w') as f:
+            f.write('partial')
+        os.utime(filename, (mtime, mtime))
+
+    assert apply_retention(DocumentCatalogue(directory), now=NOW) == [os.path.basename(stale)]
+    assert os.path.exists(recent)
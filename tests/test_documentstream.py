@@ -0,0 +1,69 @@
+import json
+import os
+
+from cmlibs.argon.argondocument import ArgonDocument
+from cmlibs.argon.argonmodelsources import ArgonModelSourceFile
+
+from mapclientplugins.argonviewerstep.model.documentcatalogue import content_hash
+from mapclientplugins.argonviewerstep.model.documentstream import document_state, read_document, read_document_state, \
+    write_document_state
+
+
+def _new_document():
+    document = ArgonDocument()
+    document.initialiseVisualisationContents()
+    return document
+
+
+def _create_document(regions_count):
+    document = _new_document()
+    root_region = document.getRootRegion()
+    for index in range(regions_count):
+        region = root_region.createChild()
+        region.setName(f'region{index + 1}')
+        scene = region.getZincRegion().getScene()
+        scene.createGraphicsLines().setName('lines')
+        scene.createGraphicsSurfaces().setName('surfaces')
+    document.getViewManager().deserialize({'ActiveView': 'view1', 'Children': [
+        {'Name': 'view1', 'Scenes': [{'Row': 0, 'Col': 0, 'Sceneviewer': {'Scene': '/'}}]}]})
+    return document
+
+
+def test_write_matches_serialize(tmp_path):
+    document = _create_document(3)
+    filename = str(tmp_path / 'document.argon')
+    hash_value = write_document_state(filename, document_state(document))
+    with open(filename) as f:
+        content = f.read()
+    assert content == document.serialize()
+    assert hash_value == content_hash(content)
+
+
+def test_round_trip(tmp_path):
+    document = _create_document(5)
+    filename = str(tmp_path / 'document.argon')
+    write_document_state(filename, document_state(document))
+    expected = _new_document()
+    with open(filename) as f:
+        expected.deserialize(f.read())
+    for chunk_size in (7, 1024 * 1024):
+        read_back = _new_document()
+        read_document(read_back, filename, chunk_size=chunk_size)
+        assert json.loads(read_back.serialize()) == json.loads(expected.serialize())
+        assert read_back.getRootRegion().getChildCount() == 5
+
+
+def test_model_sources_resolved_against_document(tmp_path, write_cube_ex_file):
+    source = write_cube_ex_file('data/cube.exf')
+    document = _new_document()
+    region = document.getRootRegion().createChild()
+    region.setName('cube')
+    region.addModelSource(ArgonModelSourceFile(source))
+    filename = str(tmp_path / 'document.argon')
+    write_document_state(filename, document_state(document, base_path=str(tmp_path)))
+    with open(filename) as f:
+        assert '"data/cube.exf"' in f.read()
+
+    sections = read_document_state(filename)
+    file_name = sections['RootRegion']['ChildRegions'][0]['Model']['Sources'][0]['FileName']
+    assert file_name == os.path.normpath(source)
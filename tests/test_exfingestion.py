@@ -0,0 +1,50 @@
+from cmlibs.argon.argondocument import ArgonDocument
+from cmlibs.zinc.field import Field
+
+from mapclientplugins.argonviewerstep.model.exfingestion import clear_exf_regions, exf_region_names, ingest_exf_files, \
+    region_name_for_file, EXF_INGESTION_CHILD_REGIONS
+
+
+def _new_document():
+    document = ArgonDocument()
+    document.initialiseVisualisationContents()
+    return document
+
+
+def _nodes_count(region):
+    fieldmodule = region.getZincRegion().getFieldmodule()
+    return fieldmodule.findNodesetByFieldDomainType(Field.DOMAIN_TYPE_NODES).getSize()
+
+
+def test_region_name_for_file():
+    assert region_name_for_file('/data/heart.exf') == 'heart'
+    assert region_name_for_file('/data/heart.EXNODE') == 'heart'
+    assert region_name_for_file('/data/notes') == 'notes'
+
+
+def test_exf_region_names_unique():
+    region_names = exf_region_names(['a.exf', 'sub/a.exf', 'a2.exf', 'other/sub/a.ex', 'a.exf'])
+    assert region_names == {'a.exf': 'a', 'sub/a.exf': 'a2', 'a2.exf': 'a22', 'other/sub/a.ex': 'a3'}
+
+
+def test_ingest_same_base_name(write_cube_ex_file):
+    first = write_cube_ex_file('a.exf', 1)
+    second = write_cube_ex_file('sub/a.exf', 2)
+    document = _new_document()
+    root_region = document.getRootRegion()
+    filenames = [first, second]
+    region_names = exf_region_names(filenames)
+
+    assert ingest_exf_files(root_region, filenames, EXF_INGESTION_CHILD_REGIONS, region_names=region_names) == filenames
+    regions = {root_region.getChild(index).getName(): root_region.getChild(index) for index in range(root_region.getChildCount())}
+    assert sorted(regions) == ['a', 'a2']
+    assert _nodes_count(regions['a']) == 8
+    assert _nodes_count(regions['a2']) == 27
+
+    clear_exf_regions(root_region, [second], region_names)
+    assert _nodes_count(regions['a']) == 8
+    assert _nodes_count(regions['a2']) == 0
+
+    assert ingest_exf_files(root_region, [second], EXF_INGESTION_CHILD_REGIONS, region_names=region_names) == [second]
+    assert root_region.getChildCount() == 2
+    assert _nodes_count(regions['a2']) == 27
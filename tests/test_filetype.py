@@ -0,0 +1,65 @@
+import json
+
+import pytest
+
+from mapclientplugins.argonviewerstep.model.filetype import detect_file_type, sniff_file_type, FILE_TYPE_AMBIGUOUS, \
+    FILE_TYPE_ARGON, FILE_TYPE_EXF, FILE_TYPE_UNKNOWN
+
+_OLD_EXNODE = """ Group name: cube
+ #Fields=1
+ 1) coordinates, coordinate, rectangular cartesian, #Components=1
+   x.  Value index= 1, #Derivatives= 0
+ Node:            1
+   0.0
+"""
+
+_NOTES = """Meeting notes
+Region: Europe
+Group name: modelling
+Node: 3 needs checking
+Element: the mesh is too coarse
+Shape. still to decide
+"""
+
+
+@pytest.fixture
+def write_text_file(tmp_path):
+    def _write(name, content):
+        filename = tmp_path / name
+        if isinstance(content, bytes):
+            filename.write_bytes(content)
+        else:
+            filename.write_text(content)
+        return str(filename)
+
+    return _write
+
+
+def test_ex_file(write_cube_ex_file):
+    filename = write_cube_ex_file('cube.exf')
+    assert sniff_file_type(filename) == FILE_TYPE_EXF
+    assert detect_file_type(filename) == FILE_TYPE_EXF
+
+
+def test_ex_file_without_signature(write_text_file):
+    filename = write_text_file('cube.exnode', _OLD_EXNODE)
+    assert sniff_file_type(filename) == FILE_TYPE_EXF
+
+
+def test_notes_are_not_ex(write_text_file):
+    filename = write_text_file('notes.txt', _NOTES)
+    assert sniff_file_type(filename) == FILE_TYPE_AMBIGUOUS
+    assert detect_file_type(filename) == FILE_TYPE_UNKNOWN
+
+
+def test_argon_document(write_text_file):
+    filename = write_text_file('document.argon', json.dumps({'CMLibs Argon Version': [0, 4, 0], 'RootRegion': {}}, sort_keys=True))
+    assert sniff_file_type(filename) == FILE_TYPE_ARGON
+    assert detect_file_type(filename) == FILE_TYPE_ARGON
+
+
+def test_other_files(tmp_path, write_text_file):
+    assert detect_file_type(write_text_file('data.json', '{"values": [1, 2]}')) == FILE_TYPE_UNKNOWN
+    assert detect_file_type(write_text_file('image.png', b'\x89PNG\r\n\x1a\n\0\0')) == FILE_TYPE_UNKNOWN
+    assert detect_file_type(write_text_file('empty.txt', '')) == FILE_TYPE_UNKNOWN
+    assert detect_file_type(str(tmp_path / 'missing.exf')) == FILE_TYPE_UNKNOWN
@@ -0,0 +1,41 @@
+from cmlibs.argon.argondocument import ArgonDocument
+
+from mapclientplugins.argonviewerstep.model.levelofdetail import TessellationLevelOfDetail, TESSELLATION_DIMENSIONS
+
+
+def _settings(tessellation):
+    return (tessellation.getMinimumDivisions(TESSELLATION_DIMENSIONS)[1], tessellation.getRefinementFactors(TESSELLATION_DIMENSIONS)[1],
+            tessellation.getCircleDivisions())
+
+
+def _document_tessellation():
+    document = ArgonDocument()
+    document.initialiseVisualisationContents()
+    tessellation = document.getZincContext().getTessellationmodule().getDefaultTessellation()
+    tessellation.setMinimumDivisions([8, 8, 8])
+    tessellation.setRefinementFactors([4])
+    tessellation.setCircleDivisions(48)
+    return document, tessellation
+
+
+def test_coarsen_and_refine():
+    document, tessellation = _document_tessellation()
+    refined_settings = _settings(tessellation)
+    level_of_detail = TessellationLevelOfDetail(document.getTessellations())
+    level_of_detail.coarsen()
+    assert level_of_detail.isCoarse()
+    assert _settings(tessellation) == ([2, 2, 2], [1, 1, 1], 12)
+
+    assert level_of_detail.refine()
+    assert not level_of_detail.isCoarse()
+    assert _settings(tessellation) == refined_settings
+    assert not level_of_detail.refine()
+
+
+def test_refine_keeps_changes_made_while_coarse():
+    document, tessellation = _document_tessellation()
+    level_of_detail = TessellationLevelOfDetail(document.getTessellations())
+    level_of_detail.coarsen()
+    tessellation.setMinimumDivisions([3, 5, 7])
+    level_of_detail.refine()
+    assert _settings(tessellation) == ([3, 5, 7], [4, 4, 4], 48)
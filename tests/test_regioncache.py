@@ -0,0 +1,98 @@
+import os
+
+from cmlibs.zinc.context import Context
+from cmlibs.zinc.field import Field
+from cmlibs.zinc.result import RESULT_OK
+
+from mapclientplugins.argonviewerstep.model.regioncache import RegionCache, convert_to_fieldml
+
+from conftest import define_cube_mesh
+
+
+def _nodes_count(zinc_region):
+    return zinc_region.getFieldmodule().findNodesetByFieldDomainType(Field.DOMAIN_TYPE_NODES).getSize()
+
+
+def _read_through_cache(region_cache, filename):
+    context = Context('test')
+    zinc_region = context.getDefaultRegion()
+    cached_location = region_cache.lookup(filename)
+    assert region_cache.read(zinc_region, filename, None, cached_location) == RESULT_OK
+    region_cache.flush()
+    return context, zinc_region, cached_location
+
+
+def test_read_through_cache(tmp_path, write_cube_ex_file):
+    filename = write_cube_ex_file('cube.exf', 2)
+    directory = str(tmp_path / 'cache')
+
+    _, zinc_region, cached_location = _read_through_cache(RegionCache(directory, 1024 * 1024), filename)
+    assert cached_location is None
+    assert _nodes_count(zinc_region) == 27
+
+    _, zinc_region, cached_location = _read_through_cache(RegionCache(directory, 1024 * 1024), filename)
+    assert cached_location is not None and cached_location.endswith('.fieldml')
+    assert _nodes_count(zinc_region) == 27
+
+
+def test_read_into_region_with_contents(tmp_path, write_cube_ex_file):
+    first = write_cube_ex_file('first.exf', 1)
+    second = write_cube_ex_file('second.exf', 2)
+    region_cache = RegionCache(str(tmp_path / 'cache'), 1024 * 1024)
+    context = Context('test')
+    zinc_region = context.getDefaultRegion()
+    assert region_cache.read(zinc_region, first, None) == RESULT_OK
+    assert region_cache.read(zinc_region, second, None) == RESULT_OK
+    assert _nodes_count(zinc_region) == 27
+    assert region_cache.lookup(first) is not None
+    assert region_cache.lookup(second) is not None
+
+
+def _ex_contents(define):
+    context = Context('test')
+    zinc_region = context.getDefaultRegion()
+    define(zinc_region)
+    stream_information = zinc_region.createStreaminformationRegion()
+    memory_resource = stream_information.createStreamresourceMemory()
+    assert zinc_region.write(stream_information) == RESULT_OK
+    return memory_resource.getBuffer()[1]
+
+
+def test_convert_refuses_lost_values(tmp_path):
+    def _define_node_field(zinc_region):
+        define_cube_mesh(zinc_region, 1)
+        fieldmodule = zinc_region.getFieldmodule()
+        pressure = fieldmodule.createFieldFiniteElement(1)
+        pressure.setName('pressure')
+        pressure.setManaged(True)
+        nodes = fieldmodule.findNodesetByFieldDomainType(Field.DOMAIN_TYPE_NODES)
+        node_template = nodes.createNodetemplate()
+        node_template.defineField(pressure)
+        fieldcache = fieldmodule.createFieldcache()
+        node_iterator = nodes.createNodeiterator()
+        node = node_iterator.next()
+        while node.isValid():
+            node.merge(node_template)
+            fieldcache.setNode(node)
+            pressure.assignReal(fieldcache, 0.5 * node.getIdentifier())
+            node = node_iterator.next()
+
+    location = str(tmp_path / 'pressure.fieldml')
+    # FieldML only keeps field values that are interpolated over elements.
+    assert not convert_to_fieldml(_ex_contents(_define_node_field), location)
+    assert not os.path.exists(location)
+
+
+def test_convert_refuses_child_regions(tmp_path):
+    def _define_child_region(zinc_region):
+        define_cube_mesh(zinc_region.createChild('child'), 1)
+
+    location = str(tmp_path / 'child.fieldml')
+    assert not convert_to_fieldml(_ex_contents(_define_child_region), location)
+    assert not os.path.exists(location)
+
+
+def test_convert(tmp_path):
+    location = str(tmp_path / 'cube.fieldml')
+    assert convert_to_fieldml(_ex_contents(lambda zinc_region: define_cube_mesh(zinc_region, 2)), location)
+    assert os.path.isfile(location)
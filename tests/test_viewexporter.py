@@ -0,0 +1,104 @@
+import os
+
+import pytest
+
+from PySide6 import QtGui
+
+from cmlibs.argon.argondocument import ArgonDocument
+from cmlibs.zinc.context import Context
+
+from mapclientplugins.argonviewerstep.view.viewexporter import ViewExporter, export_document_views, export_times, image_file_name
+
+from conftest import define_cube_mesh
+
+WIDTH = 64
+HEIGHT = 48
+
+
+class _DocumentModel(object):
+
+    def __init__(self, document):
+        self._document = document
+
+    def getDocument(self):
+        return self._document
+
+    def setTime(self, time):
+        self._document.getZincContext().getTimekeepermodule().getDefaultTimekeeper().setTime(time)
+
+
+@pytest.fixture(scope='module')
+def gui_application():
+    return QtGui.QGuiApplication.instance() or QtGui.QGuiApplication([])
+
+
+def _create_document():
+    document = ArgonDocument()
+    document.initialiseVisualisationContents()
+    region = document.getRootRegion().createChild()
+    region.setName('cube')
+    define_cube_mesh(region.getZincRegion(), 1)
+    region.getZincRegion().getScene().createGraphicsLines()
+    document.getViewManager().deserialize({'ActiveView': 'view 1', 'Children': [
+        {'Name': 'view 1', 'Scenes': [{'Row': 0, 'Col': 0, 'Sceneviewer': {'Scene': '/'}}]}]})
+    return document
+
+
+def test_export_times():
+    context = Context('test')
+    timekeeper = context.getTimekeepermodule().getDefaultTimekeeper()
+    timekeeper.setMinimumTime(1.0)
+    timekeeper.setMaximumTime(3.0)
+    assert export_times(timekeeper, 1) == [1.0]
+    assert export_times(timekeeper, 3) == [1.0, 2.0, 3.0]
+
+
+def test_image_file_name():
+    assert image_file_name('view 1', 0, 1) == 'view_1-r0c1.png'
+    assert image_file_name('', 1, 0, 5) == 'view-r1c0-t0005.png'
+    assert image_file_name('../left/right', 0, 0) == '.._left_right-r0c0.png'
+
+
+def test_invalid_exporter_reports_error(gui_application):
+    exporter = ViewExporter(Context('test'), WIDTH, HEIGHT)
+    try:
+        if exporter.isValid():
+            assert exporter.getErrorMessage() is None
+        else:
+            assert exporter.getErrorMessage()
+    finally:
+        exporter.close()
+
+
+def test_export_without_opengl_raises(gui_application, tmp_path):
+    document = _create_document()
+    exporter = ViewExporter(document.getZincContext(), WIDTH, HEIGHT)
+    valid = exporter.isValid()
+    error_message = exporter.getErrorMessage()
+    exporter.close()
+    if valid:
+        pytest.skip('OpenGL is available.')
+
+    with pytest.raises(OSError, match=error_message):
+        export_document_views(_DocumentModel(document), str(tmp_path), WIDTH, HEIGHT)
+    document.freeVisualisationContents()
+
+
+def test_export_document_views(gui_application, tmp_path):
+    document = _create_document()
+    exporter = ViewExporter(document.getZincContext(), WIDTH, HEIGHT)
+    valid = exporter.isValid()
+    error_message = exporter.getErrorMessage()
+    exporter.close()
+    if not valid:
+        pytest.skip(error_message)
+
+    model = _DocumentModel(document)
+    file_names = export_document_views(model, str(tmp_path), WIDTH, HEIGHT)
+    assert file_names == [os.path.join(str(tmp_path), 'view_1-r0c0.png')]
+    image = QtGui.QImage(file_names[0])
+    assert (image.width(), image.height()) == (WIDTH, HEIGHT)
+
+    file_names = export_document_views(model, str(tmp_path / 'times'), WIDTH, HEIGHT, time_count=2)
+    assert [os.path.basename(file_name) for file_name in file_names] == ['view_1-r0c0-t0000.png', 'view_1-r0c0-t0001.png']
+    document.freeVisualisationContents()